@@ -14,6 +14,7 @@
 # -----------------------------------------------------------------------------
 
 import enum
+import functools
 import hashlib
 
 
@@ -23,6 +24,30 @@ FAMILY_NAME = 'marketplace'
 NS = hashlib.sha512(FAMILY_NAME.encode()).hexdigest()[:6]
 
 
+# Every infix of NS is taken by the spaces below, so records that index the
+# primary state, rather than being part of it, live in a second namespace
+# with its own infixes.
+INDEX_NS = hashlib.sha512(
+    '{}-index'.format(FAMILY_NAME).encode()).hexdigest()[:6]
+
+
+# The infixes in use in INDEX_NS.
+ACCOUNT_HOLDING_INFIX = '00'
+HOLDING_CREDIT_INFIX = '01'
+OFFER_ALLOWLIST_INFIX = '02'
+
+
+# The BlockInfo transaction family keeps the chain's recent blocks in its own
+# namespace. The config at this address holds the number of the latest one.
+BLOCK_INFO_NS = '00b10c'
+BLOCK_INFO_CONFIG_ADDRESS = BLOCK_INFO_NS + '01' + '0' * 62
+
+
+# The most credit shards a Holding may have, one per value of the address's
+# last byte.
+MAX_CREDIT_SHARDS = 256
+
+
 class OfferHistorySpace(enum.IntEnum):
     START = 0
     STOP = 1
@@ -55,77 +80,291 @@ class AddressSpace(enum.IntEnum):
     ACCOUNT = 2
     OFFER = 3
     OFFER_HISTORY = 4
+    ACCOUNT_HOLDING = 5
+    HOLDING_CREDIT = 6
+    OFFER_ALLOWLIST = 7
 
     OTHER_FAMILY = 100
 
 
-def _hash(identifier):
-    return hashlib.sha512(identifier.encode()).hexdigest()
+# The number of derived addresses kept in the address cache. Ledger sync, the
+# REST API and the transaction processor all derive the same handful of hot
+# addresses over and over, so a few thousand entries covers a busy market.
+ADDRESS_CACHE_SIZE = 4096
 
 
-def _compress(address, start, stop):
-    return "%.2X".lower() % (int(address, base=16) % (stop - start) + start)
+# The two character, lower case hex of every infix byte.
+_HEX_INFIXES = tuple('%.2x' % infix for infix in range(256))
 
 
-def make_offer_account_address(offer_id, account):
-    offer_hash = _hash(offer_id)
-    account_hash = _hash(account)
+def _digest(identifier):
+    return hashlib.sha512(identifier.encode()).digest()
 
-    return NS + '00' + offer_hash[:60] + _compress(account_hash, 1, 256)
+
+def _compress(digest, start, stop):
+    # Reducing the digest as a big-endian integer gives the same infix as
+    # reducing its hex encoding, without formatting and re-parsing 128 hex
+    # digits.
+    return _HEX_INFIXES[
+        int.from_bytes(digest, byteorder='big') % (stop - start) + start]
+
+
+def make_offer_account_address(offer_id, account):
+    return _make_address(AddressSpace.OFFER_HISTORY, (offer_id, account))
 
 
 def make_offer_history_address(offer_id):
-    offer_hash = _hash(offer_id)
+    return _make_address(AddressSpace.OFFER_HISTORY, offer_id)
 
-    return NS + '00' + offer_hash[:60] + '00'
 
+def make_offer_receipts_prefix(offer_id):
+    """Returns the address prefix shared by every receipt of the Offer.
 
-def make_asset_address(asset_id):
-    full_hash = _hash(asset_id)
+    Args:
+        offer_id (str): The Offer id.
 
-    return NS + _compress(
-        full_hash,
-        AssetSpace.START,
-        AssetSpace.STOP) + full_hash[:62]
+    Returns:
+        (str): The 68 character hex prefix.
+    """
 
+    return NS + '00' + _digest(offer_id)[:30].hex()
 
-def make_holding_address(holding_id):
-    full_hash = _hash(holding_id)
 
-    return NS + _compress(
-        full_hash,
-        HoldingSpace.START,
-        HoldingSpace.STOP) + full_hash[:62]
+def make_offer_receipt_addresses(offer_id):
+    """Returns every address a receipt of the Offer can be at: the
+    EXCHANGE_ONCE receipt, then the 255 addresses that the accounts'
+    EXCHANGE_ONCE_PER_ACCOUNT receipts are compressed into.
 
+    Args:
+        offer_id (str): The Offer id.
 
-def make_account_address(account_id):
-    full_hash = _hash(account_id)
+    Returns:
+        (list of str): The 256 addresses.
+    """
 
-    return NS + _compress(
-        full_hash,
-        AccountSpace.START,
-        AccountSpace.STOP) + full_hash[:62]
+    prefix = make_offer_receipts_prefix(offer_id)
+    return [prefix + infix for infix in _HEX_INFIXES]
+
+
+def make_account_holding_address(account_id, holding_id):
+    return _make_address(
+        AddressSpace.ACCOUNT_HOLDING,
+        (account_id, holding_id))
+
+
+def make_account_holdings_prefix(account_id):
+    """Returns the address prefix shared by every account holding address
+    of the Account.
+
+    Args:
+        account_id (str): The Account's public key.
+
+    Returns:
+        (str): The 38 character hex prefix.
+    """
+
+    return INDEX_NS + ACCOUNT_HOLDING_INFIX + \
+        _digest(account_id)[:15].hex()
+
+
+def make_holding_credit_address(holding_id, shard):
+    return _make_address(AddressSpace.HOLDING_CREDIT, (holding_id, shard))
+
+
+def make_holding_credit_addresses(holding_id, credit_shards):
+    """Returns the address of every credit shard of a Holding.
+
+    Args:
+        holding_id (str): The Holding id.
+        credit_shards (int): The Holding's number of credit shards.
+
+    Returns:
+        (list of str): The addresses, in shard order.
+    """
+
+    return make_addresses(
+        AddressSpace.HOLDING_CREDIT,
+        [(holding_id, shard) for shard in range(credit_shards)])
+
+
+def credit_shard(account_id, credit_shards):
+    """Returns the shard that credits from the Account go to, out of a
+    Holding's credit_shards.
+
+    Args:
+        account_id (str): The public key of the crediting Account.
+        credit_shards (int): The Holding's number of credit shards.
+
+    Returns:
+        (int): The shard, from 0 to credit_shards - 1.
+    """
+
+    return int.from_bytes(_digest(account_id)[:8], byteorder='big') % \
+        credit_shards
+
+
+def make_offer_allowlist_address(offer_id, account):
+    return _make_address(AddressSpace.OFFER_ALLOWLIST, (offer_id, account))
+
+
+def make_offer_allowlist_prefix(offer_id):
+    """Returns the address prefix shared by every allowlist entry of the
+    Offer.
+
+    Args:
+        offer_id (str): The Offer id.
+
+    Returns:
+        (str): The 38 character hex prefix.
+    """
+
+    return INDEX_NS + OFFER_ALLOWLIST_INFIX + \
+        _digest(offer_id)[:15].hex()
+
+
+def make_asset_address(asset_id):
+    return _make_address(AddressSpace.ASSET, asset_id)
+
+
+def make_holding_address(holding_id):
+    return _make_address(AddressSpace.HOLDING, holding_id)
+
+
+def make_account_address(account_id):
+    return _make_address(AddressSpace.ACCOUNT, account_id)
 
 
 def make_offer_address(offer_id):
-    full_hash = _hash(offer_id)
+    return _make_address(AddressSpace.OFFER, offer_id)
+
+
+def make_addresses(space, identifiers):
+    """Derives the addresses of many identifiers within one AddressSpace.
+
+    Args:
+        space (AddressSpace): The space the identifiers belong to. For
+            AddressSpace.OFFER_HISTORY an identifier is either an offer id
+            or an (offer_id, account) tuple, and for
+            AddressSpace.ACCOUNT_HOLDING an (account_id, holding_id) tuple
+            and for AddressSpace.HOLDING_CREDIT a (holding_id, shard) tuple.
+            For AddressSpace.OFFER_ALLOWLIST it is an (offer_id, account)
+            tuple.
+        identifiers (iterable): The identifiers to derive addresses for.
+
+    Returns:
+        (list of str): The addresses, in the same order as the identifiers.
+    """
+
+    return [_make_address(space, i) for i in identifiers]
+
+
+def address_cache_info():
+    """Returns the hits, misses, maxsize and currsize of the address cache.
+
+    Returns:
+        (functools._CacheInfo): The cache statistics.
+    """
+
+    return _make_address.cache_info()
+
+
+def clear_address_cache():
+    _make_address.cache_clear()
+
+
+def _derive(space, identifier):
+    try:
+        derive = _DERIVATIONS[space]
+    except KeyError:
+        raise ValueError(
+            "Addresses cannot be derived for {}".format(space))
+
+    return derive(identifier)
+
+
+_make_address = functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)(_derive)
+
+
+def _derive_offer_history_address(identifier):
+    if isinstance(identifier, tuple):
+        offer_id, account = identifier
+        offer_digest = _digest(offer_id)
+        account_digest = _digest(account)
+
+        return NS + '00' + offer_digest[:30].hex() + \
+            _compress(account_digest, 1, 256)
+
+    offer_digest = _digest(identifier)
+
+    return NS + '00' + offer_digest[:30].hex() + '00'
+
+
+def _derive_account_holding_address(identifier):
+    # The account's digest comes first, so every Holding of an Account
+    # shares the address prefix of make_account_holdings_prefix.
+    account_id, holding_id = identifier
+
+    return make_account_holdings_prefix(account_id) + \
+        _digest(holding_id)[:16].hex()
+
+
+def _derive_holding_credit_address(identifier):
+    # The shard is the last byte, so the shards of a Holding are adjacent.
+    holding_id, shard = identifier
+
+    return INDEX_NS + HOLDING_CREDIT_INFIX + \
+        _digest(holding_id)[:30].hex() + _HEX_INFIXES[shard]
+
+
+def _derive_offer_allowlist_address(identifier):
+    offer_id, account = identifier
+
+    return make_offer_allowlist_prefix(offer_id) + \
+        _digest(account)[:16].hex()
+
+
+def _derive_address(identifier, space):
+    full_digest = _digest(identifier)
 
     return NS + _compress(
-        full_hash,
-        OfferSpace.START,
-        OfferSpace.STOP) + full_hash[:62]
+        full_digest,
+        space.START,
+        space.STOP) + full_digest[:31].hex()
 
 
-def _contains(num, space):
-    return space.START <= num < space.STOP
+def _derive_asset_address(identifier):
+    return _derive_address(identifier, AssetSpace)
 
 
-def address_is(address):
+def _derive_holding_address(identifier):
+    return _derive_address(identifier, HoldingSpace)
 
-    if address[:len(NS)] != NS:
-        return AddressSpace.OTHER_FAMILY
 
-    infix = int(address[6:8], 16)
+def _derive_account_address(identifier):
+    return _derive_address(identifier, AccountSpace)
+
+
+def _derive_offer_address(identifier):
+    return _derive_address(identifier, OfferSpace)
+
+
+_DERIVATIONS = {
+    AddressSpace.OFFER_HISTORY: _derive_offer_history_address,
+    AddressSpace.ACCOUNT_HOLDING: _derive_account_holding_address,
+    AddressSpace.HOLDING_CREDIT: _derive_holding_credit_address,
+    AddressSpace.OFFER_ALLOWLIST: _derive_offer_allowlist_address,
+    AddressSpace.ASSET: _derive_asset_address,
+    AddressSpace.HOLDING: _derive_holding_address,
+    AddressSpace.ACCOUNT: _derive_account_address,
+    AddressSpace.OFFER: _derive_offer_address
+}
+
+
+def _contains(num, space):
+    return space.START <= num < space.STOP
+
+
+def _infix_space(infix):
 
     if _contains(infix, OfferHistorySpace):
         result = AddressSpace.OFFER_HISTORY
@@ -145,3 +384,96 @@ def address_is(address):
         result = AddressSpace.OTHER_FAMILY
 
     return result
+
+
+# The AddressSpace of every possible infix byte, computed once at import so
+# classifying an address is a prefix compare and a single lookup.
+INFIX_SPACES = tuple(_infix_space(infix) for infix in range(256))
+
+_HEX_INFIX_SPACES = dict(
+    [('%.2x' % infix, space) for infix, space in enumerate(INFIX_SPACES)] +
+    [('%.2X' % infix, space) for infix, space in enumerate(INFIX_SPACES)])
+
+NS_BYTES = bytes.fromhex(NS)
+
+# The AddressSpace of each infix in use in INDEX_NS.
+_INDEX_INFIX_SPACES = {
+    ACCOUNT_HOLDING_INFIX: AddressSpace.ACCOUNT_HOLDING,
+    HOLDING_CREDIT_INFIX: AddressSpace.HOLDING_CREDIT,
+    OFFER_ALLOWLIST_INFIX: AddressSpace.OFFER_ALLOWLIST
+}
+
+_INDEX_INFIX_BYTE_SPACES = {
+    int(infix, 16): space for infix, space in _INDEX_INFIX_SPACES.items()
+}
+
+INDEX_NS_BYTES = bytes.fromhex(INDEX_NS)
+
+
+def address_is(address):
+    """Classifies a hex encoded address.
+
+    Args:
+        address (str): The 70 character hex address.
+
+    Returns:
+        (AddressSpace): The space of the address.
+    """
+
+    namespace = address[:len(NS)]
+
+    if namespace == NS:
+        return _HEX_INFIX_SPACES.get(address[6:8], AddressSpace.OTHER_FAMILY)
+
+    if namespace == INDEX_NS:
+        return _INDEX_INFIX_SPACES.get(
+            address[6:8].lower(), AddressSpace.OTHER_FAMILY)
+
+    return AddressSpace.OTHER_FAMILY
+
+
+def address_bytes_is(address):
+    """Classifies a raw 35 byte address.
+
+    Args:
+        address (bytes): The address, as bytes rather than hex.
+
+    Returns:
+        (AddressSpace): The space of the address.
+    """
+
+    if len(address) <= len(NS_BYTES):
+        return AddressSpace.OTHER_FAMILY
+
+    namespace = address[:len(NS_BYTES)]
+
+    if namespace == NS_BYTES:
+        return INFIX_SPACES[address[len(NS_BYTES)]]
+
+    if namespace == INDEX_NS_BYTES:
+        return _INDEX_INFIX_BYTE_SPACES.get(
+            address[len(NS_BYTES)], AddressSpace.OTHER_FAMILY)
+
+    return AddressSpace.OTHER_FAMILY
+
+
+def classify_many(items, key=None):
+    """Groups many addresses, or objects holding addresses, by AddressSpace
+    in a single pass.
+
+    Args:
+        items (iterable): The hex addresses, or objects such as StateChanges
+            if key is given.
+        key (function, optional): Returns the hex address of an item.
+
+    Returns:
+        (dict): AddressSpace to the list of items in that space, each list
+            in the order the items were given.
+    """
+
+    groups = {}
+    for item in items:
+        address = item if key is None else key(item)
+        groups.setdefault(address_is(address), []).append(item)
+
+    return groups
@@ -0,0 +1,85 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import uuid
+
+
+# The family_version whose payloads carry identifiers in their binary form.
+COMPACT_FAMILY_VERSION = '1.1'
+
+
+UUID_BYTES = 16
+
+PUBLIC_KEY_BYTES = 33
+
+
+def compact_id(identifier):
+    """Returns the binary form of a Holding or Offer id, or of an Account's
+    public key.
+
+    Args:
+        identifier (str): A UUID in its canonical form, e.g.
+            str(uuid.uuid4()), a 66 character hex public key, or ''.
+
+    Raises:
+        ValueError: The identifier has no binary form, so it can only be
+            sent in a family_version 1.0 payload.
+
+    Returns:
+        bytes: 16 bytes for a UUID, 33 for a public key, or b''.
+    """
+
+    if not identifier:
+        return b''
+
+    try:
+        if len(identifier) == PUBLIC_KEY_BYTES * 2:
+            raw = bytes.fromhex(identifier)
+            if raw.hex() == identifier:
+                return raw
+        elif str(uuid.UUID(identifier)) == identifier:
+            return uuid.UUID(identifier).bytes
+    except ValueError:
+        pass
+
+    raise ValueError(
+        "{!r} is neither a canonical UUID nor a public key.".format(
+            identifier))
+
+
+def expand_id(raw):
+    """Returns the identifier whose binary form is raw, the inverse of
+    compact_id.
+
+    Args:
+        raw (bytes): The binary form.
+
+    Raises:
+        ValueError: raw is not the length of a UUID or a public key.
+
+    Returns:
+        str
+    """
+
+    if not raw:
+        return ''
+    if len(raw) == UUID_BYTES:
+        return str(uuid.UUID(bytes=raw))
+    if len(raw) == PUBLIC_KEY_BYTES:
+        return raw.hex()
+
+    raise ValueError(
+        "An identifier of {} bytes is neither a UUID nor a "
+        "public key.".format(len(raw)))
@@ -0,0 +1,64 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Times uncached address derivation against the legacy hex derivation.
+
+Run from the addressing directory:
+
+    python3 -m tests.bench_addresser
+"""
+
+import timeit
+from uuid import uuid4
+
+from marketplace_addressing import addresser
+
+from tests.test_addresser import legacy_make_address
+
+
+NUMBER = 20000
+REPEAT = 5
+
+
+def main():
+    identifiers = [str(uuid4()) for _ in range(NUMBER)]
+    spaces = [addresser.AddressSpace.ASSET,
+              addresser.AddressSpace.HOLDING,
+              addresser.AddressSpace.ACCOUNT,
+              addresser.AddressSpace.OFFER,
+              addresser.AddressSpace.OFFER_HISTORY]
+
+    print('{:<15} {:>12} {:>12} {:>8}'.format(
+        'space', 'legacy us', 'digest us', 'speedup'))
+    for space in spaces:
+        # pylint: disable=protected-access
+        derive = addresser._DERIVATIONS[space]
+        legacy = min(timeit.repeat(
+            lambda: [legacy_make_address(space, i) for i in identifiers],
+            repeat=REPEAT,
+            number=1))
+        digest = min(timeit.repeat(
+            lambda: [derive(i) for i in identifiers],
+            repeat=REPEAT,
+            number=1))
+        print('{:<15} {:>12.3f} {:>12.3f} {:>7.2f}x'.format(
+            space.name,
+            legacy / NUMBER * 1e6,
+            digest / NUMBER * 1e6,
+            legacy / digest))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,12 +13,60 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+import hashlib
+import random
+import string
 import unittest
 from uuid import uuid4
 
 from marketplace_addressing import addresser
 
 
+LEGACY_SPACES = {
+    addresser.AddressSpace.ASSET: addresser.AssetSpace,
+    addresser.AddressSpace.HOLDING: addresser.HoldingSpace,
+    addresser.AddressSpace.ACCOUNT: addresser.AccountSpace,
+    addresser.AddressSpace.OFFER: addresser.OfferSpace
+}
+
+
+def _hash(identifier):
+    return hashlib.sha512(identifier.encode()).hexdigest()
+
+
+def _compress(address, start, stop):
+    return "%.2X".lower() % (int(address, base=16) % (stop - start) + start)
+
+
+def legacy_make_address(space, identifier):
+    """Derives an address by parsing the hex SHA-512 as an integer, the way
+    addresses were originally derived.
+    """
+
+    if space == addresser.AddressSpace.OFFER_HISTORY:
+        if isinstance(identifier, tuple):
+            offer_id, account = identifier
+            return addresser.NS + '00' + _hash(offer_id)[:60] + \
+                _compress(_hash(account), 1, 256)
+        return addresser.NS + '00' + _hash(identifier)[:60] + '00'
+
+    full_hash = _hash(identifier)
+    return addresser.NS + _compress(
+        full_hash,
+        LEGACY_SPACES[space].START,
+        LEGACY_SPACES[space].STOP) + full_hash[:62]
+
+
+def random_identifier(rand):
+    kind = rand.randrange(3)
+    if kind == 0:
+        return str(uuid4())
+    if kind == 1:
+        return '%066x' % rand.getrandbits(264)
+    return ''.join(rand.choice(string.printable)
+                   for _ in range(rand.randrange(64)))
+
+
 class AddresserTest(unittest.TestCase):
 
     def test_asset_address(self):
@@ -64,3 +112,202 @@ class AddresserTest(unittest.TestCase):
             uuid4().hex)
 
         self.assertEqual(len(offer_history_address), 70, "The address is valid")
+
+    def test_offer_receipt_addresses(self):
+        offer_id = uuid4().hex
+        addresses = addresser.make_offer_receipt_addresses(offer_id)
+
+        self.assertEqual(len(set(addresses)), 256,
+                         "Every receipt address is listed once.")
+
+        self.assertIn(addresser.make_offer_history_address(offer_id),
+                      addresses,
+                      "The EXCHANGE_ONCE receipt is included.")
+
+        self.assertIn(
+            addresser.make_offer_account_address(offer_id, uuid4().hex),
+            addresses,
+            "The receipt of any account is included.")
+
+        prefix = addresser.make_offer_receipts_prefix(offer_id)
+        self.assertTrue(all(a.startswith(prefix) for a in addresses),
+                        "The receipts of an Offer share a prefix.")
+
+    def test_account_holding_address(self):
+        account = uuid4().hex
+        first = addresser.make_account_holding_address(account, uuid4().hex)
+        second = addresser.make_account_holding_address(account, uuid4().hex)
+
+        self.assertEqual(len(first), 70, "The address is valid.")
+
+        self.assertEqual(addresser.address_is(first),
+                         addresser.AddressSpace.ACCOUNT_HOLDING,
+                         "The address is correctly identified as an "
+                         "account holding.")
+
+        self.assertEqual(addresser.address_bytes_is(bytes.fromhex(first)),
+                         addresser.AddressSpace.ACCOUNT_HOLDING,
+                         "The raw address is correctly identified as an "
+                         "account holding.")
+
+        prefix = addresser.make_account_holdings_prefix(account)
+        self.assertTrue(first.startswith(prefix) and second.startswith(prefix),
+                        "The Holdings of an Account share a prefix.")
+
+        self.assertEqual(
+            addresser.address_is(addresser.INDEX_NS + 'ff' + '0' * 62),
+            addresser.AddressSpace.OTHER_FAMILY,
+            "An unused index infix is not a marketplace address.")
+
+    def test_holding_credit_address(self):
+        holding_id = uuid4().hex
+        addresses = addresser.make_holding_credit_addresses(holding_id, 16)
+
+        self.assertEqual(len(set(addresses)), 16,
+                         "Each shard has its own address.")
+
+        for address in addresses:
+            self.assertEqual(len(address), 70, "The address is valid.")
+            self.assertEqual(addresser.address_is(address),
+                             addresser.AddressSpace.HOLDING_CREDIT,
+                             "The address is correctly identified as a "
+                             "holding credit.")
+            self.assertEqual(addresser.address_bytes_is(
+                bytes.fromhex(address)),
+                addresser.AddressSpace.HOLDING_CREDIT,
+                "The raw address is correctly identified as a holding "
+                "credit.")
+
+        self.assertEqual(
+            addresses[3],
+            addresser.make_holding_credit_address(holding_id, 3),
+            "The shards are in order.")
+
+        account = uuid4().hex
+        shard = addresser.credit_shard(account, 16)
+        self.assertTrue(0 <= shard < 16, "The shard is in range.")
+        self.assertEqual(shard, addresser.credit_shard(account, 16),
+                         "An Account always credits the same shard.")
+
+    def test_offer_allowlist_address(self):
+        offer_id = uuid4().hex
+        first = addresser.make_offer_allowlist_address(offer_id, uuid4().hex)
+        second = addresser.make_offer_allowlist_address(offer_id, uuid4().hex)
+
+        self.assertEqual(len(first), 70, "The address is valid.")
+        self.assertNotEqual(first, second,
+                            "Each account has its own address.")
+
+        self.assertEqual(addresser.address_is(first),
+                         addresser.AddressSpace.OFFER_ALLOWLIST,
+                         "The address is correctly identified as an offer "
+                         "allowlist entry.")
+
+        self.assertEqual(addresser.address_bytes_is(bytes.fromhex(first)),
+                         addresser.AddressSpace.OFFER_ALLOWLIST,
+                         "The raw address is correctly identified as an "
+                         "offer allowlist entry.")
+
+        prefix = addresser.make_offer_allowlist_prefix(offer_id)
+        self.assertTrue(first.startswith(prefix) and second.startswith(prefix),
+                        "The allowlist of an Offer shares a prefix.")
+
+    def test_make_addresses(self):
+        holding_ids = [uuid4().hex for _ in range(5)]
+
+        self.assertEqual(
+            addresser.make_addresses(addresser.AddressSpace.HOLDING,
+                                     holding_ids),
+            [addresser.make_holding_address(h) for h in holding_ids],
+            "The bulk addresses match the individually derived addresses.")
+
+        offer_id = uuid4().hex
+        account = uuid4().hex
+
+        self.assertEqual(
+            addresser.make_addresses(addresser.AddressSpace.OFFER_HISTORY,
+                                     [offer_id, (offer_id, account)]),
+            [addresser.make_offer_history_address(offer_id),
+             addresser.make_offer_account_address(offer_id, account)],
+            "The bulk offer history addresses match the receipt addresses.")
+
+        with self.assertRaises(ValueError):
+            addresser.make_addresses(addresser.AddressSpace.OTHER_FAMILY,
+                                     [uuid4().hex])
+
+    def test_address_cache(self):
+        addresser.clear_address_cache()
+        asset_id = uuid4().hex
+
+        first = addresser.make_asset_address(asset_id)
+        second = addresser.make_asset_address(asset_id)
+        info = addresser.address_cache_info()
+
+        self.assertEqual(first, second, "The cached address is unchanged.")
+        self.assertEqual(info.misses, 1, "The first derivation is a miss.")
+        self.assertEqual(info.hits, 1, "The second derivation is a hit.")
+
+    def test_address_bytes_is(self):
+        offer_address = addresser.make_offer_address(uuid4().hex)
+
+        self.assertEqual(
+            addresser.address_bytes_is(bytes.fromhex(offer_address)),
+            addresser.AddressSpace.OFFER,
+            "The raw address is correctly identified as an Offer.")
+
+        self.assertEqual(
+            addresser.address_bytes_is(bytes.fromhex('00' * 35)),
+            addresser.AddressSpace.OTHER_FAMILY,
+            "The raw address is correctly identified as another family.")
+
+    def test_infix_table(self):
+        for infix in range(256):
+            address = addresser.NS + '%.2x' % infix + '0' * 62
+            self.assertEqual(
+                addresser.address_is(address),
+                addresser.address_bytes_is(bytes.fromhex(address)),
+                "The hex and byte classifications agree.")
+
+    def test_classify_many(self):
+        asset_address = addresser.make_asset_address(uuid4().hex)
+        first_holding = addresser.make_holding_address(uuid4().hex)
+        second_holding = addresser.make_holding_address(uuid4().hex)
+        other_address = '0' * 70
+
+        groups = addresser.classify_many(
+            [first_holding, asset_address, other_address, second_holding])
+
+        self.assertEqual(
+            groups,
+            {
+                addresser.AddressSpace.ASSET: [asset_address],
+                addresser.AddressSpace.HOLDING: [first_holding,
+                                                 second_holding],
+                addresser.AddressSpace.OTHER_FAMILY: [other_address]
+            },
+            "The addresses are grouped by space in their original order.")
+
+    def test_matches_legacy_derivation(self):
+        rand = random.Random(0)
+        addresser.clear_address_cache()
+
+        for space in LEGACY_SPACES:
+            for _ in range(500):
+                identifier = random_identifier(rand)
+                self.assertEqual(
+                    addresser.make_addresses(space, [identifier])[0],
+                    legacy_make_address(space, identifier),
+                    "The address of {!r} matches the legacy "
+                    "derivation.".format(identifier))
+
+        for _ in range(500):
+            identifier = random_identifier(rand)
+            account = random_identifier(rand)
+            self.assertEqual(
+                addresser.make_offer_history_address(identifier),
+                legacy_make_address(addresser.AddressSpace.OFFER_HISTORY,
+                                    identifier))
+            self.assertEqual(
+                addresser.make_offer_account_address(identifier, account),
+                legacy_make_address(addresser.AddressSpace.OFFER_HISTORY,
+                                    (identifier, account)))
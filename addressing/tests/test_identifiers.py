@@ -0,0 +1,57 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import os
+import unittest
+from uuid import uuid4
+
+from marketplace_addressing import identifiers
+
+
+class IdentifiersTest(unittest.TestCase):
+
+    def test_uuid(self):
+        identifier = str(uuid4())
+        raw = identifiers.compact_id(identifier)
+
+        self.assertEqual(len(raw), 16, "A UUID is 16 bytes.")
+        self.assertEqual(identifiers.expand_id(raw), identifier,
+                         "The UUID is unchanged by the round trip.")
+
+    def test_public_key(self):
+        public_key = '02' + os.urandom(32).hex()
+        raw = identifiers.compact_id(public_key)
+
+        self.assertEqual(len(raw), 33, "A public key is 33 bytes.")
+        self.assertEqual(identifiers.expand_id(raw), public_key,
+                         "The public key is unchanged by the round trip.")
+
+    def test_empty(self):
+        self.assertEqual(identifiers.compact_id(''), b'',
+                         "An unset identifier stays unset.")
+        self.assertEqual(identifiers.expand_id(b''), '',
+                         "An unset identifier stays unset.")
+
+    def test_no_binary_form(self):
+        for identifier in (uuid4().hex,
+                           str(uuid4()).upper(),
+                           '02' + os.urandom(32).hex().upper(),
+                           'z' * 66,
+                           'holding-1'):
+            with self.assertRaises(ValueError):
+                identifiers.compact_id(identifier)
+
+        with self.assertRaises(ValueError):
+            identifiers.expand_id(os.urandom(20))
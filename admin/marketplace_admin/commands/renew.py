@@ -21,11 +21,14 @@ from marketplace_admin.services import data
 
 LOGGER = logging.getLogger(__name__)
 
+# Offers with these rules record who has accepted them against their id.
+RECEIPT_RULES = ['EXCHANGE_ONCE', 'EXCHANGE_ONCE_PER_ACCOUNT']
+
 
 def init_renew_parser(subparsers):
     parser = subparsers.add_parser(
         'renew',
-        help='Closes and reopens any "renewable" Offers',
+        help='Updates, or closes and reopens, any "renewable" Offers',
         parents=[api.get_parser(), data.get_parser()])
     return parser
 
@@ -74,11 +77,47 @@ def do_renew(opts):
                                if renewable['label'] == o.get('label')
                                and renewable['source'] == o['source']]
 
+            # An Offer is updated in place unless it has receipts tied to
+            # its id or an escrow, which only a new Offer starts afresh.
+            in_place = next((o for o in matching_offers
+                             if _can_update_in_place(o, renewable)), None)
+
             for match in matching_offers:
+                if match is in_place:
+                    continue
                 LOGGER.debug('Closing matching offer: %s', match['id'])
                 update('offers/{}/close'.format(match['id']), None, auth)
 
-            LOGGER.debug('Submitting new offer: %s', renewable['label'])
-            submit('offers', renewable, auth)
+            if in_place is not None:
+                LOGGER.debug('Updating offer in place: %s', in_place['id'])
+                update('offers/{}'.format(in_place['id']),
+                       _renewal_update(renewable),
+                       auth)
+            else:
+                LOGGER.debug('Submitting new offer: %s', renewable['label'])
+                submit('offers', renewable, auth)
 
     LOGGER.info('Renewals complete.')
+
+
+def _can_update_in_place(offer, renewable):
+    rule_types = [r['type'] for r in offer.get('rules', [])]
+    return offer.get('target') == renewable.get('target') \
+        and _rules_key(offer) == _rules_key(renewable) \
+        and 'escrowQuantity' not in offer \
+        and not any(t in RECEIPT_RULES for t in rule_types)
+
+
+def _rules_key(offer):
+    """The rules of an Offer, in a form that compares equal for the same
+    rules whatever their order, and whether their values are given as
+    numbers or strings.
+    """
+    return sorted((r['type'], [str(v) for v in r.get('value') or []])
+                  for r in offer.get('rules') or [])
+
+
+def _renewal_update(renewable):
+    keys = ['label', 'description', 'sourceQuantity', 'targetQuantity',
+            'expiresAtBlock']
+    return {k: renewable[k] for k in keys if renewable.get(k) is not None}
@@ -28,7 +28,9 @@ from sawtooth_rest_api.protobuf import batch_pb2
 from sawtooth_signing import create_context
 from sawtooth_signing import CryptoFactory
 
+from marketplace_addressing import addresser
 from marketplace_transaction import transaction_creation
+from marketplace_transaction.protobuf import rule_pb2
 
 
 LOGGER = logging.getLogger(__name__)
@@ -149,6 +151,14 @@ class BlockchainTest(unittest.TestCase):
                 - The asset must exist.
                 - If the quantity is not 0, then the txn signer must
                   be an owner of the asset.
+                - The credit_shards must not be more than
+                  addresser.MAX_CREDIT_SHARDS.
+            CreateHoldings
+                - Each CreateHolding is valid, or none are applied.
+                - A family_version 1.1 payload is applied like 1.0.
+            Transfer
+                - The txn signer must be the source Holding's account.
+                - The source and target Holdings are of the same Asset.
         """
 
         self.assertEqual(
@@ -196,6 +206,18 @@ class BlockchainTest(unittest.TestCase):
             "INVALID",
             "The account must be owned by the txn signer.")
 
+        self.assertEqual(
+            self.client.create_holding(
+                key=self.signer1,
+                identifier=str(uuid4()),
+                label=uuid4().hex,
+                description=uuid4().hex,
+                asset=self.sawbucks,
+                quantity=0,
+                credit_shards=addresser.MAX_CREDIT_SHARDS + 1)[0]['status'],
+            "INVALID",
+            "The Holding must not have more than the maximum credit shards.")
+
         self.assertEqual(
             self.client.create_holding(
                 key=self.signer1,
@@ -249,6 +271,56 @@ class BlockchainTest(unittest.TestCase):
                 quantity=10)[0]['status'],
             "COMMITTED")
 
+        duplicate = str(uuid4())
+        self.assertEqual(
+            self.client.create_holdings(
+                key=self.signer2,
+                holdings=[
+                    (duplicate, uuid4().hex, uuid4().hex, self.pickles, 0),
+                    (duplicate, uuid4().hex, uuid4().hex, self.sawbucks, 0)
+                ])[0]['status'],
+            "INVALID",
+            "The Holding ids in a CreateHoldings must be unique.")
+
+        self.assertEqual(
+            self.client.create_holdings(
+                key=self.signer2,
+                holdings=[
+                    (str(uuid4()), uuid4().hex, uuid4().hex, self.pickles, 0),
+                    (str(uuid4()), uuid4().hex, uuid4().hex, self.sawbucks, 0)
+                ])[0]['status'],
+            "COMMITTED")
+
+        self.assertEqual(
+            self.client.create_holdings(
+                key=self.signer2,
+                holdings=[
+                    (str(uuid4()), uuid4().hex, uuid4().hex, self.pickles, 0),
+                    (str(uuid4()), uuid4().hex, uuid4().hex, self.sawbucks, 0)
+                ],
+                family_version='1.1')[0]['status'],
+            "COMMITTED")
+
+        self.assertEqual(
+            self.client.transfer(
+                key=self.signer1,
+                source=self.signer2_pickles,
+                target=self.signer1_pickles,
+                asset=self.pickles,
+                quantity=1)[0]['status'],
+            "INVALID",
+            "The txn signer must own the source Holding.")
+
+        self.assertEqual(
+            self.client.transfer(
+                key=self.signer2,
+                source=self.signer2_pickles,
+                target=self.signer1_sawbucks,
+                asset=self.pickles,
+                quantity=1)[0]['status'],
+            "INVALID",
+            "The Holdings must be of the same Asset.")
+
     def test_03_create_offer(self):
         """Tests the CreateOffer validation rules.
 
@@ -262,6 +334,9 @@ class BlockchainTest(unittest.TestCase):
                 - The source is a Holding.
                 - The target is a Holding.
                 - The txn signer must be the account holder of both Holdings.
+                - An escrowed Offer's source Holding has the escrowed
+                  quantity.
+                - An expiring Offer's expires_at_block is not already past.
         """
 
         source = transaction_creation.MarketplaceHolding(
@@ -297,6 +372,32 @@ class BlockchainTest(unittest.TestCase):
             "INVALID",
             "The Offer id must not already exist.")
 
+        self.assertEqual(
+            self.client.create_offer(
+                key=self.signer1,
+                identifier=str(uuid4()),
+                label=uuid4().hex,
+                description=uuid4().hex,
+                source=source,
+                target=target,
+                rules=[],
+                escrow_count=3)[0]['status'],
+            "INVALID",
+            "The source Holding must have the escrowed quantity.")
+
+        self.assertEqual(
+            self.client.create_offer(
+                key=self.signer1,
+                identifier=str(uuid4()),
+                label=uuid4().hex,
+                description=uuid4().hex,
+                source=source,
+                target=target,
+                rules=[],
+                expires_at_block=1)[0]['status'],
+            "INVALID",
+            "The Offer must not expire before the current block.")
+
         signer_invalid = make_key()
 
         self.assertEqual(
@@ -464,6 +565,12 @@ class BlockchainTest(unittest.TestCase):
                   same asset.
                 - The Target Holding and Receiver Source Holding are of the
                   same asset.
+                - The BlockInfo config need only be an input if the Offer
+                  expires.
+            AcceptOffers
+                - Each AcceptOffer is valid, or none are applied.
+            EXCHANGE_LIMITED_TO_ACCOUNTS
+                - The txn signer is one of the rule's accounts.
         """
 
         offerer = transaction_creation.OfferParticipant(
@@ -497,15 +604,61 @@ class BlockchainTest(unittest.TestCase):
             "INVALID",
             "There are not enough source quantities for the AcceptOffer.")
 
+        self.assertEqual(
+            self.client.accept_offers(
+                key=self.signer2,
+                acceptances=[
+                    (self.sawbucks_for_pickles, offerer, receiver, 1),
+                    (self.sawbucks_for_pickles, offerer, receiver, 2)
+                ])[0]['status'],
+            "INVALID",
+            "There are not enough source quantities for the second "
+            "AcceptOffer, so neither is applied.")
+
         self.assertEqual(
             self.client.accept_offer(
                 key=self.signer2,
                 identifier=self.sawbucks_for_pickles,
                 receiver=receiver,
                 offerer=offerer,
-                count=2)[0]['status'],
+                count=2,
+                expires_at_block=0)[0]['status'],
+            "COMMITTED",
+            "The Offer does not expire, so the BlockInfo config need not "
+            "be an input.")
+
+        limited = str(uuid4())
+        self.assertEqual(
+            self.client.create_offer(
+                key=self.signer1,
+                identifier=limited,
+                label=uuid4().hex,
+                description=uuid4().hex,
+                source=transaction_creation.MarketplaceHolding(
+                    holding_id=self.signer1_sawbucks,
+                    quantity=1,
+                    asset=self.sawbucks),
+                target=transaction_creation.MarketplaceHolding(
+                    holding_id=self.signer1_pickles,
+                    quantity=1,
+                    asset=self.pickles),
+                rules=[rule_pb2.Rule(
+                    type=rule_pb2.Rule.EXCHANGE_LIMITED_TO_ACCOUNTS,
+                    string_values=[
+                        self.signer1.get_public_key().as_hex()])]
+            )[0]['status'],
             "COMMITTED")
 
+        self.assertEqual(
+            self.client.accept_offer(
+                key=self.signer2,
+                identifier=limited,
+                receiver=receiver,
+                offerer=offerer,
+                count=1)[0]['status'],
+            "INVALID",
+            "The Offer is limited to other accounts.")
+
     def test_05_close_offer(self):
         """Tests the CloseOffer validation rules.
 
@@ -513,6 +666,15 @@ class BlockchainTest(unittest.TestCase):
             CloseOffer
                 - The Offer exists and is Open.
                 - The txn signer is a member of the Offer owners.
+            AllowAccounts
+                - The Offer has the EXCHANGE_LIMITED_TO_ALLOWLIST rule.
+            UpdateOffer
+                - The txn signer is a member of the Offer owners.
+                - The Offer is Open, or is being reopened.
+                - An expiry is either set or cleared, not both.
+            PruneOffer
+                - The Offer is Closed.
+                - The txn signer is a member of the Offer owners.
         """
 
         self.assertEqual(
@@ -529,6 +691,14 @@ class BlockchainTest(unittest.TestCase):
             "INVALID",
             "The txn signer must be an owner of the Offer.")
 
+        self.assertEqual(
+            self.client.allow_accounts(
+                self.signer1,
+                self.sawbucks_for_pickles,
+                [self.signer2.get_public_key().as_hex()])[0]['status'],
+            "INVALID",
+            "The Offer must have an allowlist.")
+
         self.assertEqual(
             self.client.close_offer(
                 self.signer1,
@@ -542,6 +712,80 @@ class BlockchainTest(unittest.TestCase):
             "INVALID",
             "The Offer must be Open.")
 
+        self.assertEqual(
+            self.client.update_offer(
+                self.signer2,
+                self.sawbucks_for_pickles,
+                reopen=True)[0]['status'],
+            "INVALID",
+            "The txn signer must be an owner of the Offer.")
+
+        self.assertEqual(
+            self.client.update_offer(
+                self.signer1,
+                self.sawbucks_for_pickles,
+                source_quantity=2)[0]['status'],
+            "INVALID",
+            "A closed Offer must be reopened to be updated.")
+
+        self.assertEqual(
+            self.client.update_offer(
+                self.signer1,
+                self.sawbucks_for_pickles,
+                source_quantity=2,
+                reopen=True)[0]['status'],
+            "COMMITTED")
+
+        self.assertEqual(
+            self.client.update_offer(
+                self.signer1,
+                self.sawbucks_for_pickles,
+                expires_at_block=5000,
+                clear_expiry=True)[0]['status'],
+            "INVALID",
+            "An expiry cannot be both set and cleared.")
+
+        self.assertEqual(
+            self.client.update_offer(
+                self.signer1,
+                self.sawbucks_for_pickles,
+                clear_expiry=True)[0]['status'],
+            "COMMITTED")
+
+        self.assertEqual(
+            self.client.prune_offer(
+                self.signer1,
+                self.sawbucks_for_pickles)[0]['status'],
+            "INVALID",
+            "The Offer must be Closed.")
+
+        self.assertEqual(
+            self.client.close_offer(
+                self.signer1,
+                self.sawbucks_for_pickles)[0]['status'],
+            "COMMITTED")
+
+        self.assertEqual(
+            self.client.prune_offer(
+                self.signer2,
+                self.sawbucks_for_pickles)[0]['status'],
+            "INVALID",
+            "The txn signer must be an owner of the Offer.")
+
+        self.assertEqual(
+            self.client.prune_offer(
+                self.signer1,
+                self.sawbucks_for_pickles)[0]['status'],
+            "COMMITTED")
+
+        self.assertEqual(
+            self.client.update_offer(
+                self.signer1,
+                self.sawbucks_for_pickles,
+                reopen=True)[0]['status'],
+            "INVALID",
+            "A pruned Offer no longer exists.")
+
 
 class MarketplaceClient(object):
 
@@ -576,7 +820,8 @@ class MarketplaceClient(object):
                        label,
                        description,
                        asset,
-                       quantity):
+                       quantity,
+                       credit_shards=0):
         batches, signature = transaction_creation.create_holding(
             txn_key=key,
             batch_key=BATCH_KEY,
@@ -584,6 +829,29 @@ class MarketplaceClient(object):
             label=label,
             description=description,
             asset=asset,
+            quantity=quantity,
+            credit_shards=credit_shards)
+        batch_list = batch_pb2.BatchList(batches=batches)
+        self._client.send_batches(batch_list)
+        return self._client.get_statuses([signature], wait=10)
+
+    def create_holdings(self, key, holdings, family_version='1.0'):
+        batches, signature = transaction_creation.create_holdings(
+            txn_key=key,
+            batch_key=BATCH_KEY,
+            holdings=holdings,
+            family_version=family_version)
+        batch_list = batch_pb2.BatchList(batches=batches)
+        self._client.send_batches(batch_list)
+        return self._client.get_statuses([signature], wait=10)
+
+    def transfer(self, key, source, target, asset, quantity):
+        batches, signature = transaction_creation.transfer(
+            txn_key=key,
+            batch_key=BATCH_KEY,
+            source=source,
+            target=target,
+            asset=asset,
             quantity=quantity)
         batch_list = batch_pb2.BatchList(batches=batches)
         self._client.send_batches(batch_list)
@@ -596,7 +864,9 @@ class MarketplaceClient(object):
                      description,
                      source,
                      target,
-                     rules):
+                     rules,
+                     escrow_count=0,
+                     expires_at_block=0):
         batches, signature = transaction_creation.create_offer(
             txn_key=key,
             batch_key=BATCH_KEY,
@@ -605,7 +875,9 @@ class MarketplaceClient(object):
             description=description,
             source=source,
             target=target,
-            rules=rules)
+            rules=rules,
+            escrow_count=escrow_count,
+            expires_at_block=expires_at_block)
         batch_list = batch_pb2.BatchList(batches=batches)
         self._client.send_batches(batch_list)
         return self._client.get_statuses([signature], wait=10)
@@ -615,14 +887,25 @@ class MarketplaceClient(object):
                      identifier,
                      receiver,
                      offerer,
-                     count):
+                     count,
+                     expires_at_block=None):
         batches, signature = transaction_creation.accept_offer(
             txn_key=key,
             batch_key=BATCH_KEY,
             identifier=identifier,
             offerer=offerer,
             receiver=receiver,
-            count=count)
+            count=count,
+            expires_at_block=expires_at_block)
+        batch_list = batch_pb2.BatchList(batches=batches)
+        self._client.send_batches(batch_list)
+        return self._client.get_statuses([signature], wait=10)
+
+    def accept_offers(self, key, acceptances):
+        batches, signature = transaction_creation.accept_offers(
+            txn_key=key,
+            batch_key=BATCH_KEY,
+            acceptances=acceptances)
         batch_list = batch_pb2.BatchList(batches=batches)
         self._client.send_batches(batch_list)
         return self._client.get_statuses([signature], wait=10)
@@ -639,6 +922,47 @@ class MarketplaceClient(object):
         self._client.send_batches(batch_list)
         return self._client.get_statuses([signature], wait=10)
 
+    def prune_offer(self, key, identifier):
+        batches, signature = transaction_creation.prune_offer(
+            txn_key=key,
+            batch_key=BATCH_KEY,
+            identifier=identifier)
+
+        batch_list = batch_pb2.BatchList(batches=batches)
+        self._client.send_batches(batch_list)
+        return self._client.get_statuses([signature], wait=10)
+
+    def update_offer(self,
+                     key,
+                     identifier,
+                     source_quantity=0,
+                     expires_at_block=0,
+                     reopen=False,
+                     clear_expiry=False):
+        batches, signature = transaction_creation.update_offer(
+            txn_key=key,
+            batch_key=BATCH_KEY,
+            identifier=identifier,
+            source_quantity=source_quantity,
+            expires_at_block=expires_at_block,
+            reopen=reopen,
+            clear_expiry=clear_expiry)
+
+        batch_list = batch_pb2.BatchList(batches=batches)
+        self._client.send_batches(batch_list)
+        return self._client.get_statuses([signature], wait=10)
+
+    def allow_accounts(self, key, offer_id, accounts):
+        batches, signature = transaction_creation.allow_accounts(
+            txn_key=key,
+            batch_key=BATCH_KEY,
+            offer_id=offer_id,
+            accounts=accounts)
+
+        batch_list = batch_pb2.BatchList(batches=batches)
+        self._client.send_batches(batch_list)
+        return self._client.get_statuses([signature], wait=10)
+
 
 def wait_until_status(url, status_code=200, tries=5):
     """Pause the program until the given url returns the required status.
@@ -13,32 +13,46 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
-from marketplace_addressing.addresser import address_is
 from marketplace_addressing.addresser import AddressSpace
 from marketplace_ledger_sync.protobuf.account_pb2 import AccountContainer
+from marketplace_ledger_sync.protobuf.account_pb2 import \
+    AccountHoldingContainer
 from marketplace_ledger_sync.protobuf.asset_pb2 import AssetContainer
 from marketplace_ledger_sync.protobuf.holding_pb2 import HoldingContainer
+from marketplace_ledger_sync.protobuf.holding_pb2 import \
+    HoldingCreditContainer
+from marketplace_ledger_sync.protobuf.offer_pb2 import \
+    OfferAllowlistContainer
 from marketplace_ledger_sync.protobuf.offer_pb2 import OfferContainer
+from marketplace_ledger_sync.protobuf.rule_pb2 import Rule
 
 
 CONTAINERS = {
     AddressSpace.ACCOUNT: AccountContainer,
+    AddressSpace.ACCOUNT_HOLDING: AccountHoldingContainer,
     AddressSpace.ASSET: AssetContainer,
     AddressSpace.HOLDING: HoldingContainer,
-    AddressSpace.OFFER: OfferContainer
+    AddressSpace.HOLDING_CREDIT: HoldingCreditContainer,
+    AddressSpace.OFFER: OfferContainer,
+    AddressSpace.OFFER_ALLOWLIST: OfferAllowlistContainer
 }
 
 IGNORE = {
     AddressSpace.OFFER_HISTORY: True
 }
 
+# The rule types whose values are quantities.
+INT_RULE_TYPES = frozenset([
+    Rule.REQUIRE_SOURCE_QUANTITIES,
+    Rule.REQUIRE_TARGET_QUANTITIES
+])
 
-def data_to_dicts(address, data):
-    """Deserializes a protobuf "container" binary based on its address. Returns
-    a list of the decoded objects which were stored at that address.
-    """
-    data_type = address_is(address)
 
+def data_to_dicts(data_type, data):
+    """Deserializes a protobuf "container" binary based on the AddressSpace of
+    its address. Returns a list of the decoded objects which were stored at
+    that address.
+    """
     if IGNORE.get(data_type):
         return []
 
@@ -58,6 +72,9 @@ def _parse_proto(proto_class, data):
 
 
 def _proto_to_dict(proto):
+    if proto.DESCRIPTOR is Rule.DESCRIPTOR:
+        return _rule_to_dict(proto)
+
     result = {}
 
     for field in proto.DESCRIPTOR.fields:
@@ -79,3 +96,25 @@ def _proto_to_dict(proto):
             result[key] = value
 
     return result
+
+
+def _rule_to_dict(rule):
+    """Returns a Rule the way the REST API reports it, with its values as a
+    list whether they were written to its typed fields or, before those
+    existed, comma separated in its value.
+    """
+    result = {'type': Rule.RuleType.Name(rule.type)}
+
+    if rule.value:
+        values = str(rule.value, 'utf-8').split(',')
+        if rule.type in INT_RULE_TYPES and all(
+                v.lstrip('-').isdigit() for v in values):
+            values = [int(v) for v in values]
+    elif rule.type in INT_RULE_TYPES:
+        values = list(rule.int_values)
+    else:
+        values = list(rule.string_values)
+
+    if values:
+        result['value'] = values
+    return result
@@ -16,14 +16,19 @@
 import re
 import logging
 
+from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChange
 from sawtooth_sdk.protobuf.transaction_receipt_pb2 import StateChangeList
 
 from marketplace_ledger_sync.deltas.decoding import data_to_dicts
+from marketplace_ledger_sync.deltas.updating import expire_offers
+from marketplace_ledger_sync.deltas.updating import get_deleter
 from marketplace_ledger_sync.deltas.updating import get_updater
+from marketplace_addressing.addresser import INDEX_NS
 from marketplace_addressing.addresser import NS as NAMESPACE
+from marketplace_addressing.addresser import classify_many
 
 
-NS_REGEX = re.compile('^{}'.format(NAMESPACE))
+NS_REGEX = re.compile('^({}|{})'.format(NAMESPACE, INDEX_NS))
 LOGGER = logging.getLogger(__name__)
 
 
@@ -43,6 +48,7 @@ def _handle_events(database, events):
 
     changes = _parse_state_changes(events)
     _apply_state_changes(database, changes, block_num)
+    _expire_offers(database, block_num)
 
     _insert_new_block(database, block_num, block_id)
 
@@ -88,14 +94,29 @@ def _resolve_if_forked(database, block_num, block_id):
 
 def _apply_state_changes(database, changes, block_num):
     update = get_updater(database, block_num)
-    for change in changes:
-        resources = data_to_dicts(change.address, change.value)
-        for resource in resources:
-            update_results = update(change.address, resource)
-            if update_results['inserted'] == 0:
-                LOGGER.warning(
-                    'Failed to insert resource from address: %s',
-                    change.address)
+    delete = get_deleter(database, block_num)
+    grouped = classify_many(changes, key=lambda change: change.address)
+    for data_type, data_type_changes in grouped.items():
+        for change in data_type_changes:
+            if change.type == StateChange.DELETE:
+                delete(data_type, change.address)
+                continue
+
+            resources = data_to_dicts(data_type, change.value)
+            for resource in resources:
+                update_results = update(data_type, resource, change.address)
+                if update_results['inserted'] == 0:
+                    LOGGER.warning(
+                        'Failed to insert resource from address: %s',
+                        change.address)
+
+
+def _expire_offers(database, block_num):
+    expired = expire_offers(database, block_num)
+    if expired:
+        LOGGER.debug('Closed %s expired offers at block %s',
+                     expired,
+                     block_num)
 
 
 def _insert_new_block(database, block_num, block_id):
@@ -15,35 +15,76 @@
 
 import sys
 
-from marketplace_addressing.addresser import address_is
 from marketplace_addressing.addresser import AddressSpace
 
 
 TABLE_NAMES = {
     AddressSpace.ACCOUNT: 'accounts',
+    AddressSpace.ACCOUNT_HOLDING: 'account_holdings',
     AddressSpace.ASSET: 'assets',
     AddressSpace.HOLDING: 'holdings',
-    AddressSpace.OFFER: 'offers'
+    AddressSpace.HOLDING_CREDIT: 'holding_credits',
+    AddressSpace.OFFER: 'offers',
+    AddressSpace.OFFER_ALLOWLIST: 'offer_allowlists'
 }
 
 SECONDARY_INDEXES = {
     AddressSpace.ACCOUNT: 'public_key',
+    AddressSpace.ACCOUNT_HOLDING: 'holding',
     AddressSpace.ASSET: 'name',
     AddressSpace.HOLDING: 'id',
-    AddressSpace.OFFER: 'id'
+    AddressSpace.HOLDING_CREDIT: 'holding_shard',
+    AddressSpace.OFFER: 'id',
+    AddressSpace.OFFER_ALLOWLIST: 'offer_account'
+}
+
+# The fields of the secondary indexes which are compound.
+COMPOUND_INDEXES = {
+    'holding_shard': ('holding', 'shard'),
+    'offer_account': ('offer_id', 'account')
+}
+
+# The data types the processor deletes from state. Their rows record the
+# address they were stored at, so a deletion can close them.
+DELETABLE = {
+    AddressSpace.OFFER,
+    AddressSpace.OFFER_ALLOWLIST
 }
 
 
 def get_updater(database, block_num):
     """Returns an updater function, which can be used to update the database
-    appropriately for a particular address/data combo.
+    appropriately for a particular AddressSpace/data combo.
     """
-    return lambda adr, rsc: _update(database, block_num, adr, rsc)
+    return lambda data_type, rsc, address=None: _update(
+        database, block_num, data_type, rsc, address)
+
+
+def get_deleter(database, block_num):
+    """Returns a deleter function, which closes the current rows of the
+    resources stored at an address that has been deleted from state.
+    """
+    return lambda data_type, address: _delete(
+        database, block_num, data_type, address)
+
+
+def _delete(database, block_num, data_type, address):
+    if data_type not in DELETABLE:
+        return None
+
+    query = database.get_table(TABLE_NAMES[data_type])\
+        .get_all(address, index='address')\
+        .filter({'end_block_num': sys.maxsize})\
+        .update({'end_block_num': block_num})
 
+    return database.run_query(query)
 
-def _update(database, block_num, address, resource):
-    data_type = address_is(address)
 
+def _update(database, block_num, data_type, resource, address=None):
+    if data_type in DELETABLE and address is not None:
+        resource['address'] = address
+    if data_type == AddressSpace.OFFER:
+        _apply_expiry(resource, block_num)
     resource['start_block_num'] = block_num
     resource['end_block_num'] = sys.maxsize
 
@@ -53,10 +94,47 @@ def _update(database, block_num, address, resource):
     except KeyError:
         raise TypeError('Unknown data type: {}'.format(data_type))
 
+    if seconday_index in COMPOUND_INDEXES:
+        key = [resource[f] for f in COMPOUND_INDEXES[seconday_index]]
+    else:
+        key = resource[seconday_index]
+
     query = table_query\
-        .get_all(resource[seconday_index], index=seconday_index)\
+        .get_all(key, index=seconday_index)\
         .filter({'end_block_num': sys.maxsize})\
         .update({'end_block_num': block_num})\
         .merge(table_query.insert(resource).without('replaced'))
 
     return database.run_query(query)
+
+
+def _apply_expiry(offer, block_num):
+    """Records an Offer as CLOSED once no later block can accept it. The
+    processor never changes the status of an Offer that expires, so an
+    Offer written to state after its expiry is still OPEN there.
+    """
+    if 0 < offer.get('expires_at_block', 0) <= block_num:
+        offer['status'] = 'CLOSED'
+
+
+def expire_offers(database, block_num):
+    """Closes every open Offer whose expires_at_block is block_num, since no
+    later block can accept it. The processor leaves their state unchanged,
+    so the closed versions are recorded here.
+
+    Blocks are handled in order, and an Offer written at a later block is
+    closed as it is recorded, so only the Offers expiring at block_num are
+    looked up rather than every Offer that has ever expired.
+    """
+    expired = database.run_query(
+        database.get_table(TABLE_NAMES[AddressSpace.OFFER])
+        .between(block_num, block_num + 1, index='expires_at_block')
+        .filter({'end_block_num': sys.maxsize, 'status': 'OPEN'})
+        .without('delta_id', 'start_block_num', 'end_block_num')
+        .coerce_to('array'))
+
+    for offer in expired:
+        offer['status'] = 'CLOSED'
+        _update(database, block_num, AddressSpace.OFFER, offer)
+
+    return len(expired)
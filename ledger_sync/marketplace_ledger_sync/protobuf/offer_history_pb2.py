@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_ledger_sync/protobuf/offer_history.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n4marketplace_ledger_sync/protobuf/offer_history.proto\"4\n\x0cOfferHistory\x12\x10\n\x08offer_id\x18\x01 \x01(\t\x12\x12\n\naccount_id\x18\x02 \x01(\t\"7\n\x15OfferHistoryContainer\x12\x1e\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\r.OfferHistoryb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_ledger_sync.protobuf.offer_history_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _OFFERHISTORY._serialized_start=56
+  _OFFERHISTORY._serialized_end=108
+  _OFFERHISTORYCONTAINER._serialized_start=110
+  _OFFERHISTORYCONTAINER._serialized_end=165
+# @@protoc_insertion_point(module_scope)
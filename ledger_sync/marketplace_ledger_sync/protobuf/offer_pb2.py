@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_ledger_sync/protobuf/offer.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from marketplace_ledger_sync.protobuf import rule_pb2 as marketplace__ledger__sync_dot_protobuf_dot_rule__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n,marketplace_ledger_sync/protobuf/offer.proto\x1a+marketplace_ledger_sync/protobuf/rule.proto\"\xd9\x02\n\x05Offer\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0e\n\x06owners\x18\x04 \x03(\t\x12\x0e\n\x06source\x18\x05 \x01(\t\x12\x17\n\x0fsource_quantity\x18\x06 \x01(\x12\x12\x0e\n\x06target\x18\x07 \x01(\t\x12\x17\n\x0ftarget_quantity\x18\x08 \x01(\x12\x12\x14\n\x05rules\x18\t \x03(\x0b\x32\x05.Rule\x12\x1d\n\x06status\x18\n \x01(\x0e\x32\r.Offer.Status\x12\x0e\n\x06\x65scrow\x18\x0b \x01(\x08\x12\x17\n\x0f\x65scrow_quantity\x18\x0c \x01(\x12\x12\x14\n\x0csource_asset\x18\r \x01(\t\x12\x18\n\x10\x65xpires_at_block\x18\x0e \x01(\x04\"0\n\x06Status\x12\x10\n\x0cSTATUS_UNSET\x10\x00\x12\x08\n\x04OPEN\x10\x01\x12\n\n\x06\x43LOSED\x10\x02\")\n\x0eOfferContainer\x12\x17\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x06.Offer\"8\n\x13OfferAllowlistEntry\x12\x10\n\x08offer_id\x18\x01 \x01(\t\x12\x0f\n\x07\x61\x63\x63ount\x18\x02 \x01(\t\"@\n\x17OfferAllowlistContainer\x12%\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x14.OfferAllowlistEntryb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_ledger_sync.protobuf.offer_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _OFFER._serialized_start=94
+  _OFFER._serialized_end=439
+  _OFFER_STATUS._serialized_start=391
+  _OFFER_STATUS._serialized_end=439
+  _OFFERCONTAINER._serialized_start=441
+  _OFFERCONTAINER._serialized_end=482
+  _OFFERALLOWLISTENTRY._serialized_start=484
+  _OFFERALLOWLISTENTRY._serialized_end=540
+  _OFFERALLOWLISTCONTAINER._serialized_start=542
+  _OFFERALLOWLISTCONTAINER._serialized_end=606
+# @@protoc_insertion_point(module_scope)
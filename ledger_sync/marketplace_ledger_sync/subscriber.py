@@ -28,6 +28,7 @@ from sawtooth_sdk.protobuf.client_event_pb2\
 from sawtooth_sdk.protobuf.client_event_pb2\
     import ClientEventsUnsubscribeResponse
 
+from marketplace_addressing.addresser import INDEX_NS
 from marketplace_addressing.addresser import NS as NAMESPACE
 
 
@@ -72,7 +73,7 @@ class Subscriber(object):
             event_type='sawtooth/state-delta',
             filters=[EventFilter(
                 key='address',
-                match_string='^{}.*'.format(NAMESPACE),
+                match_string='^({}|{}).*'.format(NAMESPACE, INDEX_NS),
                 filter_type=EventFilter.REGEX_ANY)])
 
         request = ClientEventsSubscribeRequest(
@@ -15,6 +15,8 @@
 
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
+from marketplace_addressing import addresser
+
 
 def handle_asset_creation(create_asset, header, state):
     """Handles creating an Asset.
@@ -30,6 +32,10 @@ def handle_asset_creation(create_asset, header, state):
             - The txn signer has an account
     """
 
+    state.prefetch([
+        addresser.make_account_address(account_id=header.signer_public_key),
+        addresser.make_asset_address(asset_id=create_asset.name)])
+
     if not state.get_account(public_key=header.signer_public_key):
         raise InvalidTransaction(
             "Unable to create asset, signing key has no"
@@ -0,0 +1,314 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Builds the benchmark workload with marketplace_transaction and writes it
+to stdout as a serialized BatchList.
+
+    python -m marketplace_processor.bench.build_workload ACCOUNTS ACCEPTS \
+        ESCROW CREDIT_SHARDS FAMILY_VERSION
+
+This module is run in its own interpreter by
+marketplace_processor.bench.workload, and must not import anything that
+registers the processor's protobuf messages.
+"""
+
+import sys
+import uuid
+
+from sawtooth_signing import create_context
+from sawtooth_signing import CryptoFactory
+
+from sawtooth_rest_api.protobuf import batch_pb2
+
+from marketplace_transaction import transaction_creation
+from marketplace_transaction.protobuf import rule_pb2
+
+
+# Quantity of its own Asset each account starts with, enough for every
+# acceptance it takes part in.
+STARTING_QUANTITY = 1000000
+
+# The number of times each Offer is accepted by one AcceptOffers, after it
+# has been accepted by the workload's AcceptOffer transactions.
+BULK_ACCEPTS = 2
+
+# Each Offer may only be accepted by the accounts its owner allows.
+OFFER_RULES = [
+    rule_pb2.Rule(type=rule_pb2.Rule.EXCHANGE_LIMITED_TO_ALLOWLIST)
+]
+
+
+def build_batches(accounts,
+                  accepts,
+                  escrow=False,
+                  credit_shards=0,
+                  family_version='1.0'):
+    """Builds one batch per transaction of the workload described in
+    marketplace_processor.bench.workload.make_transactions.
+
+    Args:
+        accounts (int): The number of accounts, at least 2.
+        accepts (int): The number of times each Offer is accepted.
+        escrow (bool): Whether the Offers are escrowed.
+        credit_shards (int): The credit shards of the Offers' targets.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        list of Batch
+    """
+
+    context = create_context('secp256k1')
+    factory = CryptoFactory(context)
+    keys = [factory.new_signer(context.new_random_private_key())
+            for _ in range(accounts)]
+
+    txns = []
+    txns.extend(_setup(keys, accepts + BULK_ACCEPTS, escrow, credit_shards,
+                       family_version))
+    for _ in range(accepts):
+        txns.extend(_accept(keys, escrow, credit_shards, family_version))
+    txns.extend(_accept_many(keys, escrow, credit_shards, family_version))
+    txns.extend(_teardown(keys, escrow, credit_shards, family_version))
+
+    return [batch for batches, _ in txns for batch in batches]
+
+
+def _setup(keys, accepts, escrow, credit_shards, family_version):
+    """Creates an Account, an Asset, a Holding of it and of each of its
+    neighbours' Assets, and an Offer for each key, escrowing enough of the
+    Offer's source for every acceptance, and allows the next account to
+    accept the Offer.
+    """
+
+    accounts = len(keys)
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.create_account(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            label='account-{}'.format(i),
+            description='benchmark account')
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.create_asset(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            name=_asset(i, accounts),
+            description='benchmark asset',
+            rules=[])
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.create_holding(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            identifier=_holding(i, i, accounts),
+            label=_holding_label(i, i, accounts),
+            description='benchmark holding',
+            asset=_asset(i, accounts),
+            quantity=STARTING_QUANTITY)
+
+    # The Holdings of the neighbours' Assets are created together.
+    for i, key in enumerate(keys):
+        yield transaction_creation.create_holdings(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            holdings=[(_holding(i, j, accounts),
+                       _holding_label(i, j, accounts),
+                       'benchmark holding',
+                       _asset(j, accounts),
+                       0,
+                       shards)
+                      for j, shards in ((i + 1, credit_shards), (i - 1, 0))])
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.create_offer(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            identifier=_offer(i),
+            label='offer-{}'.format(i),
+            description='benchmark offer',
+            source=_source(i, accounts),
+            target=transaction_creation.MarketplaceHolding(
+                holding_id=_holding(i, i + 1, accounts),
+                quantity=1,
+                asset=_asset(i + 1, accounts)),
+            rules=OFFER_RULES,
+            escrow_count=accepts if escrow else 0)
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.allow_accounts(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            offer_id=_offer(i),
+            accounts=[_public_key(keys[(i + 1) % accounts])])
+
+
+def _accept(keys, escrow, credit_shards, family_version):
+    """Accepts each Offer once, by the account after its offerer."""
+
+    accounts = len(keys)
+
+    for i in range(accounts):
+        offerer, receiver = _participants(i, accounts, escrow, credit_shards)
+        yield transaction_creation.accept_offer(
+            txn_key=keys[(i + 1) % accounts],
+            batch_key=keys[0],
+            family_version=family_version,
+            identifier=_offer(i),
+            offerer=offerer,
+            receiver=receiver,
+            count=1,
+            rules=OFFER_RULES,
+            expires_at_block=0)
+
+
+def _accept_many(keys, escrow, credit_shards, family_version):
+    """Accepts each Offer BULK_ACCEPTS times in one AcceptOffers, by the
+    account after its offerer.
+    """
+
+    accounts = len(keys)
+
+    for i in range(accounts):
+        offerer, receiver = _participants(i, accounts, escrow, credit_shards)
+        yield transaction_creation.accept_offers(
+            txn_key=keys[(i + 1) % accounts],
+            batch_key=keys[0],
+            family_version=family_version,
+            acceptances=[(_offer(i), offerer, receiver, 1, OFFER_RULES, 0)] *
+            BULK_ACCEPTS)
+
+
+def _teardown(keys, escrow, credit_shards, family_version):
+    """Transfers some of each account's Asset to the target of the previous
+    account's Offer, sweeps the credits of each Offer's target, then
+    updates, closes and prunes the Offer.
+    """
+
+    accounts = len(keys)
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.transfer(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            source=_holding(i, i, accounts),
+            target=_holding(i - 1, i, accounts),
+            asset=_asset(i, accounts),
+            quantity=1,
+            target_credit_shards=credit_shards)
+
+    if credit_shards:
+        for i, key in enumerate(keys):
+            yield transaction_creation.sweep_credits(
+                txn_key=key,
+                batch_key=keys[0],
+                family_version=family_version,
+                identifier=_holding(i, i + 1, accounts),
+                credit_shards=credit_shards)
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.update_offer(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            identifier=_offer(i),
+            description='updated benchmark offer')
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.close_offer(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            identifier=_offer(i),
+            source=_source(i, accounts) if escrow else None)
+
+    for i, key in enumerate(keys):
+        yield transaction_creation.prune_offer(
+            txn_key=key,
+            batch_key=keys[0],
+            family_version=family_version,
+            identifier=_offer(i),
+            allowlist_accounts=[_public_key(keys[(i + 1) % accounts])])
+
+
+def _asset(i, accounts):
+    return 'asset-{}'.format(i % accounts)
+
+
+def _holding_label(i, j, accounts):
+    return 'holding-{}-{}'.format(i % accounts, j % accounts)
+
+
+# Holding and Offer ids are UUIDs, named after their labels, so they have a
+# binary form in 1.1 payloads.
+def _holding(i, j, accounts):
+    return _uuid(_holding_label(i, j, accounts))
+
+
+def _offer(i):
+    return _uuid('offer-{}'.format(i))
+
+
+def _participants(i, accounts, escrow, credit_shards):
+    offerer = transaction_creation.OfferParticipant(
+        source=None if escrow else _holding(i, i, accounts),
+        target=_holding(i, i + 1, accounts),
+        source_asset=_asset(i, accounts),
+        target_asset=_asset(i + 1, accounts),
+        target_credit_shards=credit_shards)
+    receiver = transaction_creation.OfferParticipant(
+        source=_holding(i + 1, i + 1, accounts),
+        target=_holding(i + 1, i, accounts),
+        source_asset=_asset(i + 1, accounts),
+        target_asset=_asset(i, accounts))
+    return offerer, receiver
+
+
+def _source(i, accounts):
+    return transaction_creation.MarketplaceHolding(
+        holding_id=_holding(i, i, accounts),
+        quantity=1,
+        asset=_asset(i, accounts))
+
+
+def _public_key(key):
+    return key.get_public_key().as_hex()
+
+
+def _uuid(name):
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, name))
+
+
+def main():
+    accounts, accepts, escrow, credit_shards = (
+        int(arg) for arg in sys.argv[1:5])
+    batch_list = batch_pb2.BatchList(batches=build_batches(
+        accounts,
+        accepts,
+        escrow=bool(escrow),
+        credit_shards=credit_shards,
+        family_version=sys.argv[5]))
+    sys.stdout.buffer.write(batch_list.SerializeToString())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+"""Measures handler throughput as the number of transactions applied at once
+grows, the way ThreadedTransactionProcessor applies them.
+
+    python -m marketplace_processor.bench.concurrency --latency 0.002
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import time
+
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from marketplace_processor.bench.context import InMemoryContext
+from marketplace_processor.handler import MarketplaceHandler
+from marketplace_processor.protobuf import payload_pb2
+
+
+def make_create_account(index):
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.CREATE_ACCOUNT,
+        create_account=payload_pb2.CreateAccount(
+            label='account {}'.format(index),
+            description='benchmark account'))
+
+    return TpProcessRequest(
+        header=TransactionHeader(signer_public_key=os.urandom(33).hex()),
+        payload=payload.SerializeToString())
+
+
+def run(transactions, workers, latency):
+    """Applies the transactions on workers threads against a fresh
+    in-memory state.
+
+    Returns:
+        float: Transactions applied per second.
+    """
+
+    handler = MarketplaceHandler()
+    context = InMemoryContext(latency=latency)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(
+                lambda txn: handler.apply(txn, context),
+                transactions):
+            pass
+    return len(transactions) / (time.perf_counter() - start)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transactions', type=int, default=2000)
+    parser.add_argument('--latency',
+                        type=float,
+                        default=0.001,
+                        help='Seconds each state call to the validator takes')
+    parser.add_argument('--workers',
+                        type=int,
+                        nargs='+',
+                        default=[1, 2, 4, 8, 16, 32])
+    return parser.parse_args()
+
+
+def main():
+    opts = parse_args()
+    transactions = [make_create_account(i) for i in range(opts.transactions)]
+
+    print("{} CreateAccount transactions, {:.1f} ms per state call".format(
+        opts.transactions, opts.latency * 1000))
+    print("{:>8} {:>10} {:>8}".format('workers', 'txns/s', 'speedup'))
+
+    baseline = None
+    for workers in opts.workers:
+        rate = run(transactions, workers, opts.latency)
+        baseline = baseline or rate
+        print("{:>8} {:>10.0f} {:>7.1f}x".format(
+            workers, rate, rate / baseline))
+
+
+if __name__ == '__main__':
+    main()
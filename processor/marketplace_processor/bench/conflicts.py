@@ -0,0 +1,219 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+"""Builds the conflict graph of a workload from the inputs and outputs its
+transactions declare, and reports how far the validator's parallel
+scheduler could overlap them.
+
+Two transactions conflict if one writes an address the other reads or
+writes, where a declared prefix stands for every address under it. Each
+transaction must wait for the earlier transactions it conflicts with, so
+the longest chain of conflicts bounds how quickly the workload can be
+applied however many transactions run at once.
+"""
+
+import argparse
+import collections
+import sys
+
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.bench.workload import make_transactions
+from marketplace_processor.marketplace_payload import MarketplacePayload
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        description='Reports the achievable parallelism of a marketplace '
+                    'workload from the conflicts between the addresses '
+                    'its transactions declare.')
+
+    parser.add_argument('--batch-list',
+                        help='File holding a serialized BatchList to '
+                             'analyse, instead of generating a workload')
+
+    parser.add_argument('--accounts',
+                        type=int,
+                        default=20,
+                        help='Number of accounts in the generated workload')
+
+    parser.add_argument('--accepts',
+                        type=int,
+                        default=20,
+                        help='Number of times each account\'s Offer is '
+                             'accepted')
+
+    parser.add_argument('--escrow',
+                        action='store_true',
+                        help='Escrow the Offers\' source quantity')
+
+    parser.add_argument('--credit-shards',
+                        type=int,
+                        default=0,
+                        help='Number of credit shards of the Offers\' '
+                             'targets')
+
+    parser.add_argument('--top',
+                        type=int,
+                        default=5,
+                        help='Number of most contended addresses to list')
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    opts = parse_args(args)
+
+    if opts.batch_list:
+        with open(opts.batch_list, 'rb') as batch_file:
+            batch_list = BatchList.FromString(batch_file.read())
+        transactions = [
+            (TransactionHeader.FromString(t.header), t.payload)
+            for b in batch_list.batches for t in b.transactions]
+    else:
+        if opts.accounts < 2:
+            print("Error: --accounts must be at least 2", file=sys.stderr)
+            sys.exit(2)
+        transactions = [
+            (t.header, t.payload) for t in make_transactions(
+                opts.accounts,
+                opts.accepts,
+                escrow=opts.escrow,
+                credit_shards=opts.credit_shards)]
+
+    if not transactions:
+        print("Error: the workload has no transactions", file=sys.stderr)
+        sys.exit(2)
+
+    graph = ConflictGraph()
+    for header, payload in transactions:
+        graph.add(
+            MarketplacePayload(
+                payload=payload,
+                family_version=header.family_version).payload_type_name(),
+            header.inputs,
+            header.outputs)
+
+    print("{} transactions, {} conflicts".format(
+        len(graph.depths), graph.edges))
+    print("critical path {}, widest step {}, parallelism {:.1f}".format(
+        graph.critical_path(),
+        graph.widest_step(),
+        len(graph.depths) / graph.critical_path()))
+
+    print("{:<16} {:>8} {:>14}".format(
+        'payload', 'count', 'waits on avg'))
+    for payload_type, waits in sorted(graph.waits.items()):
+        print("{:<16} {:>8} {:>14.1f}".format(
+            payload_type, len(waits), sum(waits) / len(waits)))
+
+    print("most written addresses:")
+    for address, writers in graph.writers.most_common(opts.top):
+        print("  {} {:<16} {}".format(
+            address,
+            addresser.address_is(address).name,
+            writers))
+
+
+class ConflictGraph(object):
+
+    def __init__(self):
+        """The conflicts between transactions added in the order they are
+        applied. Only the edges that bound the schedule are kept: a write
+        waits on the last write of the address and the reads since, and a
+        read waits on the last write.
+
+        Two declared entries overlap when either is a prefix of the other,
+        as the validator's scheduler treats them, since some builders in
+        marketplace_transaction declare a prefix, such as prune_offer
+        declaring every receipt of the Offer.
+        """
+
+        # The step each transaction could run in, from 1.
+        self.depths = []
+        self.edges = 0
+        self.waits = collections.defaultdict(list)
+        self.writers = collections.Counter()
+
+        self._last_write = {}
+        self._reads_since_write = collections.defaultdict(list)
+
+        # The declared entries seen so far, by each of their prefixes.
+        self._entries = collections.defaultdict(set)
+
+    def add(self, payload_type, inputs, outputs):
+        """Adds the next transaction.
+
+        Args:
+            payload_type (str): The payload type name.
+            inputs (list of str): The declared inputs.
+            outputs (list of str): The declared outputs.
+        """
+
+        index = len(self.depths)
+        outputs = set(outputs)
+        reads = set(inputs) - outputs
+
+        waits_on = set()
+        for address in reads:
+            for entry in self._overlapping(address):
+                if entry in self._last_write:
+                    waits_on.add(self._last_write[entry])
+        for address in outputs:
+            for entry in self._overlapping(address):
+                if entry in self._last_write:
+                    waits_on.add(self._last_write[entry])
+                waits_on.update(self._reads_since_write[entry])
+
+        self.depths.append(
+            1 + max((self.depths[i] for i in waits_on), default=0))
+        self.edges += len(waits_on)
+        self.waits[payload_type].append(len(waits_on))
+
+        for address in reads:
+            self._reads_since_write[address].append(index)
+        for address in outputs:
+            self._last_write[address] = index
+            self._reads_since_write[address] = []
+            self.writers[address] += 1
+        for address in reads | outputs:
+            for end in range(1, len(address) + 1):
+                self._entries[address[:end]].add(address)
+
+    def _overlapping(self, address):
+        """Returns the declared entries seen so far that address is a
+        prefix of, or that are a prefix of it, including address itself.
+        """
+
+        overlapping = set(self._entries.get(address, ()))
+        overlapping.update(
+            address[:end] for end in range(1, len(address))
+            if address[:end] in self._entries.get(address[:end], ()))
+        return overlapping
+
+    def critical_path(self):
+        """Returns the number of steps the transactions need at best."""
+
+        return max(self.depths, default=0)
+
+    def widest_step(self):
+        """Returns the most transactions that could run in one step."""
+
+        return max(collections.Counter(self.depths).values(), default=0)
@@ -0,0 +1,120 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import threading
+import time
+
+from sawtooth_sdk.processor.exceptions import AuthorizationException
+from sawtooth_sdk.protobuf.state_context_pb2 import TpStateEntry
+
+
+class InMemoryContext(object):
+
+    def __init__(self, latency=0.0):
+        """A stand-in for sawtooth_sdk.processor.context.Context that keeps
+        state in a dict, for running the handler without a validator.
+
+        Args:
+            latency (float): Seconds each get_state, set_state and
+                delete_state call blocks for, standing in for the round
+                trip to the validator.
+        """
+
+        self._latency = latency
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def get_state(self, addresses, timeout=None):
+        self._wait()
+        with self._lock:
+            return [
+                TpStateEntry(address=address, data=self._state[address])
+                for address in addresses if address in self._state
+            ]
+
+    def set_state(self, entries, timeout=None):
+        self._wait()
+        with self._lock:
+            self._state.update(entries)
+        return list(entries)
+
+    def delete_state(self, addresses, timeout=None):
+        self._wait()
+        with self._lock:
+            deleted = [a for a in addresses if a in self._state]
+            for address in deleted:
+                del self._state[address]
+        return deleted
+
+    def _wait(self):
+        if self._latency:
+            time.sleep(self._latency)
+
+
+class DeclaredContext(object):
+
+    def __init__(self, context, inputs, outputs):
+        """Wraps a context for one transaction, raising
+        AuthorizationException for a read outside the transaction's declared
+        inputs or a write outside its outputs, as the validator does. It
+        also records which declared addresses are actually used.
+
+        Args:
+            context (InMemoryContext): The shared state.
+            inputs (list of str): The declared input addresses or prefixes.
+            outputs (list of str): The declared output addresses or
+                prefixes.
+        """
+
+        self._context = context
+        self._inputs = list(inputs)
+        self._outputs = list(outputs)
+        self.read = set()
+        self.written = set()
+
+    def get_state(self, addresses, timeout=None):
+        _check_declared(addresses, self._inputs, 'input')
+        self.read.update(addresses)
+        return self._context.get_state(addresses, timeout=timeout)
+
+    def set_state(self, entries, timeout=None):
+        _check_declared(entries, self._outputs, 'output')
+        self.written.update(entries)
+        return self._context.set_state(entries, timeout=timeout)
+
+    def delete_state(self, addresses, timeout=None):
+        _check_declared(addresses, self._outputs, 'output')
+        self.written.update(addresses)
+        return self._context.delete_state(addresses, timeout=timeout)
+
+    def unused_inputs(self):
+        """Returns the declared inputs that were not read."""
+
+        return [i for i in self._inputs
+                if not any(a.startswith(i) for a in self.read)]
+
+    def unused_outputs(self):
+        """Returns the declared outputs that were not written."""
+
+        return [o for o in self._outputs
+                if not any(a.startswith(o) for a in self.written)]
+
+
+def _check_declared(addresses, declared, kind):
+    for address in addresses:
+        if not any(address.startswith(prefix) for prefix in declared):
+            raise AuthorizationException(
+                "Tried to use undeclared {} address {}".format(
+                    kind, address))
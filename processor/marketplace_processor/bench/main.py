@@ -0,0 +1,177 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import argparse
+import collections
+import sys
+import time
+
+from sawtooth_sdk.processor.exceptions import AuthorizationException
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_processor.bench.context import DeclaredContext
+from marketplace_processor.bench.context import InMemoryContext
+from marketplace_processor.bench.workload import make_transactions
+from marketplace_processor.handler import MarketplaceHandler
+from marketplace_processor.marketplace_payload import MarketplacePayload
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        description='Applies a generated marketplace workload to '
+                    'MarketplaceHandler against in-memory state, and '
+                    'reports throughput and latency per payload type. '
+                    'Each transaction may only use the addresses it '
+                    'declares, as with a validator.')
+
+    parser.add_argument('--accounts',
+                        type=int,
+                        default=20,
+                        help='Number of accounts in the workload')
+
+    parser.add_argument('--accepts',
+                        type=int,
+                        default=20,
+                        help='Number of times each account\'s Offer is '
+                             'accepted')
+
+    parser.add_argument('--escrow',
+                        action='store_true',
+                        help='Escrow the Offers\' source quantity')
+
+    parser.add_argument('--credit-shards',
+                        type=int,
+                        default=0,
+                        help='Number of credit shards of the Offers\' '
+                             'targets')
+
+    parser.add_argument('--family-version',
+                        choices=['1.0', '1.1'],
+                        default='1.0',
+                        help='Encoding of the workload\'s payloads')
+
+    parser.add_argument('--latency',
+                        type=float,
+                        default=0.0,
+                        help='Seconds each state call to the validator '
+                             'takes')
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    if args is None:
+        args = sys.argv[1:]
+    opts = parse_args(args)
+
+    if opts.accounts < 2:
+        print("Error: --accounts must be at least 2", file=sys.stderr)
+        sys.exit(2)
+
+    transactions = make_transactions(
+        opts.accounts,
+        opts.accepts,
+        escrow=opts.escrow,
+        credit_shards=opts.credit_shards,
+        family_version=opts.family_version)
+
+    result = run(transactions, opts.latency)
+
+    print("{} transactions in {:.3f}s, {:.0f} txns/s".format(
+        len(transactions), result.elapsed, len(transactions) / result.elapsed))
+    print("{} bytes of payload".format(
+        sum(len(transaction.payload) for transaction in transactions)))
+    print("{:<16} {:>8} {:>10} {:>9} {:>9} {:>8} {:>8}".format(
+        'payload', 'count', 'txns/s', 'p50 ms', 'p99 ms', 'invalid',
+        'unused'))
+    for payload_type, times in sorted(result.latencies.items()):
+        print("{:<16} {:>8} {:>10.0f} {:>9.3f} {:>9.3f} {:>8} {:>8}".format(
+            payload_type,
+            len(times),
+            len(times) / sum(times),
+            _percentile(times, 0.5) * 1000,
+            _percentile(times, 0.99) * 1000,
+            result.invalid[payload_type],
+            result.unused[payload_type]))
+
+    for payload_type, error in sorted(result.undeclared.items()):
+        print("{}: {}".format(payload_type, error), file=sys.stderr)
+
+    # The workload is valid end to end and every builder declares what its
+    # handler uses, so any rejection is a regression.
+    if sum(result.invalid.values()) or result.undeclared:
+        sys.exit(1)
+
+
+def run(transactions, latency):
+    """Applies the transactions in order to a fresh in-memory state.
+
+    Args:
+        transactions (list of TpProcessRequest): The workload.
+        latency (float): Seconds each state call takes.
+
+    Returns:
+        RunResult: Apply latencies in seconds, counts of InvalidTransaction
+            and of declared addresses that were not used, and the first
+            use of an undeclared address, each by payload type name, and
+            the total seconds.
+    """
+
+    handler = MarketplaceHandler()
+    context = InMemoryContext(latency=latency)
+
+    latencies = collections.defaultdict(list)
+    invalid = collections.Counter()
+    unused = collections.Counter()
+    undeclared = {}
+
+    start = time.perf_counter()
+    for transaction in transactions:
+        payload_type = MarketplacePayload(
+            payload=transaction.payload,
+            family_version=transaction.header.family_version
+        ).payload_type_name()
+        declared = DeclaredContext(
+            context,
+            inputs=transaction.header.inputs,
+            outputs=transaction.header.outputs)
+
+        applied = time.perf_counter()
+        try:
+            handler.apply(transaction, declared)
+        except InvalidTransaction:
+            invalid[payload_type] += 1
+        except AuthorizationException as err:
+            undeclared.setdefault(payload_type, err)
+        latencies[payload_type].append(time.perf_counter() - applied)
+
+        unused[payload_type] += len(declared.unused_inputs()) + \
+            len(declared.unused_outputs())
+
+    return RunResult(
+        latencies=latencies,
+        invalid=invalid,
+        unused=unused,
+        undeclared=undeclared,
+        elapsed=time.perf_counter() - start)
+
+
+RunResult = collections.namedtuple(
+    'RunResult', ['latencies', 'invalid', 'unused', 'undeclared', 'elapsed'])
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
@@ -0,0 +1,75 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import os
+import subprocess
+import sys
+
+from sawtooth_sdk.protobuf.batch_pb2 import BatchList
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+
+def make_transactions(accounts,
+                      accepts,
+                      escrow=False,
+                      credit_shards=0,
+                      family_version='1.0'):
+    """Builds a marketplace workload of signed transactions with
+    marketplace_transaction.transaction_creation, in the order they must be
+    applied.
+
+    Each account creates an Asset and a Holding of it, a Holding of each of
+    its neighbours' Assets in one CreateHoldings, and an Offer of its Asset
+    for the next account's, which only the next account is allowed to
+    accept. The next account accepts that Offer accepts times, then twice
+    more in one AcceptOffers. Each account then transfers some of its Asset
+    to the target of the previous account's Offer, and the Offer is
+    updated, closed and pruned. With credit_shards, the credits to each
+    Offer's target are swept before it is closed.
+
+    marketplace_transaction has its own generated copy of the marketplace
+    protobuf messages, which cannot be registered alongside the
+    processor's, so the batches are built by build_workload in a separate
+    interpreter.
+
+    Args:
+        accounts (int): The number of accounts, at least 2.
+        accepts (int): The number of times each Offer is accepted.
+        escrow (bool): Whether the Offers are escrowed.
+        credit_shards (int): The credit shards of the Offers' targets.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        list of TpProcessRequest
+    """
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, '-m', 'marketplace_processor.bench.build_workload',
+         str(accounts), str(accepts), str(int(escrow)), str(credit_shards),
+         family_version],
+        stdout=subprocess.PIPE,
+        env=env,
+        check=True).stdout
+
+    return [
+        TpProcessRequest(
+            header=TransactionHeader.FromString(transaction.header),
+            payload=transaction.payload,
+            signature=transaction.header_signature)
+        for batch in BatchList.FromString(output).batches
+        for transaction in batch.transactions
+    ]
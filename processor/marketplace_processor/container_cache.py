@@ -0,0 +1,99 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import collections
+import hashlib
+import logging
+import threading
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ContainerCache(object):
+
+    def __init__(self, maxsize=1024, log_interval=1000):
+        """A bounded cache of parsed state containers, shared by every
+        transaction the processor handles. Containers are keyed by a digest
+        of the bytes they were parsed from, so a container is only parsed
+        again once its bytes in state change.
+
+        The containers handed out are shared between transactions and must
+        not be mutated. Copy a container before changing it.
+
+        Args:
+            maxsize (int): The number of containers to keep.
+            log_interval (int): Log the hit rate after this many lookups.
+        """
+
+        self._maxsize = maxsize
+        self._log_interval = log_interval
+        self._containers = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self):
+        return self._hits
+
+    @property
+    def misses(self):
+        return self._misses
+
+    def parse(self, container_class, data):
+        """Returns the container parsed from the data, parsing it only if
+        the same bytes have not been parsed recently.
+
+        Args:
+            container_class (type): The protobuf container class.
+            data (bytes): The serialized container.
+
+        Returns:
+            The shared, parsed container.
+        """
+
+        key = (container_class, hashlib.sha256(data).digest())
+
+        with self._lock:
+            container = self._containers.get(key)
+            if container is not None:
+                self._containers.move_to_end(key)
+                self._hits += 1
+                self._log_hit_rate()
+                return container
+
+        container = container_class()
+        container.ParseFromString(data)
+
+        with self._lock:
+            self._containers[key] = container
+            if len(self._containers) > self._maxsize:
+                self._containers.popitem(last=False)
+            self._misses += 1
+            self._log_hit_rate()
+
+        return container
+
+    def _log_hit_rate(self):
+        lookups = self._hits + self._misses
+        if lookups % self._log_interval == 0:
+            LOGGER.info(
+                "Container cache hit rate %.1f%% (%s hits, %s misses, "
+                "%s cached)",
+                100.0 * self._hits / lookups,
+                self._hits,
+                self._misses,
+                len(self._containers))
@@ -13,70 +13,162 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+import collections
+import logging
+import threading
+import time
+
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 from sawtooth_sdk.processor.handler import TransactionHandler
 
 from marketplace_addressing import addresser
+from marketplace_addressing import identifiers
 
 from marketplace_processor.account import account_creation
 from marketplace_processor.asset import asset_creation
+from marketplace_processor.container_cache import ContainerCache
+from marketplace_processor.holding import credit_sweep
 from marketplace_processor.holding import holding_creation
+from marketplace_processor.holding import holding_transfer
 from marketplace_processor.offer import offer_acceptance
+from marketplace_processor.offer import offer_allowlist
 from marketplace_processor.offer import offer_closure
 from marketplace_processor.offer import offer_creation
+from marketplace_processor.offer import offer_pruning
+from marketplace_processor.offer import offer_update
 from marketplace_processor.marketplace_payload import MarketplacePayload
 from marketplace_processor.marketplace_state import MarketplaceState
+from marketplace_processor.metrics import MetricsContext
+from marketplace_processor.protobuf.payload_pb2 import TransactionPayload
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+# The MarketplacePayload accessor and the handler of each payload type.
+_HANDLERS = {
+    TransactionPayload.CREATE_ACCOUNT: (
+        MarketplacePayload.create_account,
+        account_creation.handle_account_creation),
+    TransactionPayload.CREATE_ASSET: (
+        MarketplacePayload.create_asset,
+        asset_creation.handle_asset_creation),
+    TransactionPayload.CREATE_HOLDING: (
+        MarketplacePayload.create_holding,
+        holding_creation.handle_holding_creation),
+    TransactionPayload.CREATE_HOLDINGS: (
+        MarketplacePayload.create_holdings,
+        holding_creation.handle_holdings_creation),
+    TransactionPayload.SWEEP_CREDITS: (
+        MarketplacePayload.sweep_credits,
+        credit_sweep.handle_sweep_credits),
+    TransactionPayload.TRANSFER: (
+        MarketplacePayload.transfer,
+        holding_transfer.handle_transfer),
+    TransactionPayload.CREATE_OFFER: (
+        MarketplacePayload.create_offer,
+        offer_creation.handle_offer_creation),
+    TransactionPayload.ACCEPT_OFFER: (
+        MarketplacePayload.accept_offer,
+        offer_acceptance.handle_accept_offer),
+    TransactionPayload.ACCEPT_OFFERS: (
+        MarketplacePayload.accept_offers,
+        offer_acceptance.handle_accept_offers),
+    TransactionPayload.CLOSE_OFFER: (
+        MarketplacePayload.close_offer,
+        offer_closure.handle_close_offer),
+    TransactionPayload.ALLOW_ACCOUNTS: (
+        MarketplacePayload.allow_accounts,
+        offer_allowlist.handle_allow_accounts),
+    TransactionPayload.PRUNE_OFFER: (
+        MarketplacePayload.prune_offer,
+        offer_pruning.handle_prune_offer),
+    TransactionPayload.UPDATE_OFFER: (
+        MarketplacePayload.update_offer,
+        offer_update.handle_update_offer),
+}
 
 
 class MarketplaceHandler(TransactionHandler):
 
+    def __init__(self, container_cache_size=1024, metrics=None):
+        # set_state calls saved by write coalescing, by payload type. apply
+        # may be called from several threads at once, and everything else it
+        # touches is either per transaction or locked, like the cache.
+        self._saved_writes = collections.Counter()
+        self._saved_writes_lock = threading.Lock()
+
+        # Parsed containers shared by every transaction this handler applies.
+        self._container_cache = ContainerCache(maxsize=container_cache_size)
+
+        # Optional marketplace_processor.metrics.Metrics.
+        self._metrics = metrics
+
+    @property
+    def saved_writes(self):
+        """Returns the set_state calls saved by write coalescing, by payload
+        type name.
+        """
+
+        with self._saved_writes_lock:
+            return dict(self._saved_writes)
+
     @property
     def family_name(self):
         return addresser.FAMILY_NAME
 
     @property
     def namespaces(self):
-        return [addresser.NS]
+        return [addresser.NS, addresser.INDEX_NS]
 
     @property
     def family_versions(self):
-        return ['1.0']
+        # 1.1 only changes how identifiers are encoded in the payload, so
+        # both are handled alike once the payload is parsed.
+        return ['1.0', identifiers.COMPACT_FAMILY_VERSION]
 
     def apply(self, transaction, context):
+        payload = MarketplacePayload(
+            payload=transaction.payload,
+            family_version=transaction.header.family_version)
+
+        if self._metrics is None:
+            self._apply(payload, transaction, context)
+            return
+
+        start = time.perf_counter()
+        payload_type = payload.payload_type_name()
+        try:
+            self._apply(
+                payload,
+                transaction,
+                MetricsContext(context, self._metrics, payload_type))
+        except InvalidTransaction as err:
+            self._metrics.count_invalid(payload_type, err)
+            raise
+        finally:
+            self._metrics.observe_apply(
+                payload_type, time.perf_counter() - start)
 
-        state = MarketplaceState(context=context, timeout=2)
-        payload = MarketplacePayload(payload=transaction.payload)
-
-        if payload.is_create_account():
-            account_creation.handle_account_creation(
-                payload.create_account(),
-                header=transaction.header,
-                state=state)
-        elif payload.is_create_asset():
-            asset_creation.handle_asset_creation(
-                payload.create_asset(),
-                header=transaction.header,
-                state=state)
-        elif payload.is_create_holding():
-            holding_creation.handle_holding_creation(
-                payload.create_holding(),
-                header=transaction.header,
-                state=state)
-        elif payload.is_create_offer():
-            offer_creation.handle_offer_creation(
-                payload.create_offer(),
-                header=transaction.header,
-                state=state)
-        elif payload.is_accept_offer():
-            offer_acceptance.handle_accept_offer(
-                payload.accept_offer(),
-                header=transaction.header,
-                state=state)
-        elif payload.is_close_offer():
-            offer_closure.handle_close_offer(
-                payload.close_offer(),
-                header=transaction.header,
-                state=state)
-
-        else:
+    def _apply(self, payload, transaction, context):
+
+        state = MarketplaceState(
+            context=context,
+            timeout=2,
+            container_cache=self._container_cache)
+
+        try:
+            accessor, handle = _HANDLERS[payload.payload_type()]
+        except KeyError:
             raise InvalidTransaction("Transaction payload type unknown.")
+
+        handle(accessor(payload), header=transaction.header, state=state)
+
+        payload_type = payload.payload_type_name()
+        saved = state.flush()
+        with self._saved_writes_lock:
+            self._saved_writes[payload_type] += saved
+            total = self._saved_writes[payload_type]
+        LOGGER.debug("%s set_state calls saved by write coalescing: %s",
+                     payload_type,
+                     total)
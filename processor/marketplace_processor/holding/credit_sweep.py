@@ -0,0 +1,60 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_addressing import addresser
+
+
+def handle_sweep_credits(sweep_credits, header, state):
+    """Adds the credits waiting in every shard of a Holding to its
+    quantity.
+
+    Args:
+        sweep_credits (SweepCredits): The transaction.
+        header (TransactionHeader): The header of the Transaction.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        InvalidTransaction
+            - The Holding does not exist.
+            - The txn signer is not the Holding's account.
+            - The Holding does not have credit shards.
+    """
+
+    holding = state.get_holding(identifier=sweep_credits.holding)
+
+    if not holding:
+        raise InvalidTransaction(
+            "Failed to sweep credits, Holding {} does not exist.".format(
+                sweep_credits.holding))
+
+    if holding.account != header.signer_public_key:
+        raise InvalidTransaction(
+            "Failed to sweep credits, the txn signer {} is not the account "
+            "of Holding {}.".format(header.signer_public_key, holding.id))
+
+    if not holding.credit_shards:
+        raise InvalidTransaction(
+            "Failed to sweep credits, Holding {} does not have credit "
+            "shards.".format(holding.id))
+
+    state.prefetch(addresser.make_holding_credit_addresses(
+        holding_id=holding.id,
+        credit_shards=holding.credit_shards))
+
+    state.sweep_holding_credits(
+        identifier=holding.id,
+        credit_shards=holding.credit_shards)
@@ -15,6 +15,8 @@
 
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
+from marketplace_addressing import addresser
+
 
 def handle_holding_creation(create_holding, header, state):
     """
@@ -31,8 +33,89 @@ def handle_holding_creation(create_holding, header, state):
             - The Asset does not exist.
             - The quantity is not 0 and the Asset owner doesn't match the
               transaction signer public key.
+            - The credit_shards is more than addresser.MAX_CREDIT_SHARDS.
+    """
+
+    indexed = _is_indexed(header, [create_holding.id])
+
+    state.prefetch([
+        addresser.make_holding_address(holding_id=create_holding.id),
+        addresser.make_account_address(account_id=header.signer_public_key),
+        addresser.make_asset_address(asset_id=create_holding.asset)] +
+        _account_holding_addresses(header, [create_holding.id], indexed))
+
+    _create_holding(create_holding, header, state)
+
+    state.add_holding_to_account(
+        public_key=header.signer_public_key,
+        holding_id=create_holding.id,
+        indexed=indexed)
+
+
+def handle_holdings_creation(create_holdings, header, state):
+    """Creates each Holding and records it as belonging to the signer's
+    Account.
+
+    Args:
+        create_holdings (CreateHoldings): The transaction.
+        header (TransactionHeader): The header of the Transaction.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        InvalidTransaction
+            - There are no CreateHolding entries.
+            - Any of the CreateHolding entries is invalid, as for
+              handle_holding_creation, including two entries with the same
+              identifier.
+    """
+
+    if not create_holdings.entries:
+        raise InvalidTransaction(
+            "Failed to create Holdings, no Holdings were given")
+
+    holding_ids = [h.id for h in create_holdings.entries]
+    indexed = _is_indexed(header, holding_ids)
+
+    state.prefetch(
+        [addresser.make_account_address(
+            account_id=header.signer_public_key)] +
+        addresser.make_addresses(
+            addresser.AddressSpace.HOLDING, holding_ids) +
+        addresser.make_addresses(
+            addresser.AddressSpace.ASSET,
+            [h.asset for h in create_holdings.entries]) +
+        _account_holding_addresses(header, holding_ids, indexed))
+
+    for create_holding in create_holdings.entries:
+        _create_holding(create_holding, header, state)
+
+    state.add_holdings_to_account(
+        public_key=header.signer_public_key,
+        holding_ids=holding_ids,
+        indexed=indexed)
+
+
+def _is_indexed(header, holding_ids):
+    """Whether the transaction declares the account holding address of each
+    Holding as an output. Transactions built before those addresses existed
+    declare the Account instead, and their Holdings are appended to
+    Account.holdings so they are still valid.
     """
 
+    return all(
+        any(address.startswith(output) for output in header.outputs)
+        for address in _account_holding_addresses(header, holding_ids))
+
+
+def _account_holding_addresses(header, holding_ids, indexed=True):
+    if not indexed:
+        return []
+    return addresser.make_addresses(
+        addresser.AddressSpace.ACCOUNT_HOLDING,
+        [(header.signer_public_key, h) for h in holding_ids])
+
+
+def _create_holding(create_holding, header, state):
     if state.get_holding(identifier=create_holding.id):
         raise InvalidTransaction("Failed to create Holding, id {} already "
                                  "exists.".format(create_holding.id))
@@ -57,14 +140,17 @@ def handle_holding_creation(create_holding, header, state):
                                   header.signer_public_key,
                                   asset.name))
 
+    if create_holding.credit_shards > addresser.MAX_CREDIT_SHARDS:
+        raise InvalidTransaction(
+            "Failed to create Holding, credit_shards {} is more than the "
+            "maximum of {}".format(create_holding.credit_shards,
+                                   addresser.MAX_CREDIT_SHARDS))
+
     state.set_holding(
         identifier=create_holding.id,
         label=create_holding.label,
         description=create_holding.description,
         account=header.signer_public_key,
         asset=create_holding.asset,
-        quantity=create_holding.quantity)
-
-    state.add_holding_to_account(
-        public_key=header.signer_public_key,
-        holding_id=create_holding.id)
+        quantity=create_holding.quantity,
+        credit_shards=create_holding.credit_shards)
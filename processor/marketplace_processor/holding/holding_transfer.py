@@ -0,0 +1,122 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_addressing import addresser
+
+
+def handle_transfer(transfer, header, state):
+    """Moves quantity from one of the signer's Holdings to another Holding
+    of the same Asset. An infinite source Holding is not debited, and a
+    target with credit shards is credited through the signer's shard.
+
+    Args:
+        transfer (Transfer): The transaction.
+        header (TransactionHeader): The header of the Transaction.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        InvalidTransaction
+            - The quantity is 0.
+            - The source and target are the same Holding.
+            - The source or target Holding does not exist.
+            - The txn signer is not the source Holding's account.
+            - The Holdings are of different Assets.
+            - The Asset is NOT_TRANSFERABLE and the signer is not an owner.
+            - The source Holding does not have the quantity.
+    """
+
+    if not transfer.quantity:
+        raise InvalidTransaction(
+            "Failed to transfer, quantity was unset or 0")
+
+    if transfer.source == transfer.target:
+        raise InvalidTransaction(
+            "Failed to transfer, source and target are the same Holding "
+            "{}".format(transfer.source))
+
+    _prefetch(transfer, header, state)
+
+    source = state.get_holding(identifier=transfer.source)
+    if not source:
+        raise InvalidTransaction(
+            "Failed to transfer, Holding id {} listed as source does not "
+            "refer to a Holding.".format(transfer.source))
+
+    if source.account != header.signer_public_key:
+        raise InvalidTransaction(
+            "Failed to transfer, source Holding account {} not owned by "
+            "txn signer {}".format(source.account, header.signer_public_key))
+
+    target = state.get_holding(identifier=transfer.target)
+    if not target:
+        raise InvalidTransaction(
+            "Failed to transfer, Holding id {} listed as target does not "
+            "refer to a Holding.".format(transfer.target))
+
+    if source.asset != target.asset:
+        raise InvalidTransaction(
+            "Failed to transfer, source Holding asset {} does not match "
+            "target Holding asset {}".format(source.asset, target.asset))
+
+    rules = state.get_asset_rules(source.asset)
+    if rules.is_not_transferable(header.signer_public_key):
+        raise InvalidTransaction(
+            "Failed to transfer, asset {} is not transferable".format(
+                source.asset))
+
+    infinite = rules.holding_is_infinite(source.account)
+    if not infinite and transfer.quantity > source.quantity:
+        raise InvalidTransaction(
+            "Failed to transfer, needed quantity {}, but Holding {} only "
+            "has {}".format(transfer.quantity, source.id, source.quantity))
+
+    if not infinite:
+        state.adjust_holding_quantity(source.id, -transfer.quantity)
+
+    if target.credit_shards:
+        state.credit_holding(
+            target.id,
+            addresser.credit_shard(
+                header.signer_public_key,
+                target.credit_shards),
+            transfer.quantity)
+    else:
+        state.adjust_holding_quantity(target.id, transfer.quantity)
+
+
+def _prefetch(transfer, header, state):
+    """Loads the Transfer read set in two batched reads: the Holdings, then
+    their Asset and the target's credit shard, if it has shards.
+    """
+
+    state.prefetch(addresser.make_addresses(
+        addresser.AddressSpace.HOLDING,
+        [transfer.source, transfer.target]))
+
+    source = state.get_holding(identifier=transfer.source)
+    target = state.get_holding(identifier=transfer.target)
+
+    addresses = []
+    if source:
+        addresses.append(addresser.make_asset_address(source.asset))
+    if target and target.credit_shards:
+        addresses.append(addresser.make_holding_credit_address(
+            holding_id=target.id,
+            shard=addresser.credit_shard(
+                header.signer_public_key,
+                target.credit_shards)))
+    state.prefetch(addresses)
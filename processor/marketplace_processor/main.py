@@ -15,6 +15,12 @@
 
 import sys
 import argparse
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
 
 from sawtooth_sdk.processor.core import TransactionProcessor
 from sawtooth_sdk.processor.log import init_console_logging
@@ -22,7 +28,22 @@ from sawtooth_sdk.processor.log import log_configuration
 from sawtooth_sdk.processor.config import get_log_config
 from sawtooth_sdk.processor.config import get_log_dir
 
+from marketplace_processor import metrics
 from marketplace_processor.handler import MarketplaceHandler
+from marketplace_processor.threaded_processor import \
+    ThreadedTransactionProcessor
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait before restarting a worker that exited, so a worker that
+# crashes on start does not spin.
+RESTART_DELAY = 1
+
+# Seconds the workers are given to stop before they are killed.
+STOP_TIMEOUT = 10
+
+STOP_SIGNALS = {signal.SIGINT, signal.SIGTERM}
 
 
 def parse_args(args):
@@ -39,6 +60,34 @@ def parse_args(args):
                         default=0,
                         help='Increase output sent to stderr')
 
+    parser.add_argument('--workers',
+                        type=int,
+                        default=1,
+                        help='Number of transaction processor processes to '
+                             'run and supervise')
+
+    parser.add_argument('--max-workers',
+                        type=int,
+                        default=1,
+                        help='Number of transactions each transaction '
+                             'processor applies at once, on separate threads')
+
+    parser.add_argument('--metrics-port',
+                        type=int,
+                        help='Serve Prometheus metrics at /metrics on this '
+                             'port. With --workers, worker N uses this port '
+                             'plus N')
+
+    parser.add_argument('--metrics-host',
+                        default='127.0.0.1',
+                        help='Interface to serve metrics on, e.g. 0.0.0.0 '
+                             'for all of them')
+
+    parser.add_argument('--metrics-interval',
+                        type=float,
+                        help='Log a summary of the metrics every this many '
+                             'seconds')
+
     return parser.parse_args(args)
 
 
@@ -46,9 +95,22 @@ def main(args=None):
     if args is None:
         args = sys.argv[1:]
     opts = parse_args(args)
+
+    if opts.workers > 1:
+        _supervise(opts)
+    else:
+        _run_processor(opts)
+
+
+def _run_processor(opts, worker=None):
     processor = None
     try:
-        processor = TransactionProcessor(url=opts.connect)
+        if opts.max_workers > 1:
+            processor = ThreadedTransactionProcessor(
+                url=opts.connect,
+                max_workers=opts.max_workers)
+        else:
+            processor = TransactionProcessor(url=opts.connect)
         log_config = get_log_config(filename="marketplace_log_config.toml")
 
         # If no toml, try loading yaml
@@ -60,13 +122,15 @@ def main(args=None):
         else:
             log_dir = get_log_dir()
             # use the transaction processor zmq identity for filename
-            log_configuration(
-                log_dir=log_dir,
-                name="marketplace-" + str(processor.zmq_id)[2:-1])
+            name = "marketplace-" + str(processor.zmq_id)[2:-1]
+            if worker is not None:
+                name = "marketplace-{}-{}".format(
+                    worker, str(processor.zmq_id)[2:-1])
+            log_configuration(log_dir=log_dir, name=name)
 
         init_console_logging(verbose_level=opts.verbose)
 
-        handler = MarketplaceHandler()
+        handler = MarketplaceHandler(metrics=_start_metrics(opts, worker))
 
         processor.add_handler(handler)
 
@@ -78,3 +142,98 @@ def main(args=None):
     finally:
         if processor is not None:
             processor.stop()
+
+
+def _start_metrics(opts, worker=None):
+    if opts.metrics_port is None and opts.metrics_interval is None:
+        return None
+
+    handler_metrics = metrics.Metrics()
+    if opts.metrics_port is not None:
+        metrics.serve(handler_metrics,
+                      opts.metrics_port + (worker or 0),
+                      host=opts.metrics_host)
+    if opts.metrics_interval is not None:
+        metrics.log_periodically(handler_metrics, opts.metrics_interval)
+    return handler_metrics
+
+
+def _run_worker(opts, worker):
+    # Workers are stopped by the supervisor with SIGTERM, and usually receive
+    # the terminal's SIGINT alongside it. Either unwinds the worker through
+    # processor.stop().
+    for signum in STOP_SIGNALS:
+        signal.signal(signum, _interrupt)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+
+    _run_processor(opts, worker=worker)
+
+
+def _interrupt(signum, frame):
+    # Ignore the second signal, so it cannot interrupt processor.stop().
+    for stop_signal in STOP_SIGNALS:
+        signal.signal(stop_signal, signal.SIG_IGN)
+    raise KeyboardInterrupt()
+
+
+def _start_worker(opts, worker):
+    process = multiprocessing.Process(
+        target=_run_worker,
+        args=(opts, worker),
+        name="marketplace-tp-{}".format(worker))
+
+    # Block the stop signals while forking, so the worker cannot receive one
+    # before it has replaced the supervisor's handlers with its own.
+    signal.pthread_sigmask(signal.SIG_BLOCK, STOP_SIGNALS)
+    try:
+        process.start()
+    finally:
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, STOP_SIGNALS)
+    LOGGER.info("Started worker %s, pid %s", worker, process.pid)
+    return process
+
+
+def _supervise(opts):
+    """Runs opts.workers transaction processors, each in its own process
+    with its own zmq identity and log file, restarting any that exit until
+    SIGINT or SIGTERM is received.
+    """
+
+    init_console_logging(verbose_level=opts.verbose)
+
+    stopping = []
+    for signum in STOP_SIGNALS:
+        signal.signal(signum, lambda signum, frame: stopping.append(signum))
+
+    workers = {
+        worker: _start_worker(opts, worker)
+        for worker in range(opts.workers)
+    }
+
+    while not stopping:
+        multiprocessing.connection.wait(
+            [p.sentinel for p in workers.values()],
+            timeout=RESTART_DELAY)
+
+        for worker, process in workers.items():
+            if process.is_alive() or stopping:
+                continue
+
+            LOGGER.warning("Worker %s exited with code %s, restarting",
+                           worker, process.exitcode)
+            time.sleep(RESTART_DELAY)
+            if not stopping:
+                workers[worker] = _start_worker(opts, worker)
+
+    LOGGER.info("Stopping %s workers", len(workers))
+    for process in workers.values():
+        if process.is_alive():
+            process.terminate()
+
+    deadline = time.time() + STOP_TIMEOUT
+    for worker, process in workers.items():
+        process.join(max(0, deadline - time.time()))
+        if process.is_alive():
+            LOGGER.warning("Worker %s did not stop, killing it", worker)
+            os.kill(process.pid, signal.SIGKILL)
+            process.join()
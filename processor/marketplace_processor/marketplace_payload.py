@@ -13,14 +13,59 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_addressing import identifiers
+
+from marketplace_processor.protobuf import compact_payload_pb2
 from marketplace_processor.protobuf import payload_pb2
 
 
 class MarketplacePayload(object):
 
-    def __init__(self, payload):
+    def __init__(self, payload, family_version='1.0'):
+        """The payload of a transaction, as a TransactionPayload whatever
+        the family_version it was encoded with.
+
+        Args:
+            payload (bytes): The serialized payload.
+            family_version (str): The transaction header's family_version.
+
+        Raises:
+            InvalidTransaction: An identifier in a 1.1 payload is neither a
+                UUID nor a public key.
+        """
+
         self._transaction = payload_pb2.TransactionPayload()
-        self._transaction.ParseFromString(payload)
+
+        if family_version == identifiers.COMPACT_FAMILY_VERSION:
+            compact = compact_payload_pb2.CompactTransactionPayload()
+            compact.ParseFromString(payload)
+            try:
+                _expand(compact, self._transaction)
+            except ValueError as err:
+                raise InvalidTransaction(str(err))
+        else:
+            self._transaction.ParseFromString(payload)
+
+    def payload_type(self):
+        """Returns the payload type, e.g. TransactionPayload.ACCEPT_OFFER.
+
+        Returns:
+            int
+        """
+
+        return self._transaction.payload_type
+
+    def payload_type_name(self):
+        """Returns the name of the payload type, e.g. ACCEPT_OFFER.
+
+        Returns:
+            str
+        """
+
+        return payload_pb2.TransactionPayload.PayloadType.Name(
+            self._transaction.payload_type)
 
     def create_account(self):
         """Returns the value set in the create_account.
@@ -31,12 +76,6 @@ class MarketplacePayload(object):
 
         return self._transaction.create_account
 
-    def is_create_account(self):
-
-        create_account = payload_pb2.TransactionPayload.CREATE_ACCOUNT
-
-        return self._transaction.payload_type == create_account
-
     def create_holding(self):
         """Returns the value set in the create_holding.
 
@@ -46,11 +85,23 @@ class MarketplacePayload(object):
 
         return self._transaction.create_holding
 
-    def is_create_holding(self):
+    def create_holdings(self):
+        """Returns the value set in the create_holdings.
 
-        create_holding = payload_pb2.TransactionPayload.CREATE_HOLDING
+        Returns:
+            payload_pb2.CreateHoldings
+        """
+
+        return self._transaction.create_holdings
+
+    def sweep_credits(self):
+        """Returns the value set in the sweep_credits.
+
+        Returns:
+            payload_pb2.SweepCredits
+        """
 
-        return self._transaction.payload_type == create_holding
+        return self._transaction.sweep_credits
 
     def create_asset(self):
         """Returns the value set in the create_asset.
@@ -61,12 +112,6 @@ class MarketplacePayload(object):
 
         return self._transaction.create_asset
 
-    def is_create_asset(self):
-
-        create_asset = payload_pb2.TransactionPayload.CREATE_ASSET
-
-        return self._transaction.payload_type == create_asset
-
     def create_offer(self):
         """Returns the value set in the create_offer.
 
@@ -76,12 +121,6 @@ class MarketplacePayload(object):
 
         return self._transaction.create_offer
 
-    def is_create_offer(self):
-
-        create_offer = payload_pb2.TransactionPayload.CREATE_OFFER
-
-        return self._transaction.payload_type == create_offer
-
     def accept_offer(self):
         """Returns the value set in accept_offer.
 
@@ -91,11 +130,14 @@ class MarketplacePayload(object):
 
         return self._transaction.accept_offer
 
-    def is_accept_offer(self):
+    def accept_offers(self):
+        """Returns the value set in accept_offers.
 
-        accept_offer = payload_pb2.TransactionPayload.ACCEPT_OFFER
+        Returns:
+            payload_pb2.AcceptOffers
+        """
 
-        return self._transaction.payload_type == accept_offer
+        return self._transaction.accept_offers
 
     def close_offer(self):
         """Returns the value set in close_offer.
@@ -106,8 +148,71 @@ class MarketplacePayload(object):
 
         return self._transaction.close_offer
 
-    def is_close_offer(self):
+    def allow_accounts(self):
+        """Returns the value set in allow_accounts.
+
+        Returns:
+            payload_pb2.AllowAccounts
+        """
+
+        return self._transaction.allow_accounts
 
-        close_offer = payload_pb2.TransactionPayload.CLOSE_OFFER
+    def transfer(self):
+        """Returns the value set in transfer.
+
+        Returns:
+            payload_pb2.Transfer
+        """
+
+        return self._transaction.transfer
+
+    def prune_offer(self):
+        """Returns the value set in prune_offer.
+
+        Returns:
+            payload_pb2.PruneOffer
+        """
+
+        return self._transaction.prune_offer
+
+    def update_offer(self):
+        """Returns the value set in update_offer.
+
+        Returns:
+            payload_pb2.UpdateOffer
+        """
 
-        return self._transaction.payload_type == close_offer
+        return self._transaction.update_offer
+
+
+def _expand(compact, message):
+    """Copies a family_version 1.1 message into its 1.0 counterpart,
+    turning each bytes field that is a string in message back into the
+    identifier.
+    """
+
+    if compact.DESCRIPTOR is message.DESCRIPTOR:
+        message.CopyFrom(compact)
+        return
+
+    for field, value in compact.ListFields():
+        target = message.DESCRIPTOR.fields_by_name[field.name]
+        repeated = field.label == field.LABEL_REPEATED
+
+        if field.type == field.TYPE_MESSAGE:
+            if repeated:
+                for entry in value:
+                    _expand(entry, getattr(message, field.name).add())
+            else:
+                _expand(value, getattr(message, field.name))
+        elif target.type == target.TYPE_STRING and \
+                field.type == field.TYPE_BYTES:
+            if repeated:
+                getattr(message, field.name).extend(
+                    identifiers.expand_id(v) for v in value)
+            else:
+                setattr(message, field.name, identifiers.expand_id(value))
+        elif repeated:
+            getattr(message, field.name).extend(value)
+        else:
+            setattr(message, field.name, value)
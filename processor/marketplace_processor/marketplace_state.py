@@ -13,6 +13,10 @@
 # limitations under the License.
 # -----------------------------------------------------------------------------
 
+from collections import Counter
+
+from sawtooth_sdk.protobuf import block_info_pb2
+
 from marketplace_addressing import addresser
 from marketplace_processor.protobuf import account_pb2
 from marketplace_processor.protobuf import asset_pb2
@@ -20,6 +24,7 @@ from marketplace_processor.protobuf import holding_pb2
 from marketplace_processor.protobuf import offer_pb2
 from marketplace_processor.protobuf import offer_history_pb2
 from marketplace_processor.protobuf import rule_pb2
+from marketplace_processor.rule_set import RuleSet
 
 
 OFFER_RULES = [rule_pb2.Rule.EXCHANGE_ONCE_PER_ACCOUNT,
@@ -27,24 +32,207 @@ OFFER_RULES = [rule_pb2.Rule.EXCHANGE_ONCE_PER_ACCOUNT,
                rule_pb2.Rule.EXCHANGE_LIMITED_TO_ACCOUNTS]
 
 
-class MarketplaceState(object):
+CONTAINERS = {
+    addresser.AddressSpace.ACCOUNT: account_pb2.AccountContainer,
+    addresser.AddressSpace.ACCOUNT_HOLDING:
+        account_pb2.AccountHoldingContainer,
+    addresser.AddressSpace.ASSET: asset_pb2.AssetContainer,
+    addresser.AddressSpace.HOLDING: holding_pb2.HoldingContainer,
+    addresser.AddressSpace.HOLDING_CREDIT:
+        holding_pb2.HoldingCreditContainer,
+    addresser.AddressSpace.OFFER: offer_pb2.OfferContainer,
+    addresser.AddressSpace.OFFER_ALLOWLIST:
+        offer_pb2.OfferAllowlistContainer,
+    addresser.AddressSpace.OFFER_HISTORY:
+        offer_history_pb2.OfferHistoryContainer
+}
+
+
+class MarketplaceState(object):  # pylint: disable=too-many-public-methods
 
-    def __init__(self, context, timeout=2):
+    def __init__(self, context, timeout=2, container_cache=None):
         self._context = context
         self._timeout = timeout
-        self._state_entries = []
+        self._container_cache = container_cache
+
+        # Parsed containers by address. Holds every address read or written
+        # during this transaction, so each one is fetched from the validator
+        # and parsed at most once.
+        self._containers = {}
+
+        # Addresses whose container belongs to this transaction alone and
+        # can be changed in place. Any other container is shared through the
+        # ContainerCache and is copied before it is first changed.
+        self._owned = set()
+
+        # The number of writes made to each address whose container changed
+        # and has not been flushed. Addresses left with no entries are
+        # deleted rather than written.
+        self._dirty = Counter()
+
+        # Compiled RuleSets by (AddressSpace, identifier).
+        self._rule_sets = {}
+
+    def prefetch(self, addresses):
+        """Reads every address that is not already cached in a single
+        get_state call, so a handler's read set costs one round trip to the
+        validator instead of one per address.
+
+        Args:
+            addresses (list of str): The state addresses to load.
+        """
+
+        missing = set(a for a in addresses if a not in self._containers)
+
+        if not missing:
+            return
+
+        data = {}
+        for entry in self._context.get_state(
+                addresses=list(missing),
+                timeout=self._timeout):
+            data[entry.address] = entry.data
+
+        for address in missing:
+            container_class = _container_class(address)
+
+            if data.get(address) and self._container_cache is not None:
+                container = self._container_cache.parse(
+                    container_class,
+                    data[address])
+            else:
+                container = container_class()
+                container.ParseFromString(data.get(address, b''))
+                self._owned.add(address)
+
+            self._containers[address] = container
+
+    def _get_container(self, address):
+        """Returns the container at the address, fetching and parsing it
+        only the first time the address is requested in this transaction.
+        The container may be shared with other transactions and must not be
+        changed.
+
+        Args:
+            address (str): The state address.
+
+        Returns:
+            The parsed container, or an empty container if nothing is stored
+            at the address.
+        """
+
+        try:
+            return self._containers[address]
+        except KeyError:
+            self.prefetch([address])
+
+        return self._containers[address]
+
+    def _get_mutable_container(self, address):
+        """Returns the container at the address for changing, copying it
+        first if it is shared with other transactions.
+
+        Args:
+            address (str): The state address.
+
+        Returns:
+            The container, owned by this transaction.
+        """
+
+        container = self._get_container(address)
+        if address not in self._owned:
+            copy = type(container)()
+            copy.CopyFrom(container)
+            container = copy
+
+            self._containers[address] = container
+            self._owned.add(address)
+
+        return container
+
+    def _write(self, address):
+        self._dirty[address] += 1
+
+    def _delete(self, address):
+        self._dirty[address] = 0
+
+    def _remove_entries(self, address, matches):
+        """Removes the entries of the container at the address for which
+        matches is true. An address left with no entries is deleted.
+
+        Args:
+            address (str): The state address.
+            matches (function): Takes an entry, returns whether to remove
+                it.
+        """
+
+        container = self._get_container(address)
+        if not any(matches(e) for e in container.entries):
+            return
+
+        remaining = type(container)()
+        remaining.entries.extend(
+            e for e in container.entries if not matches(e))
+
+        self._containers[address] = remaining
+        self._owned.add(address)
+
+        if remaining.entries:
+            self._write(address)
+        else:
+            self._delete(address)
+
+    def flush(self):
+        """Sends every container changed during the transaction to the
+        validator in a single set_state call, and the addresses left empty
+        in a single delete_state call. Each container is serialized once,
+        however many times it was changed.
+
+        Returns:
+            (int): The number of set_state calls saved by coalescing the
+                writes.
+        """
+
+        deleted = [address for address in self._dirty
+                   if not self._containers[address].entries]
+        if deleted:
+            self._context.delete_state(deleted, self._timeout)
+
+        written = {address: self._containers[address].SerializeToString()
+                   for address in self._dirty
+                   if self._containers[address].entries}
+        saved = sum(self._dirty.values()) - 1
+        self._dirty = Counter()
+
+        if not written:
+            return 0
+
+        self._context.set_state(written, self._timeout)
+        return saved
+
+    def get_block_num(self):
+        """Returns the number of the block the transaction is being applied
+        in, which is one past the latest block in the BlockInfo config.
+
+        Returns:
+            (int): The block number, or None if the BlockInfo transaction
+                family is not recording blocks.
+        """
+
+        config = self._get_container(addresser.BLOCK_INFO_CONFIG_ADDRESS)
+        if not config.target_count:
+            return None
+
+        return config.latest_block + 1
 
     def get_offer(self, identifier):
         address = addresser.make_offer_address(offer_id=identifier)
-        self._state_entries.extend(self._context.get_state(
-            addresses=[address],
-            timeout=self._timeout))
 
         return self._get_offer(address=address, identifier=identifier)
 
     def _get_offer(self, address, identifier):
 
-        container = _get_offer_container(self._state_entries, address)
+        container = self._get_container(address)
         offer = None
         try:
             offer = _get_offer_from_container(container, identifier)
@@ -54,6 +242,25 @@ class MarketplaceState(object):
 
         return offer
 
+    def get_offer_rules(self, identifier):
+        """Returns the compiled rules of the Offer, compiling them the first
+        time they are requested in this transaction.
+
+        Args:
+            identifier (str): The Offer id.
+
+        Returns:
+            (RuleSet): The rules, empty if the Offer does not exist.
+        """
+
+        key = (addresser.AddressSpace.OFFER, identifier)
+        if key not in self._rule_sets:
+            offer = self.get_offer(identifier)
+            self._rule_sets[key] = RuleSet(
+                offer.rules if offer else [],
+                owners=offer.owners if offer else [])
+        return self._rule_sets[key]
+
     def set_create_offer(self,
                          identifier,
                          label,
@@ -63,9 +270,10 @@ class MarketplaceState(object):
                          source_quantity,
                          target,
                          target_quantity,
-                         rules):
+                         rules,
+                         expires_at_block=0):
         address = addresser.make_offer_address(offer_id=identifier)
-        container = _get_offer_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
 
         try:
             offer = _get_offer_from_container(container, identifier)
@@ -83,16 +291,92 @@ class MarketplaceState(object):
         offer.target_quantity = target_quantity
         offer.rules.extend(rules)
         offer.status = offer_pb2.Offer.OPEN
+        offer.expires_at_block = expires_at_block
 
         offer.rules.extend(self._return_offer_rules(source))
         if target:
             offer.rules.extend(self._return_offer_rules(target))
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._rule_sets.pop((addresser.AddressSpace.OFFER, identifier), None)
+
+        self._write(address)
+
+    def set_offer_escrow(self, identifier, source_asset, quantity):
+        """Marks the Offer as escrowed, holding quantity of source_asset.
+
+        Args:
+            identifier (str): The Offer id.
+            source_asset (str): The Asset of the Offer's source Holding.
+            quantity (int): The escrowed quantity.
+        """
+
+        address = addresser.make_offer_address(offer_id=identifier)
+        container = self._get_mutable_container(address)
+
+        offer = _get_offer_from_container(container, identifier)
+        offer.escrow = True
+        offer.source_asset = source_asset
+        offer.escrow_quantity = quantity
+
+        self._write(address)
+
+    def adjust_offer_escrow(self, identifier, amount):
+        """Adds the amount, which may be negative, to the escrowed quantity
+        of the Offer.
+
+        Args:
+            identifier (str): The Offer id.
+            amount (int): The change in quantity.
+        """
+
+        address = addresser.make_offer_address(offer_id=identifier)
+        container = self._get_mutable_container(address)
+
+        offer = _get_offer_from_container(container, identifier)
+        offer.escrow_quantity += amount
+
+        self._write(address)
+
+    def offer_allows(self, offer_id, account):
+        """Returns whether the account is on the Offer's allowlist.
+
+        Args:
+            offer_id (str): The Offer id.
+            account (str): The public key of the account.
+
+        Returns:
+            (bool)
+        """
+
+        container = self._get_container(
+            addresser.make_offer_allowlist_address(
+                offer_id=offer_id,
+                account=account))
+
+        return any(e.offer_id == offer_id and e.account == account
+                   for e in container.entries)
+
+    def allow_account(self, offer_id, account):
+        """Adds the account to the Offer's allowlist, if it is not on it.
+
+        Args:
+            offer_id (str): The Offer id.
+            account (str): The public key of the account.
+        """
+
+        if self.offer_allows(offer_id, account):
+            return
+
+        address = addresser.make_offer_allowlist_address(
+            offer_id=offer_id,
+            account=account)
+        container = self._get_mutable_container(address)
+
+        entry = container.entries.add()
+        entry.offer_id = offer_id
+        entry.account = account
+
+        self._write(address)
 
     def _return_offer_rules(self, holding_id,):
         holding_addr = addresser.make_holding_address(holding_id)
@@ -102,7 +386,7 @@ class MarketplaceState(object):
 
     def close_offer(self, identifier):
         address = addresser.make_offer_address(offer_id=identifier)
-        container = _get_offer_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
 
         try:
             offer = _get_offer_from_container(container, identifier)
@@ -112,24 +396,87 @@ class MarketplaceState(object):
 
         offer.status = offer_pb2.Offer.CLOSED
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._write(address)
+
+    def prune_offer(self, identifier):
+        """Removes the Offer and all of its receipts from state.
+
+        Args:
+            identifier (str): The Offer id.
+        """
+
+        self._remove_entries(
+            addresser.make_offer_address(offer_id=identifier),
+            lambda offer: offer.id == identifier)
+
+        for address in addresser.make_offer_receipt_addresses(identifier):
+            self._remove_entries(
+                address,
+                lambda receipt: receipt.offer_id == identifier)
+
+        self._rule_sets.pop((addresser.AddressSpace.OFFER, identifier), None)
+
+    def remove_allowed_account(self, offer_id, account):
+        """Removes the account from the Offer's allowlist, if it is on it.
+
+        Args:
+            offer_id (str): The Offer id.
+            account (str): The public key of the account.
+        """
+
+        self._remove_entries(
+            addresser.make_offer_allowlist_address(
+                offer_id=offer_id,
+                account=account),
+            lambda e: e.offer_id == offer_id and e.account == account)
+
+    def update_offer(self,
+                     identifier,
+                     label=None,
+                     description=None,
+                     source_quantity=None,
+                     target_quantity=None,
+                     expires_at_block=None,
+                     status=None):
+        """Changes the given fields of the Offer, keeping the ones that are
+        None.
+
+        Args:
+            identifier (str): The Offer id.
+            label (str): The new label.
+            description (str): The new description.
+            source_quantity (int): The new source quantity.
+            target_quantity (int): The new target quantity.
+            expires_at_block (int): The new expiry block.
+            status (offer_pb2.Offer.Status): The new status.
+        """
+
+        address = addresser.make_offer_address(offer_id=identifier)
+        container = self._get_mutable_container(address)
+
+        offer = _get_offer_from_container(container, identifier)
+        changes = {
+            'label': label,
+            'description': description,
+            'source_quantity': source_quantity,
+            'target_quantity': target_quantity,
+            'expires_at_block': expires_at_block,
+            'status': status
+        }
+        for field, value in changes.items():
+            if value is not None:
+                setattr(offer, field, value)
+
+        self._write(address)
 
     def get_holding(self, identifier):
         address = addresser.make_holding_address(holding_id=identifier)
 
-        self._state_entries.extend(self._context.get_state(
-            addresses=[address],
-            timeout=self._timeout))
-
         return self._get_holding(address=address, identifier=identifier)
 
     def _get_holding(self, address, identifier):
 
-        container = _get_holding_container(self._state_entries, address)
+        container = self._get_container(address)
 
         holding = None
         try:
@@ -145,9 +492,10 @@ class MarketplaceState(object):
                     description,
                     account,
                     asset,
-                    quantity):
+                    quantity,
+                    credit_shards=0):
         address = addresser.make_holding_address(holding_id=identifier)
-        container = _get_holding_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
 
         try:
             holding = _get_holding_from_container(container, identifier)
@@ -160,45 +508,41 @@ class MarketplaceState(object):
         holding.account = account
         holding.asset = asset
         holding.quantity = quantity
+        holding.credit_shards = credit_shards
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._write(address)
 
-    def change_holding_quantity(self,
+    def adjust_holding_quantity(self,
                                 identifier,
-                                new_quantity):
+                                amount):
+        """Adds the amount, which may be negative, to the Holding's current
+        quantity in this transaction.
+
+        Args:
+            identifier (str): The Holding id.
+            amount (int): The change in quantity.
+        """
+
         address = addresser.make_holding_address(holding_id=identifier)
-        container = _get_holding_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
 
         try:
             holding = _get_holding_from_container(container, identifier)
         except KeyError:
             holding = container.entries.add()
 
-        holding.quantity = new_quantity
-
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
+        holding.quantity += amount
 
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._write(address)
 
     def get_asset(self, name):
         address = addresser.make_asset_address(asset_id=name)
 
-        self._state_entries.extend(self._context.get_state(
-            addresses=[address],
-            timeout=self._timeout))
-
         return self._get_asset(address=address, name=name)
 
     def _get_asset(self, address, name):
 
-        container = _get_asset_container(self._state_entries, address)
+        container = self._get_container(address)
 
         asset = None
         try:
@@ -208,10 +552,29 @@ class MarketplaceState(object):
             pass
         return asset
 
+    def get_asset_rules(self, name):
+        """Returns the compiled rules of the Asset, compiling them the first
+        time they are requested in this transaction.
+
+        Args:
+            name (str): The Asset name.
+
+        Returns:
+            (RuleSet): The rules, empty if the Asset does not exist.
+        """
+
+        key = (addresser.AddressSpace.ASSET, name)
+        if key not in self._rule_sets:
+            asset = self.get_asset(name)
+            self._rule_sets[key] = RuleSet(
+                asset.rules if asset else [],
+                owners=asset.owners if asset else [])
+        return self._rule_sets[key]
+
     def set_asset(self, name, description, owners, rules):
         address = addresser.make_asset_address(name)
 
-        container = _get_asset_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
 
         try:
             asset = _get_asset_from_container(container, name)
@@ -223,20 +586,14 @@ class MarketplaceState(object):
         asset.owners.extend(owners)
         asset.rules.extend(rules)
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._rule_sets.pop((addresser.AddressSpace.ASSET, name), None)
+
+        self._write(address)
 
     def get_account(self, public_key):
         address = addresser.make_account_address(account_id=public_key)
 
-        self._state_entries.extend(self._context.get_state(
-            addresses=[address],
-            timeout=self._timeout))
-
-        container = _get_account_container(self._state_entries, address)
+        container = self._get_container(address)
         account = None
         try:
             account = _get_account_from_container(
@@ -251,7 +608,7 @@ class MarketplaceState(object):
     def set_account(self, public_key, label, description, holdings):
         address = addresser.make_account_address(account_id=public_key)
 
-        container = _get_account_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
 
         try:
             account = _get_account_from_container(
@@ -266,72 +623,132 @@ class MarketplaceState(object):
         for holding in holdings:
             account.holdings.append(holding)
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._write(address)
 
-    def add_holding_to_account(self, public_key, holding_id):
-        address = addresser.make_account_address(account_id=public_key)
+    def credit_holding(self, identifier, shard, amount):
+        """Adds the amount to one of the Holding's credit shards, leaving
+        the Holding itself unchanged.
+
+        Args:
+            identifier (str): The Holding id.
+            shard (int): The credit shard.
+            amount (int): The credit.
+        """
 
-        container = _get_account_container(self._state_entries, address)
+        address = addresser.make_holding_credit_address(
+            holding_id=identifier,
+            shard=shard)
+        container = self._get_mutable_container(address)
 
         try:
-            account = _get_account_from_container(
-                container,
-                public_key)
+            credit = _get_credit_from_container(container, identifier, shard)
         except KeyError:
-            account = container.entries.add()
-
-        account.holdings.append(holding_id)
-
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+            credit = container.entries.add()
+            credit.holding = identifier
+            credit.shard = shard
+
+        credit.quantity += amount
+
+        self._write(address)
+
+    def sweep_holding_credits(self, identifier, credit_shards):
+        """Moves the credits in every shard of the Holding into its
+        quantity.
+
+        Args:
+            identifier (str): The Holding id.
+            credit_shards (int): The Holding's number of credit shards.
+
+        Returns:
+            (int): The quantity swept.
+        """
+
+        swept = 0
+        for shard, address in enumerate(
+                addresser.make_holding_credit_addresses(
+                    holding_id=identifier,
+                    credit_shards=credit_shards)):
+            try:
+                quantity = _get_credit_from_container(
+                    self._get_container(address), identifier, shard).quantity
+            except KeyError:
+                continue
+
+            if quantity:
+                credit = _get_credit_from_container(
+                    self._get_mutable_container(address), identifier, shard)
+                credit.quantity = 0
+                self._write(address)
+                swept += quantity
+
+        if swept:
+            self.adjust_holding_quantity(identifier, swept)
+        return swept
+
+    def add_holding_to_account(self, public_key, holding_id, indexed=True):
+        self.add_holdings_to_account(public_key, [holding_id], indexed)
+
+    def add_holdings_to_account(self, public_key, holding_ids, indexed=True):
+        """Records that each Holding belongs to the Account, each at its
+        own account holding address, leaving the Account itself unchanged.
+
+        Args:
+            public_key (str): The Account's public key.
+            holding_ids (list of str): The ids of the Holdings.
+            indexed (bool): Whether to record them at their account holding
+                addresses, or else append them to Account.holdings as
+                before those addresses existed.
+        """
+
+        if not indexed:
+            address = addresser.make_account_address(account_id=public_key)
+            container = self._get_mutable_container(address)
+            _get_account_from_container(container, public_key).holdings\
+                .extend(holding_ids)
+            self._write(address)
+            return
+
+        for holding_id in holding_ids:
+            address = addresser.make_account_holding_address(
+                account_id=public_key,
+                holding_id=holding_id)
+
+            container = self._get_mutable_container(address)
+
+            account_holding = container.entries.add()
+            account_holding.account = public_key
+            account_holding.holding = holding_id
+
+            self._write(address)
 
     def save_offer_account_receipt(self, offer_id, account):
         address = addresser.make_offer_account_address(
             offer_id=offer_id,
             account=account)
 
-        container = _get_history_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
         offer_history = container.entries.add()
 
         offer_history.offer_id = offer_id
         offer_history.account_id = account
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._write(address)
 
     def save_offer_receipt(self, offer_id):
         address = addresser.make_offer_history_address(offer_id=offer_id)
 
-        container = _get_history_container(self._state_entries, address)
+        container = self._get_mutable_container(address)
         offer_history = container.entries.add()
 
         offer_history.offer_id = offer_id
 
-        state_entries_send = {}
-        state_entries_send[address] = container.SerializeToString()
-        return self._context.set_state(
-            state_entries_send,
-            self._timeout)
+        self._write(address)
 
     def offer_has_receipt(self, offer_id):
         address = addresser.make_offer_history_address(
             offer_id=offer_id)
 
-        self._state_entries.extend(self._context.get_state(
-            addresses=[address],
-            timeout=self._timeout))
-
-        container = _get_history_container(self._state_entries, address)
+        container = self._get_container(address)
 
         try:
             _get_history_by_offer_id(
@@ -346,11 +763,7 @@ class MarketplaceState(object):
             offer_id=offer_id,
             account=account)
 
-        self._state_entries.extend(self._context.get_state(
-            addresses=[address],
-            timeout=self._timeout))
-
-        container = _get_history_container(self._state_entries, address)
+        container = self._get_container(address)
         offer_history = None
         try:
             offer_history = _get_history_from_container(
@@ -364,15 +777,12 @@ class MarketplaceState(object):
         return offer_history
 
 
-def _get_history_container(state_entries, address):
-    try:
-        entry = _find_in_state(state_entries, address)
-        container = offer_history_pb2.OfferHistoryContainer()
-        container.ParseFromString(entry.data)
-    except KeyError:
-        container = offer_history_pb2.OfferHistoryContainer()
+def _container_class(address):
+    # The BlockInfo config is the only address read from another family.
+    if address == addresser.BLOCK_INFO_CONFIG_ADDRESS:
+        return block_info_pb2.BlockInfoConfig
 
-    return container
+    return CONTAINERS[addresser.address_is(address)]
 
 
 def _get_history_by_offer_id(container, offer_id):
@@ -390,17 +800,6 @@ def _get_history_from_container(container, offer_id, account):
     raise KeyError("OfferHistory not found in container.")
 
 
-def _get_offer_container(state_entries, address):
-    try:
-        entry = _find_in_state(state_entries, address)
-        container = offer_pb2.OfferContainer()
-        container.ParseFromString(entry.data)
-    except KeyError:
-        container = offer_pb2.OfferContainer()
-
-    return container
-
-
 def _get_offer_from_container(container, offer_id):
     for offer in container.entries:
         if offer.id == offer_id:
@@ -409,17 +808,6 @@ def _get_offer_from_container(container, offer_id):
         "Offer with id {} is not in container".format(offer_id))
 
 
-def _get_holding_container(state_entries, address):
-    try:
-        entry = _find_in_state(state_entries, address)
-        container = holding_pb2.HoldingContainer()
-        container.ParseFromString(entry.data)
-    except KeyError:
-        container = holding_pb2.HoldingContainer()
-
-    return container
-
-
 def _get_holding_from_container(container, holding_id):
     for holding in container.entries:
         if holding.id == holding_id:
@@ -428,14 +816,13 @@ def _get_holding_from_container(container, holding_id):
         "Holding with id {} is not in container".format(holding_id))
 
 
-def _get_asset_container(state_entries, address):
-    try:
-        entry = _find_in_state(state_entries, address)
-        container = asset_pb2.AssetContainer()
-        container.ParseFromString(entry.data)
-    except KeyError:
-        container = asset_pb2.AssetContainer()
-    return container
+def _get_credit_from_container(container, holding_id, shard):
+    for credit in container.entries:
+        if credit.holding == holding_id and credit.shard == shard:
+            return credit
+    raise KeyError(
+        "Credit shard {} of Holding {} is not in container".format(
+            shard, holding_id))
 
 
 def _get_asset_from_container(container, name):
@@ -446,27 +833,9 @@ def _get_asset_from_container(container, name):
         "Asset with name {} is not in container".format(name))
 
 
-def _get_account_container(state_entries, address):
-    try:
-        entry = _find_in_state(state_entries, address)
-        container = account_pb2.AccountContainer()
-        container.ParseFromString(entry.data)
-    except KeyError:
-        container = account_pb2.AccountContainer()
-
-    return container
-
-
 def _get_account_from_container(container, identifier):
     for account in container.entries:
         if account.public_key == identifier:
             return account
     raise KeyError(
         "Account with identifier {} is not in container.".format(identifier))
-
-
-def _find_in_state(state_entries, address):
-    for entry in state_entries:
-        if entry.address == address:
-            return entry
-    raise KeyError("Address {} not found in state".format(address))
@@ -0,0 +1,309 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import collections
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+import logging
+import os
+import socketserver
+import threading
+import time
+import traceback
+
+from marketplace_addressing import addresser
+
+
+LOGGER = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    2.5, float('inf'))
+
+
+class Histogram(object):
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, quantile):
+        """Returns the upper bound of the bucket holding the quantile.
+
+        Args:
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            float
+        """
+
+        rank = quantile * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.buckets[-1]
+
+
+class Metrics(object):
+
+    def __init__(self):
+        """Counters and latency histograms for the transactions applied by
+        a MarketplaceHandler, labelled by payload type. Safe to update from
+        several threads at once.
+        """
+
+        self._lock = threading.Lock()
+        self._apply_seconds = collections.defaultdict(Histogram)
+        self._state_seconds = collections.defaultdict(Histogram)
+        self._state_bytes = collections.Counter()
+        self._invalid = collections.Counter()
+
+    def observe_apply(self, payload_type, seconds):
+        with self._lock:
+            self._apply_seconds[payload_type].observe(seconds)
+
+    def observe_state_call(self, payload_type, method, seconds):
+        with self._lock:
+            self._state_seconds[(payload_type, method)].observe(seconds)
+
+    def count_state_bytes(self, payload_type, direction, address, size):
+        container = addresser.address_is(address).name.lower()
+        with self._lock:
+            self._state_bytes[(payload_type, direction, container)] += size
+
+    def count_invalid(self, payload_type, error):
+        """Counts an InvalidTransaction against the place it was raised,
+        e.g. offer_acceptance.py:212. The messages themselves embed ids and
+        quantities, so they would make a label per transaction.
+
+        Args:
+            payload_type (str): The payload type name.
+            error (InvalidTransaction): The error, with its traceback.
+        """
+
+        frame = traceback.extract_tb(error.__traceback__)[-1]
+        reason = '{}:{}'.format(os.path.basename(frame.filename),
+                                frame.lineno)
+        with self._lock:
+            self._invalid[(payload_type, reason)] += 1
+
+    def render(self):
+        """Returns every metric in the Prometheus text exposition format.
+
+        Returns:
+            str
+        """
+
+        lines = []
+        with self._lock:
+            _render_histograms(
+                lines,
+                'marketplace_tp_apply_seconds',
+                'Time to apply a transaction.',
+                {(('payload_type', p),): h
+                 for p, h in self._apply_seconds.items()})
+            _render_histograms(
+                lines,
+                'marketplace_tp_state_call_seconds',
+                'Time spent in calls to the validator for state.',
+                {(('payload_type', p), ('method', m)): h
+                 for (p, m), h in self._state_seconds.items()})
+            _render_counters(
+                lines,
+                'marketplace_tp_state_bytes_total',
+                'Bytes of state read and written, by container type.',
+                {(('payload_type', p), ('direction', d), ('container', c)): n
+                 for (p, d, c), n in self._state_bytes.items()})
+            _render_counters(
+                lines,
+                'marketplace_tp_invalid_transactions_total',
+                'Transactions rejected as invalid, by where they were '
+                'rejected.',
+                {(('payload_type', p), ('reason', r)): n
+                 for (p, r), n in self._invalid.items()})
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        """Returns a one line summary per payload type, for the log.
+
+        Returns:
+            list of str
+        """
+
+        with self._lock:
+            return [
+                '{}: {} applied, p50 <= {}s, p99 <= {}s, {} invalid'.format(
+                    payload_type,
+                    histogram.count,
+                    histogram.quantile(0.5),
+                    histogram.quantile(0.99),
+                    sum(n for (p, _), n in self._invalid.items()
+                        if p == payload_type))
+                for payload_type, histogram in sorted(
+                    self._apply_seconds.items())
+            ]
+
+
+class MetricsContext(object):
+
+    def __init__(self, context, metrics, payload_type):
+        """Wraps a transaction's Context, recording the latency and size of
+        every state call against the payload type.
+
+        Args:
+            context (sawtooth_sdk.processor.context.Context): The context.
+            metrics (Metrics): Where the calls are recorded.
+            payload_type (str): The payload type name.
+        """
+
+        self._context = context
+        self._metrics = metrics
+        self._payload_type = payload_type
+
+    def get_state(self, addresses, timeout=None):
+        start = time.perf_counter()
+        entries = self._context.get_state(addresses, timeout=timeout)
+        self._metrics.observe_state_call(
+            self._payload_type, 'get', time.perf_counter() - start)
+
+        for entry in entries:
+            self._metrics.count_state_bytes(
+                self._payload_type, 'read', entry.address, len(entry.data))
+        return entries
+
+    def set_state(self, entries, timeout=None):
+        start = time.perf_counter()
+        addresses = self._context.set_state(entries, timeout=timeout)
+        self._metrics.observe_state_call(
+            self._payload_type, 'set', time.perf_counter() - start)
+
+        for address, data in entries.items():
+            self._metrics.count_state_bytes(
+                self._payload_type, 'written', address, len(data))
+        return addresses
+
+    def delete_state(self, addresses, timeout=None):
+        start = time.perf_counter()
+        deleted = self._context.delete_state(addresses, timeout=timeout)
+        self._metrics.observe_state_call(
+            self._payload_type, 'delete', time.perf_counter() - start)
+        return deleted
+
+
+def serve(metrics, port, host='127.0.0.1'):
+    """Serves metrics.render() at http://host:port/metrics from a daemon
+    thread.
+
+    Args:
+        metrics (Metrics): The metrics to serve.
+        port (int): The port to listen on.
+        host (str): The interface to listen on, only the loopback
+            interface by default.
+
+    Returns:
+        HTTPServer: The running server.
+    """
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+
+            body = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        # The signature of BaseHTTPRequestHandler.log_message.
+        # pylint: disable=redefined-builtin
+        def log_message(self, format, *args):
+            LOGGER.debug(format, *args)
+
+    class _Server(socketserver.ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    server = _Server((host, port), _MetricsHandler)
+    thread = threading.Thread(
+        target=server.serve_forever,
+        name='marketplace-metrics',
+        daemon=True)
+    thread.start()
+    LOGGER.info("Serving metrics on port %s", port)
+    return server
+
+
+def log_periodically(metrics, interval):
+    """Logs metrics.summary() every interval seconds from a daemon thread.
+
+    Args:
+        metrics (Metrics): The metrics to log.
+        interval (float): Seconds between dumps.
+    """
+
+    def _log():
+        while True:
+            time.sleep(interval)
+            for line in metrics.summary():
+                LOGGER.info(line)
+
+    threading.Thread(
+        target=_log,
+        name='marketplace-metrics-log',
+        daemon=True).start()
+
+
+def _labels(labels):
+    return ','.join('{}="{}"'.format(name, value) for name, value in labels)
+
+
+def _render_histograms(lines, name, help_text, histograms):
+    lines.append('# HELP {} {}'.format(name, help_text))
+    lines.append('# TYPE {} histogram'.format(name))
+    for labels, histogram in sorted(histograms.items()):
+        cumulative = 0
+        for upper, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            bound = '+Inf' if upper == float('inf') else repr(upper)
+            lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                name, _labels(labels), bound, cumulative))
+        lines.append('{}_sum{{{}}} {}'.format(
+            name, _labels(labels), histogram.sum))
+        lines.append('{}_count{{{}}} {}'.format(
+            name, _labels(labels), histogram.count))
+
+
+def _render_counters(lines, name, help_text, counters):
+    lines.append('# HELP {} {}'.format(name, help_text))
+    lines.append('# TYPE {} counter'.format(name))
+    for labels, value in sorted(counters.items()):
+        lines.append('{}{{{}}} {}'.format(name, _labels(labels), value))
@@ -15,9 +15,10 @@
 
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
+from marketplace_addressing import addresser
+
 from marketplace_processor.offer.accept_calc import AcceptOfferCalculator
 from marketplace_processor.protobuf import offer_pb2
-from marketplace_processor.protobuf import rule_pb2
 
 
 def handle_accept_offer(accept_offer, header, state):
@@ -31,6 +32,7 @@ def handle_accept_offer(accept_offer, header, state):
     Raises:
         - InvalidTransaction
             - The Offer does not exist or is not Open
+            - The Offer has expired.
             - The receiver source Holding does not exist.
             - The receiver target Holding does not exist.
             - The offerer source holding asset does not match the
@@ -38,12 +40,51 @@ def handle_accept_offer(accept_offer, header, state):
             - The offerer target holding asset does not match the
               the receiver source holding asset.
             - The receiver source holding does not have the required quantity.
-            - The offerer source holding does not have the required quantity.
+            - The offerer source holding does not have the required quantity,
+              or an escrowed Offer does not have it in escrow.
+    """
+
+    _prefetch([accept_offer], header, state)
+
+    _accept(accept_offer, header, state)
+
+
+def handle_accept_offers(accept_offers, header, state):
+    """Handle the acceptance of several Offers in one transaction. Each
+    AcceptOffer is validated against the state left by the ones before it,
+    and if any is invalid none of them are applied.
+
+    Args:
+        accept_offers (AcceptOffers): The transaction.
+        header (TransactionHeader): The TransactionHeader.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        - InvalidTransaction
+            - There are no AcceptOffer entries.
+            - Any of the AcceptOffer entries is invalid, as for
+              handle_accept_offer.
     """
 
+    if not accept_offers.entries:
+        raise InvalidTransaction(
+            "Failed to accept Offers, no Offers were given")
+
+    _prefetch(accept_offers.entries, header, state)
+
+    for accept_offer in accept_offers.entries:
+        _accept(accept_offer, header, state)
+
+
+def _accept(accept_offer, header, state):
     offer = state.get_offer(identifier=accept_offer.id)
 
-    check_validity_of_offer(offer, accept_offer)
+    # The BlockInfo config is only read, and so only need be declared, for
+    # an Offer that expires.
+    block_num = state.get_block_num() \
+        if offer and offer.expires_at_block else None
+
+    check_validity_of_offer(offer, accept_offer, block_num)
 
     offer_accept = OfferAcceptance(offer, accept_offer, header, state)
 
@@ -79,12 +120,76 @@ def handle_accept_offer(accept_offer, header, state):
     offer_accept.handle_exchange_once()
 
 
-def check_validity_of_offer(offer, accept_offer):
-    """Checks that the offer exists and is open.
+def _prefetch(accept_offers, header, state):
+    """Loads the read set of the AcceptOffers in three batched reads: the
+    Offers and the receiver's Holdings named in the payloads, then the
+    offerer's Holdings, the Assets of the receiver's Holdings, the receipts
+    and allowlist entries the Offers' rules need and, if any Offer expires,
+    the BlockInfo config, then any credit shards.
+
+    The offerer's Assets are the same as the receiver's Assets for any
+    valid AcceptOffer, so they are already loaded by the second read. The
+    source Holding of an escrowed Offer is not read at all, nor are the
+    receipts of an Offer without EXCHANGE_ONCE or EXCHANGE_ONCE_PER_ACCOUNT,
+    so they need not be declared as inputs.
+    """
+
+    offer_ids = [a.id for a in accept_offers]
+    receiver_ids = [h for a in accept_offers for h in (a.source, a.target)
+                    if h]
+
+    state.prefetch(
+        addresser.make_addresses(addresser.AddressSpace.OFFER, offer_ids) +
+        addresser.make_addresses(addresser.AddressSpace.HOLDING, receiver_ids))
+
+    offers = [o for o in (state.get_offer(identifier=i) for i in offer_ids)
+              if o]
+    offerer_ids = [h for o in offers
+                   for h in (None if o.escrow else o.source, o.target) if h]
+    receivers = [state.get_holding(identifier=h) for h in receiver_ids]
+    block_info = [addresser.BLOCK_INFO_CONFIG_ADDRESS] \
+        if any(o.expires_at_block for o in offers) else []
+
+    receipts = []
+    allowlists = []
+    for offer in offers:
+        rules = state.get_offer_rules(offer.id)
+        if rules.exchange_once():
+            receipts.append(offer.id)
+        if rules.exchange_once_per_account():
+            receipts.append((offer.id, header.signer_public_key))
+        if rules.limited_to_allowlist():
+            allowlists.append((offer.id, header.signer_public_key))
+
+    state.prefetch(
+        block_info +
+        addresser.make_addresses(addresser.AddressSpace.HOLDING, offerer_ids) +
+        addresser.make_addresses(
+            addresser.AddressSpace.ASSET,
+            [h.asset for h in receivers if h]) +
+        addresser.make_addresses(
+            addresser.AddressSpace.OFFER_HISTORY, receipts) +
+        addresser.make_addresses(
+            addresser.AddressSpace.OFFER_ALLOWLIST, allowlists))
+
+    targets = [state.get_holding(o.target) for o in offers if o.target]
+
+    state.prefetch([
+        addresser.make_holding_credit_address(
+            holding_id=h.id,
+            shard=addresser.credit_shard(
+                header.signer_public_key, h.credit_shards))
+        for h in targets if h and h.credit_shards])
+
+
+def check_validity_of_offer(offer, accept_offer, block_num):
+    """Checks that the offer exists, is open and has not expired.
 
     Args:
         offer (offer_pb2.Offer): The offer.
         accept_offer (AcceptOffer): The AcceptOffer txn.
+        block_num (int): The number of the current block, or None if it is
+            not known.
 
     Raises:
         - InvalidTransaction
@@ -98,6 +203,11 @@ def check_validity_of_offer(offer, accept_offer):
         raise InvalidTransaction(
             "Failed to accept Offer, Offer {} is not open".format(
                 accept_offer.id))
+    if offer.expires_at_block and (
+            block_num is None or block_num > offer.expires_at_block):
+        raise InvalidTransaction(
+            "Failed to accept Offer, Offer {} expired at block {}".format(
+                accept_offer.id, offer.expires_at_block))
 
 
 class OfferAcceptance(object):
@@ -108,17 +218,27 @@ class OfferAcceptance(object):
         self._header = header
 
         self._state = state
+        self._rules = state.get_offer_rules(offer.id)
 
-        source_hldng = state.get_holding(offer.source)
+        # An escrowed Offer pays out of its own escrow_quantity, so its
+        # source Holding is neither read nor written.
+        source_hldng = None if offer.escrow else state.get_holding(
+            offer.source)
         target_hldng = state.get_holding(
             offer.target) if offer.target else None
         asset = state.get_asset(target_hldng.asset) if target_hldng else None
 
+        # Whether each source Holding is infinite is decided once, for the
+        # validation and the handling of the quantities.
         self._offerer = _OfferParticipant(
             source=source_hldng,
             target=target_hldng,
-            source_asset=state.get_asset(source_hldng.asset),
-            target_asset=asset)
+            source_asset=state.get_asset(
+                offer.source_asset if offer.escrow else source_hldng.asset),
+            target_asset=asset,
+            source_infinite=not offer.escrow and state.get_asset_rules(
+                source_hldng.asset).holding_is_infinite(
+                    source_hldng.account))
 
         source = state.get_holding(accept_offer.source) \
             if accept_offer.source else None
@@ -130,7 +250,9 @@ class OfferAcceptance(object):
             source=source,
             source_asset=src_asset,
             target=target,
-            target_asset=state.get_asset(target.asset))
+            target_asset=state.get_asset(target.asset),
+            source_infinite=source is not None and state.get_asset_rules(
+                source.asset).holding_is_infinite(source.account))
 
     def validate_output_holding_exists(self):
         if self._offer.target and self._accept_offer.source:
@@ -146,10 +268,11 @@ class OfferAcceptance(object):
                 " does not exist".format(self._accept_offer.target))
 
     def validate_input_holding_assets(self):
-        if not self._offerer.source.asset == self._receiver.target.asset:
+        if not self._offerer.source_asset.name == \
+                self._receiver.target.asset:
             raise InvalidTransaction(
                 "Failed to accept offer, expected Holding asset {}, got "
-                "asset {}".format(self._offerer.source.asset,
+                "asset {}".format(self._offerer.source_asset.name,
                                   self._receiver.target.asset))
 
     def validate_output_holding_assets(self):
@@ -163,9 +286,8 @@ class OfferAcceptance(object):
                                    self._receiver.source.asset))
 
     def validate_output_enough(self, output_quantity):
-        if self._accept_offer.source and not _holding_is_infinite(
-                self._receiver.source_asset,
-                self._receiver.source.account) and \
+        if self._accept_offer.source and \
+                not self._receiver.source_infinite and \
                 output_quantity > self._receiver.source.quantity:
             raise InvalidTransaction(
                 "Failed to accept offer, needed quantity {}, but only had {} "
@@ -174,8 +296,15 @@ class OfferAcceptance(object):
                                self._receiver.source.asset))
 
     def validate_input_enough(self, input_quantity):
-        if not _holding_is_infinite(self._offerer.source_asset,
-                                    self._offerer.source.account) and \
+        if self._offer.escrow:
+            if input_quantity > self._offer.escrow_quantity:
+                raise InvalidTransaction(
+                    "Failed to accept offer, needed quantity {}, but only "
+                    "{} of {} is in escrow".format(
+                        input_quantity,
+                        self._offer.escrow_quantity,
+                        self._offer.source_asset))
+        elif not self._offerer.source_infinite and \
                 input_quantity > self._offerer.source.quantity:
             raise InvalidTransaction(
                 "Failed to accept offer, needed quantity {}, but only had {} "
@@ -184,7 +313,7 @@ class OfferAcceptance(object):
                                self._offerer.source.asset))
 
     def validate_once_per_account(self):
-        if _exchange_once_per_account(self._offer):
+        if self._rules.exchange_once_per_account():
             if self._state.get_offer_account_receipt(
                     offer_id=self._offer.id,
                     account=self._header.signer_public_key):
@@ -194,105 +323,83 @@ class OfferAcceptance(object):
                     "accepted offer.".format(self._header.signer_public_key))
 
     def validate_exchange_once(self):
-        if _exchange_once(self._offer):
+        if self._rules.exchange_once():
             if self._state.offer_has_receipt(offer_id=self._offer.id):
                 raise InvalidTransaction(
                     "Failed to accept offer, offer has already been accepted "
                     "and EXCHANGE ONCE is set.")
 
     def validate_accounts_limited_to(self):
-        if _accounts_limited_to(self._offer):
-            if self._header.signer_public_key not in _accounts(self._offer):
+        if self._rules.accounts_limited_to():
+            if self._header.signer_public_key not in self._rules.accounts():
                 raise InvalidTransaction(
                     "Failed to accept offer, accounts limited to {} but "
                     "account is {}".format(
-                        _accounts(self._offer),
+                        sorted(self._rules.accounts()),
+                        self._header.signer_public_key))
+
+        if self._rules.limited_to_allowlist():
+            if not self._state.offer_allows(
+                    offer_id=self._offer.id,
+                    account=self._header.signer_public_key):
+                raise InvalidTransaction(
+                    "Failed to accept offer, account {} is not on the "
+                    "offer's allowlist".format(
                         self._header.signer_public_key))
 
     def handle_offerer_source(self, input_quantity):
-        if not _holding_is_infinite(self._offerer.source_asset,
-                                    self._offerer.source.account):
-            self._state.change_holding_quantity(
+        if self._offer.escrow:
+            self._state.adjust_offer_escrow(self._offer.id, -input_quantity)
+        elif not self._offerer.source_infinite:
+            self._state.adjust_holding_quantity(
                 self._offerer.source.id,
-                self._offerer.source.quantity - input_quantity)
+                -input_quantity)
 
     def handle_offerer_target(self, output_quantity):
-        if self._offer.target:
-            self._state.change_holding_quantity(
+        if self._offer.target and self._offerer.target.credit_shards:
+            # Credit a shard rather than the Holding, so acceptances by
+            # different accounts do not all write the same address.
+            self._state.credit_holding(
+                self._offerer.target.id,
+                addresser.credit_shard(
+                    self._header.signer_public_key,
+                    self._offerer.target.credit_shards),
+                output_quantity)
+        elif self._offer.target:
+            self._state.adjust_holding_quantity(
                 self._offerer.target.id,
-                self._offerer.target.quantity + output_quantity)
+                output_quantity)
 
     def handle_receiver_source(self, output_quantity):
-        if self._accept_offer.source and not _holding_is_infinite(
-                self._receiver.source_asset,
-                self._receiver.source.account):
-            self._state.change_holding_quantity(
+        if self._accept_offer.source and not self._receiver.source_infinite:
+            self._state.adjust_holding_quantity(
                 self._receiver.source.id,
-                self._receiver.source.quantity - output_quantity)
+                -output_quantity)
 
     def handle_receiver_target(self, input_quantity):
-        self._state.change_holding_quantity(
+        self._state.adjust_holding_quantity(
             self._receiver.target.id,
-            self._receiver.target.quantity + input_quantity)
+            input_quantity)
 
     def handle_once_per_account(self):
-        if _exchange_once_per_account(self._offer):
+        if self._rules.exchange_once_per_account():
             self._state.save_offer_account_receipt(
                 offer_id=self._offer.id,
                 account=self._header.signer_public_key)
 
     def handle_exchange_once(self):
-        if _exchange_once(self._offer):
+        if self._rules.exchange_once():
             self._state.save_offer_receipt(offer_id=self._offer.id)
 
 
-def _has_rule(rules, rule_type):
-    for rule in rules:
-        if rule.type == rule_type:
-            return True
-    return False
-
-
-def _accounts_limited_to(offer):
-    if _has_rule(offer.rules, rule_pb2.Rule.EXCHANGE_LIMITED_TO_ACCOUNTS):
-        return True
-    return False
-
-
-def _accounts(offer):
-    return set.intersection(
-        *[set(str(rule.value, 'utf-8').split(','))
-          for rule in offer.rules
-          if rule.type == rule_pb2.Rule.EXCHANGE_LIMITED_TO_ACCOUNTS])
-
-
-def _exchange_once(offer):
-    if _has_rule(offer.rules, rule_pb2.Rule.EXCHANGE_ONCE):
-        return True
-    return False
-
-
-def _exchange_once_per_account(offer):
-    if _has_rule(offer.rules, rule_pb2.Rule.EXCHANGE_ONCE_PER_ACCOUNT):
-        return True
-    return False
-
-
-def _holding_is_infinite(asset, owner):
-    if asset and (_has_rule(
-            asset.rules,
-            rule_pb2.Rule.ALL_HOLDINGS_INFINITE) or
-                  _has_rule(
-                      asset.rules,
-                      rule_pb2.Rule.OWNER_HOLDINGS_INFINITE) and
-                  owner in asset.owners):
-        return True
-    return False
-
-
 class _OfferParticipant(object):
 
-    def __init__(self, source, target, source_asset, target_asset):
+    def __init__(self,
+                 source,
+                 target,
+                 source_asset,
+                 target_asset,
+                 source_infinite=False):
         """Constructor.
 
         Args:
@@ -300,10 +407,13 @@ class _OfferParticipant(object):
             target (Holding): The target Holding.
             source_asset (Asset): The source Asset.
             target_asset (Asset): The target Asset.
+            source_infinite (bool): Whether the source Holding is not
+                debited, as its owner's Holdings of the Asset are infinite.
         """
 
         self._source = source
         self._source_asset = source_asset
+        self._source_infinite = source_infinite
 
         self._target = target
         self._target_asset = target_asset
@@ -316,6 +426,10 @@ class _OfferParticipant(object):
     def source_asset(self):
         return self._source_asset
 
+    @property
+    def source_infinite(self):
+        return self._source_infinite
+
     @property
     def target(self):
         return self._target
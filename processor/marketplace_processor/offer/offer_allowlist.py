@@ -0,0 +1,73 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.protobuf import offer_pb2
+
+
+def handle_allow_accounts(allow_accounts, header, state):
+    """Handle adding accounts to an Offer's allowlist.
+
+    Args:
+        allow_accounts (AllowAccounts): The transaction.
+        header (TransactionHeader): The TransactionHeader.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        - InvalidTransaction
+            - No accounts are given.
+            - The Offer doesn't exist or is not open.
+            - The txn signer is not within the owners of the Offer.
+            - The Offer does not have the EXCHANGE_LIMITED_TO_ALLOWLIST
+              rule.
+    """
+
+    if not allow_accounts.accounts:
+        raise InvalidTransaction(
+            "Failed to allow accounts, no accounts were given")
+
+    state.prefetch(
+        [addresser.make_offer_address(allow_accounts.offer_id)] +
+        addresser.make_addresses(
+            addresser.AddressSpace.OFFER_ALLOWLIST,
+            [(allow_accounts.offer_id, a) for a in allow_accounts.accounts]))
+
+    offer = state.get_offer(allow_accounts.offer_id)
+
+    if not offer:
+        raise InvalidTransaction(
+            "Failed to allow accounts, the offer id {} does not reference "
+            "an Offer.".format(allow_accounts.offer_id))
+
+    if not offer.status == offer_pb2.Offer.OPEN:
+        raise InvalidTransaction(
+            "Failed to allow accounts, the Offer {} is not open".format(
+                offer.id))
+
+    if header.signer_public_key not in offer.owners:
+        raise InvalidTransaction(
+            "Failed to allow accounts, the txn signer {} is not a member of "
+            "the offer's owners.".format(header.signer_public_key))
+
+    if not state.get_offer_rules(offer.id).limited_to_allowlist():
+        raise InvalidTransaction(
+            "Failed to allow accounts, the Offer {} does not have the "
+            "EXCHANGE_LIMITED_TO_ALLOWLIST rule.".format(offer.id))
+
+    for account in allow_accounts.accounts:
+        state.allow_account(offer_id=offer.id, account=account)
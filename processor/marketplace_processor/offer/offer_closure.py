@@ -19,7 +19,8 @@ from marketplace_processor.protobuf import offer_pb2
 
 
 def handle_close_offer(close_offer, header, state):
-    """Handle Offer closure.
+    """Handle Offer closure. Whatever is left in escrow is returned to the
+    Offer's source Holding.
 
     Args:
         close_offer (CloseOffer): The transaction.
@@ -51,4 +52,17 @@ def handle_close_offer(close_offer, header, state):
             "is not a member of the offer's owners.".format(
                 header.signer_public_key))
 
+    if offer.escrow and offer.escrow_quantity:
+        _refund_escrow(offer, state)
+
     state.close_offer(close_offer.id)
+
+
+def _refund_escrow(offer, state):
+    source = state.get_holding(offer.source)
+
+    if not state.get_asset_rules(source.asset).holding_is_infinite(
+            source.account):
+        state.adjust_holding_quantity(source.id, offer.escrow_quantity)
+
+    state.adjust_offer_escrow(offer.id, -offer.escrow_quantity)
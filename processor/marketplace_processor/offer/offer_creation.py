@@ -15,7 +15,11 @@
 
 from sawtooth_sdk.processor.exceptions import InvalidTransaction
 
-from marketplace_processor.protobuf import rule_pb2
+from marketplace_addressing import addresser
+
+
+# The largest escrow_quantity an Offer can store, the maximum of its sint64.
+MAX_ESCROW_QUANTITY = 2 ** 63 - 1
 
 
 def handle_offer_creation(create_offer, header, state):
@@ -36,9 +40,16 @@ def handle_offer_creation(create_offer, header, state):
             - The target or target_quantity are set while the other is unset.
             - The source is not a holding.
             - THe target is not a holding.
+            - The Offer is escrowed and the source_quantity is negative,
+              the escrowed quantity is more than MAX_ESCROW_QUANTITY, or
+              the source Holding does not have the escrowed quantity.
+            - The Offer expires and the block it expires at is past, or no
+              BlockInfo is recorded.
 
     """
 
+    _prefetch(create_offer, header, state)
+
     if state.get_offer(identifier=create_offer.id):
         raise InvalidTransaction(
             "Failed to create Offer, id {} already exists.".format(
@@ -68,11 +79,11 @@ def handle_offer_creation(create_offer, header, state):
             "Failed to create Offer, source Holding account {} not "
             "owned by txn signer {}".format(source_holding.account,
                                             header.signer_public_key))
-    source_asset = state.get_asset(source_holding.asset)
-    if _is_not_transferable(source_asset, header.signer_public_key):
+    if state.get_asset_rules(source_holding.asset).is_not_transferable(
+            header.signer_public_key):
         raise InvalidTransaction(
             "Failed to create Offer, source asset {} are not "
-            "transferable".format(source_asset.name))
+            "transferable".format(source_holding.asset))
 
     if create_offer.target and not create_offer.target_quantity or \
             create_offer.target_quantity and not create_offer.target:
@@ -81,22 +92,10 @@ def handle_offer_creation(create_offer, header, state):
                                  "both unset.")
 
     if create_offer.target:
-        target_holding = state.get_holding(identifier=create_offer.target)
-        if not target_holding:
-            raise InvalidTransaction(
-                "Failed to create Offer, Holding id {} listed as target "
-                "does not refer to a Holding.".format(create_offer.target))
-
-        if not target_holding.account == header.signer_public_key:
-            raise InvalidTransaction(
-                "Failed to create Offer, target Holding account {} not "
-                "owned by txn signer {}".format(target_holding.account,
-                                                header.signer_public_key))
-        target_asset = state.get_asset(target_holding.asset)
-        if _is_not_transferable(target_asset, header.signer_public_key):
-            raise InvalidTransaction(
-                "Failed to create Offer, target asset {} is not "
-                "transferable".format(target_asset.name))
+        _validate_target(create_offer, header, state)
+
+    if create_offer.expires_at_block:
+        _validate_expiry(create_offer, state)
 
     state.set_create_offer(
         identifier=create_offer.id,
@@ -107,18 +106,102 @@ def handle_offer_creation(create_offer, header, state):
         source_quantity=create_offer.source_quantity,
         target=create_offer.target,
         target_quantity=create_offer.target_quantity,
-        rules=create_offer.rules)
+        rules=create_offer.rules,
+        expires_at_block=create_offer.expires_at_block)
+
+    if create_offer.escrow_count:
+        _escrow_source(create_offer, source_holding, state)
+
+
+def _validate_target(create_offer, header, state):
+    target_holding = state.get_holding(identifier=create_offer.target)
+    if not target_holding:
+        raise InvalidTransaction(
+            "Failed to create Offer, Holding id {} listed as target "
+            "does not refer to a Holding.".format(create_offer.target))
 
+    if not target_holding.account == header.signer_public_key:
+        raise InvalidTransaction(
+            "Failed to create Offer, target Holding account {} not "
+            "owned by txn signer {}".format(target_holding.account,
+                                            header.signer_public_key))
+    if state.get_asset_rules(target_holding.asset).is_not_transferable(
+            header.signer_public_key):
+        raise InvalidTransaction(
+            "Failed to create Offer, target asset {} is not "
+            "transferable".format(target_holding.asset))
+
+
+def _validate_expiry(create_offer, state):
+    block_num = state.get_block_num()
+    if block_num is None:
+        raise InvalidTransaction(
+            "Failed to create Offer, expires_at_block is set but no "
+            "BlockInfo is recorded")
+    if create_offer.expires_at_block < block_num:
+        raise InvalidTransaction(
+            "Failed to create Offer, expires_at_block {} is before the "
+            "current block {}".format(create_offer.expires_at_block,
+                                      block_num))
 
-def _is_not_transferable(asset, owner_public_key):
-    if _has_rule(asset.rules, rule_pb2.Rule.NOT_TRANSFERABLE) \
-            and owner_public_key not in asset.owners:
-        return True
-    return False
 
+def _escrow_source(create_offer, source_holding, state):
+    """Moves the source quantity of escrow_count acceptances from the
+    source Holding into the Offer. An infinite Holding is not debited.
+    """
+
+    if create_offer.source_quantity < 0:
+        raise InvalidTransaction(
+            "Failed to create Offer, an escrowed Offer's source_quantity "
+            "must be positive.")
+
+    escrow_quantity = create_offer.source_quantity * create_offer.escrow_count
+    if escrow_quantity > MAX_ESCROW_QUANTITY:
+        raise InvalidTransaction(
+            "Failed to create Offer, escrow of {} needs quantity {}, more "
+            "than the most an Offer can hold, {}".format(
+                create_offer.escrow_count,
+                escrow_quantity,
+                MAX_ESCROW_QUANTITY))
+
+    infinite = state.get_asset_rules(source_holding.asset).holding_is_infinite(
+        source_holding.account)
+
+    if not infinite and escrow_quantity > source_holding.quantity:
+        raise InvalidTransaction(
+            "Failed to create Offer, escrow of {} needs quantity {}, but "
+            "Holding {} only has {}".format(create_offer.escrow_count,
+                                            escrow_quantity,
+                                            source_holding.id,
+                                            source_holding.quantity))
+
+    state.set_offer_escrow(
+        identifier=create_offer.id,
+        source_asset=source_holding.asset,
+        quantity=escrow_quantity)
+
+    if not infinite:
+        state.adjust_holding_quantity(source_holding.id, -escrow_quantity)
+
+
+def _prefetch(create_offer, header, state):
+    """Loads the CreateOffer read set in two batched reads: the Offer,
+    Account and Holdings named in the payload, and the BlockInfo config if
+    the Offer expires, then the Assets of those Holdings.
+    """
 
-def _has_rule(rules, rule_type):
-    for rule in rules:
-        if rule.type == rule_type:
-            return True
-    return False
+    holding_ids = [h for h in (create_offer.source, create_offer.target) if h]
+    block_info = [addresser.BLOCK_INFO_CONFIG_ADDRESS] \
+        if create_offer.expires_at_block else []
+
+    state.prefetch(
+        [addresser.make_offer_address(offer_id=create_offer.id),
+         addresser.make_account_address(
+             account_id=header.signer_public_key)] +
+        addresser.make_addresses(addresser.AddressSpace.HOLDING, holding_ids) +
+        block_info)
+
+    holdings = [state.get_holding(identifier=h) for h in holding_ids]
+    state.prefetch(addresser.make_addresses(
+        addresser.AddressSpace.ASSET,
+        [h.asset for h in holdings if h]))
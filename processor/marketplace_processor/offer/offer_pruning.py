@@ -0,0 +1,76 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.protobuf import offer_pb2
+
+
+def handle_prune_offer(prune_offer, header, state):
+    """Handle deleting a closed Offer from state. Its receipts, and the
+    allowlist entries of the accounts given, are deleted with it. The
+    Offer's history is kept by ledger sync.
+
+    Args:
+        prune_offer (PruneOffer): The transaction.
+        header (TransactionHeader): The TransactionHeader.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        - InvalidTransaction
+            - The Offer doesn't exist.
+            - The Offer is not closed, nor expired with nothing in escrow.
+            - The txn signer is not within the owners of the Offer.
+    """
+
+    state.prefetch(
+        [addresser.make_offer_address(prune_offer.id),
+         addresser.BLOCK_INFO_CONFIG_ADDRESS] +
+        addresser.make_offer_receipt_addresses(prune_offer.id) +
+        addresser.make_addresses(
+            addresser.AddressSpace.OFFER_ALLOWLIST,
+            [(prune_offer.id, a) for a in prune_offer.allowlist_accounts]))
+
+    offer = state.get_offer(prune_offer.id)
+
+    if not offer:
+        raise InvalidTransaction(
+            "Failed to prune offer, the offer id {} does not reference "
+            "an Offer.".format(prune_offer.id))
+
+    if not offer.status == offer_pb2.Offer.CLOSED and \
+            not _expired_without_escrow(offer, state.get_block_num()):
+        raise InvalidTransaction(
+            "Failed to prune offer, the Offer {} is not closed".format(
+                offer.id))
+
+    if header.signer_public_key not in offer.owners:
+        raise InvalidTransaction(
+            "Failed to prune offer, the txn signer {} is not a member of "
+            "the offer's owners.".format(header.signer_public_key))
+
+    state.prune_offer(offer.id)
+
+    for account in prune_offer.allowlist_accounts:
+        state.remove_allowed_account(offer_id=offer.id, account=account)
+
+
+def _expired_without_escrow(offer, block_num):
+    # An expired Offer can no longer be accepted, but any escrow it holds is
+    # only returned by closing it.
+    return bool(offer.expires_at_block) and block_num is not None and \
+        block_num > offer.expires_at_block and not offer.escrow_quantity
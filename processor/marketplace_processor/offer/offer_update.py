@@ -0,0 +1,152 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.protobuf import offer_pb2
+
+
+def handle_update_offer(update_offer, header, state):
+    """Handle changing an Offer in place, which keeps its id and address.
+
+    Args:
+        update_offer (UpdateOffer): The transaction.
+        header (TransactionHeader): The TransactionHeader.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        - InvalidTransaction
+            - The Offer doesn't exist.
+            - The Offer is closed or expired and is not being reopened.
+            - The txn signer is not within the owners of the Offer.
+            - An escrowed Offer is reopened, or given a source_quantity,
+              since its escrow is for the source_quantity it was created
+              with.
+            - A target_quantity is given for an Offer without a target.
+            - The expires_at_block is past, or no BlockInfo is recorded.
+            - Both expires_at_block and clear_expiry are given.
+            - An expired Offer is updated without a new expires_at_block
+              or clear_expiry.
+    """
+
+    block_info = [addresser.BLOCK_INFO_CONFIG_ADDRESS] \
+        if update_offer.expires_at_block else []
+
+    state.prefetch(
+        [addresser.make_offer_address(update_offer.id)] + block_info)
+
+    offer = state.get_offer(update_offer.id)
+
+    if not offer:
+        raise InvalidTransaction(
+            "Failed to update offer, the offer id {} does not reference "
+            "an Offer.".format(update_offer.id))
+
+    # The processor never closes an Offer when it expires, so an expired
+    # Offer is still OPEN in state and is treated as closed here.
+    expired = _validate_expiry(update_offer, offer, state)
+
+    if (expired or not offer.status == offer_pb2.Offer.OPEN) and \
+            not update_offer.reopen:
+        raise InvalidTransaction(
+            "Failed to update offer, the Offer {} is not open".format(
+                offer.id))
+
+    if header.signer_public_key not in offer.owners:
+        raise InvalidTransaction(
+            "Failed to update offer, the txn signer {} is not a member of "
+            "the offer's owners.".format(header.signer_public_key))
+
+    # The escrow of a closed Offer has been returned to its source Holding.
+    if offer.escrow and update_offer.reopen and \
+            not offer.status == offer_pb2.Offer.OPEN:
+        raise InvalidTransaction(
+            "Failed to update offer, the escrowed Offer {} cannot be "
+            "reopened".format(offer.id))
+
+    if offer.escrow and update_offer.source_quantity:
+        raise InvalidTransaction(
+            "Failed to update offer, the source_quantity of the escrowed "
+            "Offer {} cannot be changed".format(offer.id))
+
+    if update_offer.target_quantity and not offer.target:
+        raise InvalidTransaction(
+            "Failed to update offer, the Offer {} has no target to set a "
+            "target_quantity for".format(offer.id))
+
+    if update_offer.clear_expiry:
+        expires_at_block = 0
+    else:
+        expires_at_block = update_offer.expires_at_block or None
+
+    state.update_offer(
+        identifier=offer.id,
+        label=update_offer.label or None,
+        description=update_offer.description or None,
+        source_quantity=update_offer.source_quantity or None,
+        target_quantity=update_offer.target_quantity or None,
+        expires_at_block=expires_at_block,
+        status=offer_pb2.Offer.OPEN if update_offer.reopen else None)
+
+
+def _validate_expiry(update_offer, offer, state):
+    """Checks the expiry the update gives the Offer.
+
+    Args:
+        update_offer (UpdateOffer): The transaction.
+        offer (Offer): The Offer being updated.
+        state (MarketplaceState): The wrapper around the context.
+
+    Raises:
+        InvalidTransaction: The new expiry is invalid, or the Offer has
+            expired and is given neither a new expires_at_block nor
+            clear_expiry.
+
+    Returns:
+        bool: Whether the Offer has expired.
+    """
+
+    if update_offer.expires_at_block and update_offer.clear_expiry:
+        raise InvalidTransaction(
+            "Failed to update offer, expires_at_block and clear_expiry "
+            "cannot both be given")
+
+    block_num = state.get_block_num() \
+        if update_offer.expires_at_block or offer.expires_at_block else None
+
+    if update_offer.expires_at_block:
+        if block_num is None:
+            raise InvalidTransaction(
+                "Failed to update offer, expires_at_block is set but no "
+                "BlockInfo is recorded")
+        if update_offer.expires_at_block < block_num:
+            raise InvalidTransaction(
+                "Failed to update offer, expires_at_block {} is before the "
+                "current block {}".format(update_offer.expires_at_block,
+                                          block_num))
+
+    expired = bool(offer.expires_at_block) and (
+        block_num is None or block_num > offer.expires_at_block)
+
+    if expired and not update_offer.expires_at_block and \
+            not update_offer.clear_expiry:
+        raise InvalidTransaction(
+            "Failed to update offer, the Offer {} expired at block {}, "
+            "give a new expires_at_block or clear_expiry to update "
+            "it".format(offer.id, offer.expires_at_block))
+
+    return expired
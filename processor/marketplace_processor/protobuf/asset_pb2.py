@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_processor/protobuf/asset.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from marketplace_processor.protobuf import rule_pb2 as marketplace__processor_dot_protobuf_dot_rule__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n*marketplace_processor/protobuf/asset.proto\x1a)marketplace_processor/protobuf/rule.proto\"P\n\x05\x41sset\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x0e\n\x06owners\x18\x03 \x03(\t\x12\x14\n\x05rules\x18\x04 \x03(\x0b\x32\x05.Rule\")\n\x0e\x41ssetContainer\x12\x17\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x06.Assetb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_processor.protobuf.asset_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _ASSET._serialized_start=89
+  _ASSET._serialized_end=169
+  _ASSETCONTAINER._serialized_start=171
+  _ASSETCONTAINER._serialized_end=212
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_processor/protobuf/compact_payload.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from marketplace_processor.protobuf import payload_pb2 as marketplace__processor_dot_protobuf_dot_payload__pb2
+from marketplace_processor.protobuf import rule_pb2 as marketplace__processor_dot_protobuf_dot_rule__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n4marketplace_processor/protobuf/compact_payload.proto\x1a,marketplace_processor/protobuf/payload.proto\x1a)marketplace_processor/protobuf/rule.proto\"\xfe\x04\n\x19\x43ompactTransactionPayload\x12\x35\n\x0cpayload_type\x18\x01 \x01(\x0e\x32\x1f.TransactionPayload.PayloadType\x12&\n\x0e\x63reate_account\x18\x02 \x01(\x0b\x32\x0e.CreateAccount\x12\"\n\x0c\x63reate_asset\x18\x03 \x01(\x0b\x32\x0c.CreateAsset\x12-\n\x0e\x63reate_holding\x18\x04 \x01(\x0b\x32\x15.CompactCreateHolding\x12)\n\x0c\x63reate_offer\x18\x05 \x01(\x0b\x32\x13.CompactCreateOffer\x12)\n\x0c\x61\x63\x63\x65pt_offer\x18\n \x01(\x0b\x32\x13.CompactAcceptOffer\x12\'\n\x0b\x63lose_offer\x18\x0b \x01(\x0b\x32\x12.CompactCloseOffer\x12+\n\raccept_offers\x18\x0c \x01(\x0b\x32\x14.CompactAcceptOffers\x12/\n\x0f\x63reate_holdings\x18\r \x01(\x0b\x32\x16.CompactCreateHoldings\x12+\n\rsweep_credits\x18\x0e \x01(\x0b\x32\x14.CompactSweepCredits\x12-\n\x0e\x61llow_accounts\x18\x0f \x01(\x0b\x32\x15.CompactAllowAccounts\x12)\n\x0cupdate_offer\x18\x10 \x01(\x0b\x32\x13.CompactUpdateOffer\x12\"\n\x08transfer\x18\x11 \x01(\x0b\x32\x10.CompactTransfer\x12\'\n\x0bprune_offer\x18\x12 \x01(\x0b\x32\x12.CompactPruneOffer\"~\n\x14\x43ompactCreateHolding\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\r\n\x05\x61sset\x18\x04 \x01(\t\x12\x10\n\x08quantity\x18\x05 \x01(\x12\x12\x15\n\rcredit_shards\x18\x06 \x01(\r\"?\n\x15\x43ompactCreateHoldings\x12&\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x15.CompactCreateHolding\"C\n\x0f\x43ompactTransfer\x12\x0e\n\x06source\x18\x01 \x01(\x0c\x12\x0e\n\x06target\x18\x02 \x01(\x0c\x12\x10\n\x08quantity\x18\x03 \x01(\x04\"\xdc\x01\n\x12\x43ompactCreateOffer\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0e\n\x06source\x18\x04 \x01(\x0c\x12\x17\n\x0fsource_quantity\x18\x05 \x01(\x12\x12\x0e\n\x06target\x18\x06 \x01(\x0c\x12\x17\n\x0ftarget_quantity\x18\x07 \x01(\x12\x12\x14\n\x05rules\x18\x08 \x03(\x0b\x32\x05.Rule\x12\x14\n\x0c\x65scrow_count\x18\t \x01(\x04\x12\x18\n\x10\x65xpires_at_block\x18\n \x01(\x04\"O\n\x12\x43ompactAcceptOffer\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\x0e\n\x06source\x18\x02 \x01(\x0c\x12\x0e\n\x06target\x18\x03 \x01(\x0c\x12\r\n\x05\x63ount\x18\x04 \x01(\x04\";\n\x13\x43ompactAcceptOffers\x12$\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x13.CompactAcceptOffer\"\x1f\n\x11\x43ompactCloseOffer\x12\n\n\x02id\x18\x01 \x01(\x0c\";\n\x11\x43ompactPruneOffer\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\x1a\n\x12\x61llowlist_accounts\x18\x02 \x03(\x0c\"\xb6\x01\n\x12\x43ompactUpdateOffer\x12\n\n\x02id\x18\x01 \x01(\x0c\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x17\n\x0fsource_quantity\x18\x04 \x01(\x12\x12\x17\n\x0ftarget_quantity\x18\x05 \x01(\x12\x12\x18\n\x10\x65xpires_at_block\x18\x06 \x01(\x04\x12\x0e\n\x06reopen\x18\x07 \x01(\x08\x12\x14\n\x0c\x63lear_expiry\x18\x08 \x01(\x08\":\n\x14\x43ompactAllowAccounts\x12\x10\n\x08offer_id\x18\x01 \x01(\x0c\x12\x10\n\x08\x61\x63\x63ounts\x18\x02 \x03(\x0c\"&\n\x13\x43ompactSweepCredits\x12\x0f\n\x07holding\x18\x01 \x01(\x0c\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_processor.protobuf.compact_payload_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _COMPACTTRANSACTIONPAYLOAD._serialized_start=146
+  _COMPACTTRANSACTIONPAYLOAD._serialized_end=784
+  _COMPACTCREATEHOLDING._serialized_start=786
+  _COMPACTCREATEHOLDING._serialized_end=912
+  _COMPACTCREATEHOLDINGS._serialized_start=914
+  _COMPACTCREATEHOLDINGS._serialized_end=977
+  _COMPACTTRANSFER._serialized_start=979
+  _COMPACTTRANSFER._serialized_end=1046
+  _COMPACTCREATEOFFER._serialized_start=1049
+  _COMPACTCREATEOFFER._serialized_end=1269
+  _COMPACTACCEPTOFFER._serialized_start=1271
+  _COMPACTACCEPTOFFER._serialized_end=1350
+  _COMPACTACCEPTOFFERS._serialized_start=1352
+  _COMPACTACCEPTOFFERS._serialized_end=1411
+  _COMPACTCLOSEOFFER._serialized_start=1413
+  _COMPACTCLOSEOFFER._serialized_end=1444
+  _COMPACTPRUNEOFFER._serialized_start=1446
+  _COMPACTPRUNEOFFER._serialized_end=1505
+  _COMPACTUPDATEOFFER._serialized_start=1508
+  _COMPACTUPDATEOFFER._serialized_end=1690
+  _COMPACTALLOWACCOUNTS._serialized_start=1692
+  _COMPACTALLOWACCOUNTS._serialized_end=1750
+  _COMPACTSWEEPCREDITS._serialized_start=1752
+  _COMPACTSWEEPCREDITS._serialized_end=1790
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,117 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from marketplace_processor.protobuf import rule_pb2
+
+
+# A bit for every RuleType, so the rule types present on an Asset or Offer
+# can be kept as a single integer.
+_RULE_BITS = {
+    rule_type: 1 << index
+    for index, rule_type in enumerate(sorted(rule_pb2.Rule.RuleType.values()))
+}
+
+# The rule types whose values are quantities.
+_INT_RULE_TYPES = frozenset([
+    rule_pb2.Rule.REQUIRE_SOURCE_QUANTITIES,
+    rule_pb2.Rule.REQUIRE_TARGET_QUANTITIES
+])
+
+
+class RuleSet(object):
+
+    def __init__(self, rules, owners=()):
+        """Compiles the rules of an Asset or Offer once, so that checking
+        for a rule does not scan the rules and rule values are not decoded
+        on every check.
+
+        Args:
+            rules (list of rule_pb2.Rule): The rules.
+            owners (list of str): The public keys of the owners of the Asset
+                or Offer.
+        """
+
+        self._mask = 0
+        self._values = {}
+        self._owners = frozenset(owners)
+
+        for rule in rules:
+            self._mask |= _RULE_BITS.get(rule.type, 0)
+            values = frozenset(rule_values(rule))
+            self._values[rule.type] = self._values[rule.type] & values \
+                if rule.type in self._values else values
+
+    def has(self, rule_type):
+        return bool(self._mask & _RULE_BITS.get(rule_type, 0))
+
+    def values(self, rule_type):
+        """The values common to every rule of the type.
+
+        Args:
+            rule_type (rule_pb2.Rule.RuleType): The type of rule.
+
+        Returns:
+            (frozenset of str or int): The values, ints for the rule types
+                that take quantities.
+        """
+
+        return self._values.get(rule_type, frozenset())
+
+    def accounts(self):
+        return self.values(rule_pb2.Rule.EXCHANGE_LIMITED_TO_ACCOUNTS)
+
+    def accounts_limited_to(self):
+        return self.has(rule_pb2.Rule.EXCHANGE_LIMITED_TO_ACCOUNTS)
+
+    def limited_to_allowlist(self):
+        return self.has(rule_pb2.Rule.EXCHANGE_LIMITED_TO_ALLOWLIST)
+
+    def exchange_once(self):
+        return self.has(rule_pb2.Rule.EXCHANGE_ONCE)
+
+    def exchange_once_per_account(self):
+        return self.has(rule_pb2.Rule.EXCHANGE_ONCE_PER_ACCOUNT)
+
+    def holding_is_infinite(self, account):
+        return self.has(rule_pb2.Rule.ALL_HOLDINGS_INFINITE) or \
+            self.has(rule_pb2.Rule.OWNER_HOLDINGS_INFINITE) and \
+            account in self._owners
+
+    def is_not_transferable(self, account):
+        return self.has(rule_pb2.Rule.NOT_TRANSFERABLE) and \
+            account not in self._owners
+
+
+def rule_values(rule):
+    """Returns the values of a rule, whether they are in its typed fields or,
+    for rules written before those, in its comma separated value.
+
+    Args:
+        rule (rule_pb2.Rule): The rule.
+
+    Returns:
+        list of str or int
+    """
+
+    if not rule.value:
+        if rule.type in _INT_RULE_TYPES:
+            return list(rule.int_values)
+        return list(rule.string_values)
+
+    values = str(rule.value, 'utf-8').split(',')
+    if rule.type in _INT_RULE_TYPES and all(
+            v.lstrip('-').isdigit() for v in values):
+        return [int(v) for v in values]
+    return values
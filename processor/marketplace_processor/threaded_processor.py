@@ -0,0 +1,83 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
+
+from sawtooth_sdk.processor.core import TransactionProcessor
+
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ThreadedTransactionProcessor(TransactionProcessor):
+
+    def __init__(self, url, max_workers):
+        """A TransactionProcessor that applies up to max_workers
+        transactions at once, each on its own thread. Applying a
+        transaction is mostly spent waiting on get_state and set_state
+        round trips to the validator, so threads overlap that waiting.
+
+        The handlers added must be safe to call from several threads.
+
+        Args:
+            url (str): The validator's endpoint.
+            max_workers (int): The number of transactions to apply at once.
+        """
+
+        super().__init__(url=url)
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        # Stop receiving once every worker is busy, so requests wait in the
+        # validator's queue rather than in ours.
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    @property
+    def max_occupancy(self):
+        """The number of transactions the validator may send at once."""
+
+        return self._max_workers
+
+    def _register_requests(self):
+        # Unless it is told otherwise, the validator sends a processor at
+        # most 10 transactions at a time, however many it could apply.
+        for request in super()._register_requests():
+            request.max_occupancy = self.max_occupancy
+            yield request
+
+    def _process(self, msg):
+        # Released by _process_done, once the transaction has been applied.
+        self._slots.acquire()  # pylint: disable=consider-using-with
+        try:
+            future = self._executor.submit(super()._process, msg)
+        except RuntimeError:
+            # The executor has been shut down by stop().
+            self._slots.release()
+            raise
+        future.add_done_callback(self._process_done)
+
+    def _process_done(self, future):
+        self._slots.release()
+        error = future.exception()
+        if error is not None:
+            LOGGER.error("Error processing transaction: %s", error)
+
+    def stop(self):
+        # Let the transactions in flight send their responses before the
+        # connection to the validator is closed.
+        self._executor.shutdown(wait=True)
+        super().stop()
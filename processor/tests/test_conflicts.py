@@ -0,0 +1,63 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.bench.conflicts import ConflictGraph
+
+
+ACCOUNT = '02' + '11' * 32
+
+
+class ConflictGraphTest(unittest.TestCase):
+    """A PruneOffer declares every receipt of its Offer by their prefix,
+    and an AcceptOffer declares the one receipt it writes.
+    """
+
+    def test_prune_after_accept(self):
+        graph = ConflictGraph()
+        self._accept(graph, 'offer')
+        self._prune(graph, 'offer')
+
+        self.assertEqual(graph.depths, [1, 2],
+                         "The prune waits on the accept's receipt.")
+        self.assertEqual(graph.edges, 1)
+
+    def test_accept_after_prune(self):
+        graph = ConflictGraph()
+        self._prune(graph, 'offer')
+        self._accept(graph, 'offer')
+
+        self.assertEqual(graph.depths, [1, 2],
+                         "The accept waits on the prune of its receipts.")
+
+    def test_other_offer(self):
+        graph = ConflictGraph()
+        self._accept(graph, 'offer')
+        self._prune(graph, 'other offer')
+
+        self.assertEqual(graph.depths, [1, 1],
+                         "Another Offer's receipts do not conflict.")
+        self.assertEqual(graph.edges, 0)
+
+    def _accept(self, graph, offer_id):
+        receipt = addresser.make_offer_account_address(offer_id, ACCOUNT)
+        graph.add('ACCEPT_OFFER', [receipt], [receipt])
+
+    def _prune(self, graph, offer_id):
+        receipts = addresser.make_offer_receipts_prefix(offer_id)
+        graph.add('PRUNE_OFFER', [receipts], [receipts])
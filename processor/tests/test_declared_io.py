@@ -0,0 +1,58 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from marketplace_processor.bench.main import run
+from marketplace_processor.bench.workload import make_transactions
+from marketplace_processor.protobuf.payload_pb2 import TransactionPayload
+
+
+class DeclaredIOTest(unittest.TestCase):
+    """Applies the benchmark workload, built with marketplace_transaction,
+    to the handler against in-memory state that rejects any use of an
+    address a transaction does not declare, as the validator does.
+    """
+
+    def test_declared_io(self):
+        self._assert_declared()
+
+    def test_declared_io_escrow_and_credit_shards(self):
+        self._assert_declared(escrow=True, credit_shards=4)
+
+    def test_declared_io_compact(self):
+        self._assert_declared(family_version='1.1')
+
+    def test_every_payload_type(self):
+        result = run(
+            make_transactions(accounts=3, accepts=2, credit_shards=4),
+            latency=0.0)
+
+        self.assertEqual(
+            set(result.latencies),
+            set(TransactionPayload.PayloadType.keys()) - {'TYPE_UNSET'},
+            "The workload has a transaction of every payload type.")
+
+    def _assert_declared(self, **kwargs):
+        result = run(
+            make_transactions(accounts=3, accepts=2, **kwargs),
+            latency=0.0)
+
+        self.assertEqual(
+            result.undeclared, {},
+            "Every address the handler uses is declared.")
+        self.assertEqual(
+            {k: v for k, v in result.invalid.items() if v}, {},
+            "The workload is valid end to end.")
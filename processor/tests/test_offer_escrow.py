@@ -0,0 +1,90 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.bench.context import InMemoryContext
+from marketplace_processor.handler import MarketplaceHandler
+from marketplace_processor.offer.offer_creation import MAX_ESCROW_QUANTITY
+from marketplace_processor.protobuf import payload_pb2
+from marketplace_processor.protobuf import rule_pb2
+
+
+PUBLIC_KEY = '02' + '11' * 32
+
+
+class EscrowInfiniteHoldingTest(unittest.TestCase):
+    """Escrows an Offer whose source Holding is infinite, so the escrowed
+    quantity is limited only by what an Offer can store.
+    """
+
+    def setUp(self):
+        self._handler = MarketplaceHandler()
+        self._context = InMemoryContext()
+
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_ACCOUNT,
+            create_account=payload_pb2.CreateAccount(label='account'))
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_ASSET,
+            create_asset=payload_pb2.CreateAsset(
+                name='asset',
+                rules=[rule_pb2.Rule(
+                    type=rule_pb2.Rule.ALL_HOLDINGS_INFINITE)]))
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_HOLDING,
+            create_holding=payload_pb2.CreateHolding(
+                id='holding', asset='asset'))
+
+    def test_escrow_out_of_range(self):
+        with self.assertRaises(InvalidTransaction):
+            self._create_offer(source_quantity=2, escrow_count=2 ** 62)
+
+        self.assertEqual(
+            self._context.get_state(
+                [addresser.make_offer_address('offer')]),
+            [],
+            "No Offer is created.")
+
+    def test_escrow_at_limit(self):
+        self._create_offer(source_quantity=1,
+                           escrow_count=MAX_ESCROW_QUANTITY)
+
+    def _create_offer(self, **kwargs):
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_OFFER,
+            create_offer=payload_pb2.CreateOffer(
+                id='offer', source='holding', **kwargs))
+
+    def _apply(self, payload_type, **kwargs):
+        payload = payload_pb2.TransactionPayload(
+            payload_type=payload_type,
+            **kwargs)
+        header = TransactionHeader(
+            signer_public_key=PUBLIC_KEY,
+            inputs=[addresser.NS, addresser.INDEX_NS],
+            outputs=[addresser.NS, addresser.INDEX_NS])
+
+        self._handler.apply(
+            TpProcessRequest(
+                header=header,
+                payload=payload.SerializeToString()),
+            self._context)
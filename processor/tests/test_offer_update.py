@@ -0,0 +1,125 @@
+# Copyright 2017 Intel Corporation
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# -----------------------------------------------------------------------------
+
+import unittest
+
+from sawtooth_sdk.processor.exceptions import InvalidTransaction
+from sawtooth_sdk.protobuf.block_info_pb2 import BlockInfoConfig
+from sawtooth_sdk.protobuf.processor_pb2 import TpProcessRequest
+from sawtooth_sdk.protobuf.transaction_pb2 import TransactionHeader
+
+from marketplace_addressing import addresser
+
+from marketplace_processor.bench.context import InMemoryContext
+from marketplace_processor.handler import MarketplaceHandler
+from marketplace_processor.protobuf import offer_pb2
+from marketplace_processor.protobuf import payload_pb2
+
+
+PUBLIC_KEY = '02' + '11' * 32
+
+
+class UpdateExpiredOfferTest(unittest.TestCase):
+    """Updates an Offer that expired at block 10, which is still OPEN in
+    state, at block 20.
+    """
+
+    def setUp(self):
+        self._handler = MarketplaceHandler()
+        self._context = InMemoryContext()
+
+        self._set_block_num(5)
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_ACCOUNT,
+            create_account=payload_pb2.CreateAccount(label='account'))
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_ASSET,
+            create_asset=payload_pb2.CreateAsset(name='asset'))
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_HOLDING,
+            create_holding=payload_pb2.CreateHolding(
+                id='holding', asset='asset', quantity=10))
+        self._apply(
+            payload_pb2.TransactionPayload.CREATE_OFFER,
+            create_offer=payload_pb2.CreateOffer(
+                id='offer',
+                source='holding',
+                source_quantity=1,
+                expires_at_block=10))
+        self._set_block_num(20)
+
+    def test_label_only(self):
+        with self.assertRaises(InvalidTransaction):
+            self._update(label='new')
+
+        self.assertEqual(self._offer().label, '',
+                         "An expired Offer is not updated.")
+
+    def test_reopen_without_expiry(self):
+        with self.assertRaises(InvalidTransaction):
+            self._update(reopen=True)
+
+    def test_new_expiry_without_reopen(self):
+        with self.assertRaises(InvalidTransaction):
+            self._update(expires_at_block=30)
+
+    def test_reopen_with_new_expiry(self):
+        self._update(reopen=True, expires_at_block=30)
+
+        offer = self._offer()
+        self.assertEqual(offer.status, offer_pb2.Offer.OPEN)
+        self.assertEqual(offer.expires_at_block, 30)
+
+    def test_reopen_with_clear_expiry(self):
+        self._update(reopen=True, clear_expiry=True)
+
+        offer = self._offer()
+        self.assertEqual(offer.status, offer_pb2.Offer.OPEN)
+        self.assertEqual(offer.expires_at_block, 0)
+
+    def _update(self, **kwargs):
+        self._apply(
+            payload_pb2.TransactionPayload.UPDATE_OFFER,
+            update_offer=payload_pb2.UpdateOffer(id='offer', **kwargs))
+
+    def _apply(self, payload_type, **kwargs):
+        payload = payload_pb2.TransactionPayload(
+            payload_type=payload_type,
+            **kwargs)
+        header = TransactionHeader(
+            signer_public_key=PUBLIC_KEY,
+            inputs=[addresser.NS, addresser.INDEX_NS],
+            outputs=[addresser.NS, addresser.INDEX_NS])
+
+        self._handler.apply(
+            TpProcessRequest(
+                header=header,
+                payload=payload.SerializeToString()),
+            self._context)
+
+    def _set_block_num(self, block_num):
+        # The block being applied is one past the latest in BlockInfo.
+        self._context.set_state({
+            addresser.BLOCK_INFO_CONFIG_ADDRESS: BlockInfoConfig(
+                latest_block=block_num - 1,
+                target_count=256).SerializeToString()
+        })
+
+    def _offer(self):
+        container = offer_pb2.OfferContainer()
+        container.ParseFromString(
+            self._context.get_state(
+                [addresser.make_offer_address('offer')])[0].data)
+        return container.entries[0]
@@ -27,6 +27,13 @@ from db import auth_query
 from marketplace_transaction.protobuf import rule_pb2
 
 
+# The rule types whose values are quantities.
+INT_RULE_TYPES = frozenset([
+    rule_pb2.Rule.REQUIRE_SOURCE_QUANTITIES,
+    rule_pb2.Rule.REQUIRE_TARGET_QUANTITIES
+])
+
+
 def validate_fields(required_fields, request_json):
     try:
         for field in required_fields:
@@ -85,14 +92,19 @@ def proto_wrap_rules(rules):
             except KeyError:
                 raise ApiBadRequest("Rule type is required")
             if rule.get('value') is not None:
-                rule_proto.value = value_to_csv(rule['value'])
+                set_rule_values(rule_proto, rule['value'])
             rule_protos.append(rule_proto)
     return rule_protos
 
 
-def value_to_csv(value):
-    if isinstance(value, (list, tuple)):
-        csv = ",".join(map(str, value))
-        return bytes(csv, 'utf-8')
-    else:
+def set_rule_values(rule_proto, value):
+    if not isinstance(value, (list, tuple)):
         raise ApiBadRequest("Rule value must be a JSON array")
+
+    if rule_proto.type in INT_RULE_TYPES:
+        try:
+            rule_proto.int_values.extend(int(v) for v in value)
+        except (TypeError, ValueError):
+            raise ApiBadRequest("Rule value must be an array of integers")
+    else:
+        rule_proto.string_values.extend(str(v) for v in value)
@@ -21,7 +21,11 @@ from sanic import response
 from api import common
 from api import messaging
 from api.authorization import authorized
+from api.errors import ApiBadRequest
 
+from db.common import fetch_holdings
+
+from marketplace_addressing import addresser
 from marketplace_transaction import transaction_creation
 
 
@@ -35,7 +39,7 @@ async def create_holding(request):
     required_fields = ['asset']
     common.validate_fields(required_fields, request.json)
 
-    holding = _create_holding_dict(request)
+    holding = _create_holding_dict(request.json)
     signer = await common.get_signer(request)
 
     batches, batch_id = transaction_creation.create_holding(
@@ -45,7 +49,8 @@ async def create_holding(request):
         label=holding.get('label'),
         description=holding.get('description'),
         asset=holding['asset'],
-        quantity=holding['quantity'])
+        quantity=holding['quantity'],
+        credit_shards=holding.get('creditShards', 0))
 
     await messaging.send(
         request.app.config.VAL_CONN,
@@ -57,14 +62,129 @@ async def create_holding(request):
     return response.json(holding)
 
 
-def _create_holding_dict(request):
-    keys = ['label', 'description', 'asset', 'quantity']
-    body = request.json
+@HOLDINGS_BP.post('holdings/bulk')
+@authorized()
+async def create_holdings(request):
+    """Creates several new Holdings for the authorized Account in one
+    transaction, all or nothing
+    """
+    common.validate_fields(['holdings'], request.json)
+    if not isinstance(request.json['holdings'], list) \
+            or not request.json['holdings']:
+        raise ApiBadRequest("holdings must be a non-empty list")
+
+    holdings = []
+    for body in request.json['holdings']:
+        common.validate_fields(['asset'], body)
+        holdings.append(_create_holding_dict(body))
+
+    signer = await common.get_signer(request)
+
+    batches, batch_id = transaction_creation.create_holdings(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        holdings=[(h['id'],
+                   h.get('label'),
+                   h.get('description'),
+                   h['asset'],
+                   h['quantity'],
+                   h.get('creditShards', 0)) for h in holdings])
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json(holdings)
+
+
+@HOLDINGS_BP.patch('holdings/<holding_id>/sweep')
+@authorized()
+async def sweep_credits(request, holding_id):
+    """Request by the owner of a Holding to add the credits waiting in its
+    credit shards to its quantity
+    """
+    holdings = await fetch_holdings([holding_id]).run(
+        request.app.config.DB_CONN)
+    if not holdings:
+        raise ApiBadRequest("No holding with the id {} exists".format(
+            holding_id))
+    if not holdings[0].get('creditShards'):
+        raise ApiBadRequest("Holding {} does not have credit shards".format(
+            holding_id))
+
+    signer = await common.get_signer(request)
+
+    batches, batch_id = transaction_creation.sweep_credits(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        identifier=holding_id,
+        credit_shards=holdings[0]['creditShards'])
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json('')
+
+
+@HOLDINGS_BP.patch('holdings/<holding_id>/transfer')
+@authorized()
+async def transfer(request, holding_id):
+    """Request by the owner of a Holding to move quantity from it to another
+    Holding of the same Asset
+    """
+    common.validate_fields(['target', 'quantity'], request.json)
+    if not isinstance(request.json['quantity'], int) \
+            or request.json['quantity'] < 1:
+        raise ApiBadRequest("quantity must be a positive integer")
+
+    holdings = await fetch_holdings(
+        [holding_id, request.json['target']]).run(request.app.config.DB_CONN)
+    holdings = {h['id']: h for h in holdings}
+    for identifier in (holding_id, request.json['target']):
+        if identifier not in holdings:
+            raise ApiBadRequest("No holding with the id {} exists".format(
+                identifier))
+
+    signer = await common.get_signer(request)
+
+    batches, batch_id = transaction_creation.transfer(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        source=holding_id,
+        target=request.json['target'],
+        asset=holdings[holding_id]['asset'],
+        quantity=request.json['quantity'],
+        target_credit_shards=holdings[request.json['target']].get(
+            'creditShards', 0))
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json('')
+
+
+def _create_holding_dict(body):
+    keys = ['label', 'description', 'asset', 'quantity', 'creditShards']
 
     holding = {k: body[k] for k in keys if body.get(k) is not None}
 
     if holding.get('quantity') is None:
         holding['quantity'] = 0
+    if not 0 <= holding.get('creditShards', 0) <= \
+            addresser.MAX_CREDIT_SHARDS:
+        raise ApiBadRequest("creditShards must be between 0 and {}".format(
+            addresser.MAX_CREDIT_SHARDS))
 
     holding['id'] = str(uuid4())
 
@@ -58,7 +58,9 @@ async def create_offer(request):
         description=offer.get('description'),
         source=source,
         target=target,
-        rules=offer.get('rules'))
+        rules=offer.get('rules'),
+        escrow_count=offer.get('escrowCount', 0),
+        expires_at_block=offer.get('expiresAtBlock', 0))
 
     await messaging.send(
         request.app.config.VAL_CONN,
@@ -69,6 +71,9 @@ async def create_offer(request):
 
     if offer.get('rules'):
         offer['rules'] = request.json['rules']
+    if offer.get('escrowCount'):
+        offer['escrowQuantity'] = \
+            offer.pop('escrowCount') * offer['sourceQuantity']
 
     return response.json(offer)
 
@@ -93,6 +98,35 @@ async def get_offer(request, offer_id):
     return response.json(offer_resource)
 
 
+@OFFERS_BP.patch('offers/<offer_id>')
+@authorized()
+async def update_offer(request, offer_id):
+    """Request by owner of Offer to change it in place"""
+    update = _update_offer_dict(request.json)
+
+    signer = await common.get_signer(request)
+    batches, batch_id = transaction_creation.update_offer(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        identifier=offer_id,
+        label=update.get('label', ''),
+        description=update.get('description', ''),
+        source_quantity=update.get('sourceQuantity', 0),
+        target_quantity=update.get('targetQuantity', 0),
+        expires_at_block=update.get('expiresAtBlock', 0),
+        reopen=update.get('status') == 'OPEN',
+        clear_expiry=update.get('clearExpiry', False))
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json('')
+
+
 @OFFERS_BP.patch('offers/<offer_id>/accept')
 @authorized()
 async def accept_offer(request, offer_id):
@@ -116,7 +150,84 @@ async def accept_offer(request, offer_id):
         identifier=offer_id,
         offerer=offerer,
         receiver=receiver,
-        count=request.json['count'])
+        count=request.json['count'],
+        rules=common.proto_wrap_rules(offer.get('rules')),
+        expires_at_block=offer.get('expiresAtBlock', 0))
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json('')
+
+
+@OFFERS_BP.patch('offers/accept')
+@authorized()
+async def accept_offers(request):
+    """Request for authorized Account to accept several Offers in one
+    transaction, all or nothing
+    """
+    common.validate_fields(['offers'], request.json)
+    if not isinstance(request.json['offers'], list) \
+            or not request.json['offers']:
+        raise ApiBadRequest("offers must be a non-empty list")
+
+    acceptances = []
+    for body in request.json['offers']:
+        common.validate_fields(['id', 'count', 'target'], body)
+
+        offer = await offers_query.fetch_offer_resource(
+            request.app.config.DB_CONN, body['id'])
+
+        offer_holdings = await _create_holdings_dict(
+            request.app.config.DB_CONN, offer)
+
+        offerer, receiver = _create_offer_participants(
+            body, offer, offer_holdings)
+
+        acceptances.append((body['id'],
+                            offerer,
+                            receiver,
+                            body['count'],
+                            common.proto_wrap_rules(offer.get('rules')),
+                            offer.get('expiresAtBlock', 0)))
+
+    signer = await common.get_signer(request)
+    batches, batch_id = transaction_creation.accept_offers(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        acceptances=acceptances)
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json('')
+
+
+@OFFERS_BP.patch('offers/<offer_id>/allow')
+@authorized()
+async def allow_accounts(request, offer_id):
+    """Request by owner of an Offer with the EXCHANGE_LIMITED_TO_ALLOWLIST
+    rule to add accounts to its allowlist
+    """
+    common.validate_fields(['accounts'], request.json)
+    if not isinstance(request.json['accounts'], list) \
+            or not request.json['accounts']:
+        raise ApiBadRequest("accounts must be a non-empty list")
+
+    signer = await common.get_signer(request)
+    batches, batch_id = transaction_creation.allow_accounts(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        offer_id=offer_id,
+        accounts=request.json['accounts'])
 
     await messaging.send(
         request.app.config.VAL_CONN,
@@ -132,11 +243,58 @@ async def accept_offer(request, offer_id):
 @authorized()
 async def close_offer(request, offer_id):
     """Request by owner of Offer to close it"""
+    offer = await offers_query.fetch_offer_resource(
+        request.app.config.DB_CONN, offer_id)
+
+    # Closing an escrowed Offer returns the escrow to its source Holding.
+    source = None
+    if 'escrowQuantity' in offer:
+        offer_holdings = await _create_holdings_dict(
+            request.app.config.DB_CONN, offer)
+        source, _ = _create_marketplace_holdings(offer, offer_holdings)
+
     signer = await common.get_signer(request)
     batches, batch_id = transaction_creation.close_offer(
         txn_key=signer,
         batch_key=request.app.config.SIGNER,
-        identifier=offer_id)
+        identifier=offer_id,
+        source=source)
+
+    await messaging.send(
+        request.app.config.VAL_CONN,
+        request.app.config.TIMEOUT,
+        batches)
+
+    await messaging.check_batch_status(request.app.config.VAL_CONN, batch_id)
+
+    return response.json('')
+
+
+@OFFERS_BP.patch('offers/<offer_id>/prune')
+@authorized()
+async def prune_offer(request, offer_id):
+    """Request by owner of a closed Offer to delete it and its receipts from
+    state. Its history stays in the database.
+    """
+    offer = await offers_query.fetch_offer_resource(
+        request.app.config.DB_CONN, offer_id)
+    if offer['status'] != 'CLOSED':
+        raise ApiBadRequest("Offer {} must be closed to be pruned".format(
+            offer_id))
+    if offer.get('escrowQuantity'):
+        raise ApiBadRequest(
+            "Offer {} holds {} in escrow, close it to return the escrow "
+            "before pruning".format(offer_id, offer['escrowQuantity']))
+
+    allowlist_accounts = await offers_query.fetch_allowlist_accounts(
+        request.app.config.DB_CONN, offer_id)
+
+    signer = await common.get_signer(request)
+    batches, batch_id = transaction_creation.prune_offer(
+        txn_key=signer,
+        batch_key=request.app.config.SIGNER,
+        identifier=offer_id,
+        allowlist_accounts=allowlist_accounts)
 
     await messaging.send(
         request.app.config.VAL_CONN,
@@ -173,11 +331,14 @@ def _create_offer_participants(body, offer, offer_holdings):
     else:
         output_asset = None
 
+    # An escrowed Offer pays out of the Offer, not its source Holding.
     offerer = transaction_creation.OfferParticipant(
-        source=offer['source'],
+        source=None if 'escrowQuantity' in offer else offer['source'],
         target=offer.get('target'),
         source_asset=input_asset,
-        target_asset=output_asset)
+        target_asset=output_asset,
+        target_credit_shards=offer_holdings.get('target', {}).get(
+            'creditShards', 0))
 
     receiver = transaction_creation.OfferParticipant(
         source=body.get('source'),
@@ -203,7 +364,8 @@ async def _create_holdings_dict(conn, holding_ids):
 
 def _create_offer_dict(body, public_key):
     keys = ['label', 'description', 'source', 'target',
-            'sourceQuantity', 'targetQuantity']
+            'sourceQuantity', 'targetQuantity', 'escrowCount',
+            'expiresAtBlock']
 
     offer = {k: body[k] for k in keys if body.get(k) is not None}
 
@@ -211,6 +373,10 @@ def _create_offer_dict(body, public_key):
         raise ApiBadRequest("sourceQuantity must be a positive integer")
     if offer.get('targetQuantity') and offer['targetQuantity'] < 1:
         raise ApiBadRequest("targetQuantity must be a positive integer")
+    if offer.get('escrowCount') and offer['escrowCount'] < 0:
+        raise ApiBadRequest("escrowCount must be a positive integer")
+    if offer.get('expiresAtBlock') and offer['expiresAtBlock'] < 1:
+        raise ApiBadRequest("expiresAtBlock must be a positive integer")
 
     offer['id'] = str(uuid4())
     offer['owners'] = [public_key]
@@ -220,3 +386,28 @@ def _create_offer_dict(body, public_key):
         offer['rules'] = common.proto_wrap_rules(body['rules'])
 
     return offer
+
+
+def _update_offer_dict(body):
+    keys = ['label', 'description', 'sourceQuantity', 'targetQuantity',
+            'expiresAtBlock', 'status']
+
+    update = {k: body[k] for k in keys if body and body.get(k) is not None}
+    if body and body.get('clearExpiry'):
+        update['clearExpiry'] = True
+
+    if not update:
+        raise ApiBadRequest(
+            "At least one of {} must be given".format(
+                ", ".join(keys + ['clearExpiry'])))
+    if 'expiresAtBlock' in update and 'clearExpiry' in update:
+        raise ApiBadRequest(
+            "expiresAtBlock and clearExpiry cannot both be given")
+    for key in ['sourceQuantity', 'targetQuantity', 'expiresAtBlock']:
+        if key in update and update[key] < 1:
+            raise ApiBadRequest("{} must be a positive integer".format(key))
+    if update.get('status', 'OPEN') != 'OPEN':
+        raise ApiBadRequest(
+            "status can only be set to OPEN, use close to close an Offer")
+
+    return update
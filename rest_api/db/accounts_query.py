@@ -18,6 +18,7 @@ from rethinkdb.errors import ReqlNonExistenceError
 
 from api.errors import ApiBadRequest
 
+from db.common import fetch_account_holding_ids
 from db.common import fetch_holdings
 from db.common import fetch_latest_block_num
 
@@ -29,7 +30,8 @@ async def fetch_all_account_resources(conn):
         .map(lambda account: account.merge(
             {'publicKey': account['public_key']}))\
         .map(lambda account: account.merge(
-            {'holdings': fetch_holdings(account['holdings'])}))\
+            {'holdings': fetch_holdings(account['holdings'].set_union(
+                fetch_account_holding_ids(account['public_key'])))}))\
         .map(lambda account: (account['label'] == "").branch(
             account.without('label'), account))\
         .map(lambda account: (account['description'] == "").branch(
@@ -45,7 +47,8 @@ async def fetch_account_resource(conn, public_key, auth_key):
             .get_all(public_key, index='public_key')\
             .max('start_block_num')\
             .merge({'publicKey': r.row['public_key']})\
-            .merge({'holdings': fetch_holdings(r.row['holdings'])})\
+            .merge({'holdings': fetch_holdings(r.row['holdings'].set_union(
+                fetch_account_holding_ids(public_key)))})\
             .do(lambda account: (r.expr(auth_key).eq(public_key)).branch(
                 account.merge(_fetch_email(public_key)), account))\
             .do(lambda account: (account['label'] == "").branch(
@@ -43,20 +43,60 @@ def fetch_holdings(holding_ids):
             holding.without('label'), holding))\
         .map(lambda holding: (holding['description'] == "").branch(
             holding.without('description'), holding))\
-        .without('start_block_num', 'end_block_num', 'delta_id', 'account')\
+        .map(lambda holding: (
+            holding['credit_shards'].default(0) == 0).branch(
+                holding,
+                holding.merge({
+                    'creditShards': holding['credit_shards'],
+                    'quantity': (holding['quantity'] +
+                                 fetch_holding_credits(holding['id']))})))\
+        .without('start_block_num', 'end_block_num', 'delta_id', 'account',
+                 'credit_shards')\
+        .coerce_to('array')
+
+
+def fetch_holding_credits(holding_id):
+    """Returns the total of the credits waiting in the Holding's credit
+    shards, which count towards its quantity here before they are swept.
+    """
+    return r.table('holding_credits')\
+        .get_all(holding_id, index='holding')\
+        .filter(lambda credit: (
+            fetch_latest_block_num() >= credit['start_block_num'])
+                & (fetch_latest_block_num() < credit['end_block_num']))\
+        .sum('quantity')
+
+
+def fetch_account_holding_ids(public_key):
+    """Returns the ids of the Holdings recorded as belonging to the Account
+    in account_holdings. Older Holdings are listed in the Account's own
+    holdings field instead.
+    """
+    return r.table('account_holdings')\
+        .get_all(public_key, index='account')\
+        .filter(lambda account_holding: (
+            fetch_latest_block_num() >= account_holding['start_block_num'])
+                & (fetch_latest_block_num() <
+                   account_holding['end_block_num']))\
+        .get_field('holding')\
         .coerce_to('array')
 
 
 def parse_rules(rules):
+    """Ledger sync stores rule values as arrays. Rules synced before it did
+    still hold them comma separated in bytes, and are split here.
+    """
     return r.expr(
         {
             'rules': rules.map(lambda rule: (
-                rule['value'] == bytes('', 'utf-8')).branch(
-                    rule.without('value'),
-                    rule.merge(
-                        {
-                            'value': _value_to_array(rule)
-                        })))
+                rule['value'].default([]).type_of() == 'ARRAY').branch(
+                    rule,
+                    (rule['value'] == bytes('', 'utf-8')).branch(
+                        rule.without('value'),
+                        rule.merge(
+                            {
+                                'value': _value_to_array(rule)
+                            }))))
         })
 
 
@@ -26,6 +26,7 @@ async def fetch_all_offer_resources(conn, query_params):
     return await r.table('offers')\
         .filter((fetch_latest_block_num() >= r.row['start_block_num'])
                 & (fetch_latest_block_num() < r.row['end_block_num']))\
+        .map(_close_if_expired)\
         .filter(query_params)\
         .map(lambda offer: (offer['label'] == "").branch(
             offer.without('label'), offer))\
@@ -40,8 +41,16 @@ async def fetch_all_offer_resources(conn, query_params):
             offer.merge({'targetQuantity': offer['target_quantity']})))\
         .map(lambda offer: (offer['rules'] == []).branch(
             offer, offer.merge(parse_rules(offer['rules']))))\
+        .map(lambda offer: offer['escrow'].default(False).branch(
+            offer.merge({'escrowQuantity': offer['escrow_quantity']}),
+            offer))\
+        .map(lambda offer: (offer['expires_at_block'].default(0) == 0).branch(
+            offer,
+            offer.merge({'expiresAtBlock': offer['expires_at_block']})))\
         .without('delta_id', 'start_block_num', 'end_block_num',
-                 'source_quantity', 'target_quantity')\
+                 'source_quantity', 'target_quantity', 'escrow',
+                 'escrow_quantity', 'source_asset', 'expires_at_block',
+                 'address')\
         .coerce_to('array').run(conn)
 
 
@@ -50,6 +59,7 @@ async def fetch_offer_resource(conn, offer_id):
         return await r.table('offers')\
             .get_all(offer_id, index='id')\
             .max('start_block_num')\
+            .do(_close_if_expired)\
             .do(lambda offer: (offer['label'] == "").branch(
                 offer.without('label'), offer))\
             .do(lambda offer: (offer['description'] == "").branch(
@@ -62,8 +72,38 @@ async def fetch_offer_resource(conn, offer_id):
                 offer.merge({'targetQuantity': offer['target_quantity']})))\
             .do(lambda offer: (offer['rules'] == []).branch(
                 offer, offer.merge(parse_rules(offer['rules']))))\
+            .do(lambda offer: offer['escrow'].default(False).branch(
+                offer.merge({'escrowQuantity': offer['escrow_quantity']}),
+                offer))\
+            .do(lambda offer: (
+                offer['expires_at_block'].default(0) == 0).branch(
+                    offer,
+                    offer.merge(
+                        {'expiresAtBlock': offer['expires_at_block']})))\
             .without('delta_id', 'start_block_num', 'end_block_num',
-                     'source_quantity', 'target_quantity')\
+                     'source_quantity', 'target_quantity', 'escrow',
+                     'escrow_quantity', 'source_asset', 'expires_at_block',
+                     'address')\
             .run(conn)
     except ReqlNonExistenceError:
         raise ApiBadRequest("No offer with the id {} exists".format(offer_id))
+
+
+def _close_if_expired(offer):
+    """Reports an Offer as CLOSED once the last block it can be accepted in
+    is committed, whether or not the ledger sync has recorded it closed.
+    """
+    expires_at_block = offer['expires_at_block'].default(0)
+    return ((expires_at_block > 0)
+            & (expires_at_block <= fetch_latest_block_num())).branch(
+                offer.merge({'status': 'CLOSED'}), offer)
+
+
+async def fetch_allowlist_accounts(conn, offer_id):
+    return await r.table('offer_allowlists')\
+        .between([offer_id, r.minval], [offer_id, r.maxval],
+                 index='offer_account')\
+        .filter((fetch_latest_block_num() >= r.row['start_block_num'])
+                & (fetch_latest_block_num() < r.row['end_block_num']))\
+        .get_field('account')\
+        .coerce_to('array').run(conn)
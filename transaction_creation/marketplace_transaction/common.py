@@ -20,6 +20,13 @@ from sawtooth_rest_api.protobuf import batch_pb2
 from sawtooth_rest_api.protobuf import transaction_pb2
 
 from marketplace_addressing import addresser
+from marketplace_addressing import identifiers
+
+from marketplace_transaction.protobuf import compact_payload_pb2
+
+
+# The family_version of the payloads built unless another is asked for.
+FAMILY_VERSION = '1.0'
 
 
 def wrap_payload_in_txn_batch(txn_key, payload, header, batch_key):
@@ -53,7 +60,15 @@ def wrap_payload_in_txn_batch(txn_key, payload, header, batch_key):
     return [batch], batch.header_signature
 
 
-def make_header_and_batch(payload, inputs, outputs, txn_key, batch_key):
+def make_header_and_batch(payload,
+                          inputs,
+                          outputs,
+                          txn_key,
+                          batch_key,
+                          family_version=FAMILY_VERSION):
+
+    if family_version == identifiers.COMPACT_FAMILY_VERSION:
+        payload = compact_payload(payload)
 
     header = make_header(
         inputs=inputs,
@@ -61,7 +76,8 @@ def make_header_and_batch(payload, inputs, outputs, txn_key, batch_key):
         payload_sha512=hashlib.sha512(
             payload.SerializeToString()).hexdigest(),
         signer_pubkey=txn_key.get_public_key().as_hex(),
-        batcher_pubkey=batch_key.get_public_key().as_hex())
+        batcher_pubkey=batch_key.get_public_key().as_hex(),
+        family_version=family_version)
 
     return wrap_payload_in_txn_batch(
         txn_key=txn_key,
@@ -74,15 +90,63 @@ def make_header(inputs,
                 outputs,
                 payload_sha512,
                 signer_pubkey,
-                batcher_pubkey):
+                batcher_pubkey,
+                family_version=FAMILY_VERSION):
     header = transaction_pb2.TransactionHeader(
         inputs=inputs,
         outputs=outputs,
         batcher_public_key=batcher_pubkey,
         dependencies=[],
         family_name=addresser.FAMILY_NAME,
-        family_version='1.0',
+        family_version=family_version,
         nonce=uuid4().hex,
         signer_public_key=signer_pubkey,
         payload_sha512=payload_sha512)
     return header
+
+
+def compact_payload(payload):
+    """Returns the family_version 1.1 encoding of a TransactionPayload.
+
+    Args:
+        payload (payload_pb2.TransactionPayload): The payload.
+
+    Raises:
+        ValueError: An id in the payload is neither a canonical UUID nor a
+            public key, so the payload can only be sent as 1.0.
+
+    Returns:
+        compact_payload_pb2.CompactTransactionPayload
+    """
+
+    compact = compact_payload_pb2.CompactTransactionPayload()
+    _compact(payload, compact)
+    return compact
+
+
+def _compact(message, compact):
+    if message.DESCRIPTOR is compact.DESCRIPTOR:
+        compact.CopyFrom(message)
+        return
+
+    for field, value in message.ListFields():
+        target = compact.DESCRIPTOR.fields_by_name[field.name]
+        repeated = field.label == field.LABEL_REPEATED
+
+        if field.type == field.TYPE_MESSAGE:
+            if repeated:
+                for entry in value:
+                    _compact(entry, getattr(compact, field.name).add())
+            else:
+                _compact(value, getattr(compact, field.name))
+        elif field.type == field.TYPE_STRING and \
+                target.type == target.TYPE_BYTES:
+            if repeated:
+                getattr(compact, field.name).extend(
+                    identifiers.compact_id(v) for v in value)
+            else:
+                setattr(compact, field.name, identifiers.compact_id(value))
+        elif repeated:
+            getattr(compact, field.name).extend(value)
+        else:
+            setattr(compact, field.name, value)
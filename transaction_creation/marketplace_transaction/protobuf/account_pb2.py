@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_transaction/protobuf/account.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n.marketplace_transaction/protobuf/account.proto\"S\n\x07\x41\x63\x63ount\x12\x12\n\npublic_key\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x10\n\x08holdings\x18\x04 \x03(\t\"-\n\x10\x41\x63\x63ountContainer\x12\x19\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x08.Account\"2\n\x0e\x41\x63\x63ountHolding\x12\x0f\n\x07\x61\x63\x63ount\x18\x01 \x01(\t\x12\x0f\n\x07holding\x18\x02 \x01(\t\";\n\x17\x41\x63\x63ountHoldingContainer\x12 \n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x0f.AccountHoldingb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_transaction.protobuf.account_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _ACCOUNT._serialized_start=50
+  _ACCOUNT._serialized_end=133
+  _ACCOUNTCONTAINER._serialized_start=135
+  _ACCOUNTCONTAINER._serialized_end=180
+  _ACCOUNTHOLDING._serialized_start=182
+  _ACCOUNTHOLDING._serialized_end=232
+  _ACCOUNTHOLDINGCONTAINER._serialized_start=234
+  _ACCOUNTHOLDINGCONTAINER._serialized_end=293
+# @@protoc_insertion_point(module_scope)
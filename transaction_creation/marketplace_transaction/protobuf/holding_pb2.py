@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_transaction/protobuf/holding.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n.marketplace_transaction/protobuf/holding.proto\"\x82\x01\n\x07Holding\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0f\n\x07\x61\x63\x63ount\x18\x04 \x01(\t\x12\r\n\x05\x61sset\x18\x05 \x01(\t\x12\x10\n\x08quantity\x18\x06 \x01(\x12\x12\x15\n\rcredit_shards\x18\x07 \x01(\r\"-\n\x10HoldingContainer\x12\x19\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x08.Holding\"A\n\rHoldingCredit\x12\x0f\n\x07holding\x18\x01 \x01(\t\x12\r\n\x05shard\x18\x02 \x01(\r\x12\x10\n\x08quantity\x18\x03 \x01(\x12\"9\n\x16HoldingCreditContainer\x12\x1f\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x0e.HoldingCreditb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_transaction.protobuf.holding_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _HOLDING._serialized_start=51
+  _HOLDING._serialized_end=181
+  _HOLDINGCONTAINER._serialized_start=183
+  _HOLDINGCONTAINER._serialized_end=228
+  _HOLDINGCREDIT._serialized_start=230
+  _HOLDINGCREDIT._serialized_end=295
+  _HOLDINGCREDITCONTAINER._serialized_start=297
+  _HOLDINGCREDITCONTAINER._serialized_end=354
+# @@protoc_insertion_point(module_scope)
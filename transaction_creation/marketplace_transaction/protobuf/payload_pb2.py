@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_transaction/protobuf/payload.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from marketplace_transaction.protobuf import rule_pb2 as marketplace__transaction_dot_protobuf_dot_rule__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n.marketplace_transaction/protobuf/payload.proto\x1a+marketplace_transaction/protobuf/rule.proto\"\xb9\x06\n\x12TransactionPayload\x12\x35\n\x0cpayload_type\x18\x01 \x01(\x0e\x32\x1f.TransactionPayload.PayloadType\x12&\n\x0e\x63reate_account\x18\x02 \x01(\x0b\x32\x0e.CreateAccount\x12\"\n\x0c\x63reate_asset\x18\x03 \x01(\x0b\x32\x0c.CreateAsset\x12&\n\x0e\x63reate_holding\x18\x04 \x01(\x0b\x32\x0e.CreateHolding\x12\"\n\x0c\x63reate_offer\x18\x05 \x01(\x0b\x32\x0c.CreateOffer\x12\"\n\x0c\x61\x63\x63\x65pt_offer\x18\n \x01(\x0b\x32\x0c.AcceptOffer\x12 \n\x0b\x63lose_offer\x18\x0b \x01(\x0b\x32\x0b.CloseOffer\x12$\n\raccept_offers\x18\x0c \x01(\x0b\x32\r.AcceptOffers\x12(\n\x0f\x63reate_holdings\x18\r \x01(\x0b\x32\x0f.CreateHoldings\x12$\n\rsweep_credits\x18\x0e \x01(\x0b\x32\r.SweepCredits\x12&\n\x0e\x61llow_accounts\x18\x0f \x01(\x0b\x32\x0e.AllowAccounts\x12\"\n\x0cupdate_offer\x18\x10 \x01(\x0b\x32\x0c.UpdateOffer\x12\x1b\n\x08transfer\x18\x11 \x01(\x0b\x32\t.Transfer\x12 \n\x0bprune_offer\x18\x12 \x01(\x0b\x32\x0b.PruneOffer\"\x8c\x02\n\x0bPayloadType\x12\x0e\n\nTYPE_UNSET\x10\x00\x12\x12\n\x0e\x43REATE_ACCOUNT\x10\x02\x12\x10\n\x0c\x43REATE_ASSET\x10\x03\x12\x12\n\x0e\x43REATE_HOLDING\x10\x04\x12\x10\n\x0c\x43REATE_OFFER\x10\x05\x12\x10\n\x0c\x41\x43\x43\x45PT_OFFER\x10\n\x12\x0f\n\x0b\x43LOSE_OFFER\x10\x0b\x12\x11\n\rACCEPT_OFFERS\x10\x0c\x12\x13\n\x0f\x43REATE_HOLDINGS\x10\r\x12\x11\n\rSWEEP_CREDITS\x10\x0e\x12\x12\n\x0e\x41LLOW_ACCOUNTS\x10\x0f\x12\x10\n\x0cUPDATE_OFFER\x10\x10\x12\x0c\n\x08TRANSFER\x10\x11\x12\x0f\n\x0bPRUNE_OFFER\x10\x12\"3\n\rCreateAccount\x12\r\n\x05label\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\"F\n\x0b\x43reateAsset\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\x14\n\x05rules\x18\x03 \x03(\x0b\x32\x05.Rule\"w\n\rCreateHolding\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\r\n\x05\x61sset\x18\x04 \x01(\t\x12\x10\n\x08quantity\x18\x05 \x01(\x12\x12\x15\n\rcredit_shards\x18\x06 \x01(\r\"1\n\x0e\x43reateHoldings\x12\x1f\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x0e.CreateHolding\"<\n\x08Transfer\x12\x0e\n\x06source\x18\x01 \x01(\t\x12\x0e\n\x06target\x18\x02 \x01(\t\x12\x10\n\x08quantity\x18\x03 \x01(\x04\"\xd5\x01\n\x0b\x43reateOffer\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x0e\n\x06source\x18\x04 \x01(\t\x12\x17\n\x0fsource_quantity\x18\x05 \x01(\x12\x12\x0e\n\x06target\x18\x06 \x01(\t\x12\x17\n\x0ftarget_quantity\x18\x07 \x01(\x12\x12\x14\n\x05rules\x18\x08 \x03(\x0b\x32\x05.Rule\x12\x14\n\x0c\x65scrow_count\x18\t \x01(\x04\x12\x18\n\x10\x65xpires_at_block\x18\n \x01(\x04\"H\n\x0b\x41\x63\x63\x65ptOffer\x12\n\n\x02id\x18\x01 \x01(\t\x12\x0e\n\x06source\x18\x02 \x01(\t\x12\x0e\n\x06target\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x04\"-\n\x0c\x41\x63\x63\x65ptOffers\x12\x1d\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x0c.AcceptOffer\"\x18\n\nCloseOffer\x12\n\n\x02id\x18\x01 \x01(\t\"4\n\nPruneOffer\x12\n\n\x02id\x18\x01 \x01(\t\x12\x1a\n\x12\x61llowlist_accounts\x18\x02 \x03(\t\"\xaf\x01\n\x0bUpdateOffer\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05label\x18\x02 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x03 \x01(\t\x12\x17\n\x0fsource_quantity\x18\x04 \x01(\x12\x12\x17\n\x0ftarget_quantity\x18\x05 \x01(\x12\x12\x18\n\x10\x65xpires_at_block\x18\x06 \x01(\x04\x12\x0e\n\x06reopen\x18\x07 \x01(\x08\x12\x14\n\x0c\x63lear_expiry\x18\x08 \x01(\x08\"3\n\rAllowAccounts\x12\x10\n\x08offer_id\x18\x01 \x01(\t\x12\x10\n\x08\x61\x63\x63ounts\x18\x02 \x03(\t\"\x1f\n\x0cSweepCredits\x12\x0f\n\x07holding\x18\x01 \x01(\tb\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_transaction.protobuf.payload_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _TRANSACTIONPAYLOAD._serialized_start=96
+  _TRANSACTIONPAYLOAD._serialized_end=921
+  _TRANSACTIONPAYLOAD_PAYLOADTYPE._serialized_start=653
+  _TRANSACTIONPAYLOAD_PAYLOADTYPE._serialized_end=921
+  _CREATEACCOUNT._serialized_start=923
+  _CREATEACCOUNT._serialized_end=974
+  _CREATEASSET._serialized_start=976
+  _CREATEASSET._serialized_end=1046
+  _CREATEHOLDING._serialized_start=1048
+  _CREATEHOLDING._serialized_end=1167
+  _CREATEHOLDINGS._serialized_start=1169
+  _CREATEHOLDINGS._serialized_end=1218
+  _TRANSFER._serialized_start=1220
+  _TRANSFER._serialized_end=1280
+  _CREATEOFFER._serialized_start=1283
+  _CREATEOFFER._serialized_end=1496
+  _ACCEPTOFFER._serialized_start=1498
+  _ACCEPTOFFER._serialized_end=1570
+  _ACCEPTOFFERS._serialized_start=1572
+  _ACCEPTOFFERS._serialized_end=1617
+  _CLOSEOFFER._serialized_start=1619
+  _CLOSEOFFER._serialized_end=1643
+  _PRUNEOFFER._serialized_start=1645
+  _PRUNEOFFER._serialized_end=1697
+  _UPDATEOFFER._serialized_start=1700
+  _UPDATEOFFER._serialized_end=1875
+  _ALLOWACCOUNTS._serialized_start=1877
+  _ALLOWACCOUNTS._serialized_end=1928
+  _SWEEPCREDITS._serialized_start=1930
+  _SWEEPCREDITS._serialized_end=1961
+# @@protoc_insertion_point(module_scope)
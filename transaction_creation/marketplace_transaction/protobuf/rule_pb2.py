@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: marketplace_transaction/protobuf/rule.proto
+"""Generated protocol buffer code."""
+from google.protobuf.internal import builder as _builder
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n+marketplace_transaction/protobuf/rule.proto\"\xb6\x03\n\x04Rule\x12\x1c\n\x04type\x18\x01 \x01(\x0e\x32\x0e.Rule.RuleType\x12\r\n\x05value\x18\x02 \x01(\x0c\x12\x15\n\rstring_values\x18\x03 \x03(\t\x12\x12\n\nint_values\x18\x04 \x03(\x12\"\xd5\x02\n\x08RuleType\x12\x0e\n\nRULE_UNSET\x10\x00\x12\x1b\n\x17OWNER_HOLDINGS_INFINITE\x10\x64\x12\x19\n\x15\x41LL_HOLDINGS_INFINITE\x10\x65\x12\x14\n\x10NOT_TRANSFERABLE\x10\x66\x12\x18\n\x14REQUIRE_SOURCE_TYPES\x10g\x12\x18\n\x14REQUIRE_TARGET_TYPES\x10h\x12\x1d\n\x19REQUIRE_SOURCE_QUANTITIES\x10i\x12\x1d\n\x19REQUIRE_TARGET_QUANTITIES\x10j\x12\x12\n\rEXCHANGE_ONCE\x10\xc8\x01\x12\x1e\n\x19\x45XCHANGE_ONCE_PER_ACCOUNT\x10\xc9\x01\x12!\n\x1c\x45XCHANGE_LIMITED_TO_ACCOUNTS\x10\xca\x01\x12\"\n\x1d\x45XCHANGE_LIMITED_TO_ALLOWLIST\x10\xcb\x01\x62\x06proto3')
+
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, globals())
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'marketplace_transaction.protobuf.rule_pb2', globals())
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _RULE._serialized_start=48
+  _RULE._serialized_end=486
+  _RULE_RULETYPE._serialized_start=145
+  _RULE_RULETYPE._serialized_end=486
+# @@protoc_insertion_point(module_scope)
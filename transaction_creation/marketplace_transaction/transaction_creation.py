@@ -15,11 +15,17 @@
 
 from marketplace_addressing import addresser
 
+from marketplace_transaction.common import FAMILY_VERSION
 from marketplace_transaction.common import make_header_and_batch
 from marketplace_transaction.protobuf import payload_pb2
+from marketplace_transaction.protobuf import rule_pb2
 
 
-def create_account(txn_key, batch_key, label, description):
+def create_account(txn_key,
+                   batch_key,
+                   label,
+                   description,
+                   family_version=FAMILY_VERSION):
     """Create a CreateAccount txn and wrap it in a batch and list.
 
     Args:
@@ -27,6 +33,7 @@ def create_account(txn_key, batch_key, label, description):
         batch_key (sawtooth_signing.Signer): The Batch signer key pair.
         label (str): The account's label.
         description (str): The description of the account.
+        family_version (str): The payload encoding, 1.0 or 1.1.
 
     Returns:
         tuple: List of Batch, signature tuple
@@ -50,10 +57,16 @@ def create_account(txn_key, batch_key, label, description):
         inputs=inputs,
         outputs=outputs,
         txn_key=txn_key,
-        batch_key=batch_key)
+        batch_key=batch_key,
+        family_version=family_version)
 
 
-def create_asset(txn_key, batch_key, name, description, rules):
+def create_asset(txn_key,
+                 batch_key,
+                 name,
+                 description,
+                 rules,
+                 family_version=FAMILY_VERSION):
     """Create a CreateAsset txn and wrap it in a batch and list.
 
     Args:
@@ -62,6 +75,7 @@ def create_asset(txn_key, batch_key, name, description, rules):
         name (str): The name of the asset.
         description (str): A description of the asset.
         rules (list): List of protobuf.rule_pb2.Rule
+        family_version (str): The payload encoding, 1.0 or 1.1.
 
     Returns:
         tuple: List of Batch, signature tuple
@@ -88,7 +102,8 @@ def create_asset(txn_key, batch_key, name, description, rules):
         inputs=inputs,
         outputs=outputs,
         txn_key=txn_key,
-        batch_key=batch_key)
+        batch_key=batch_key,
+        family_version=family_version)
 
 
 def create_holding(txn_key,
@@ -97,7 +112,9 @@ def create_holding(txn_key,
                    label,
                    description,
                    asset,
-                   quantity):
+                   quantity,
+                   credit_shards=0,
+                   family_version=FAMILY_VERSION):
     """Create a CreateHolding txn and wrap it in a batch and list.
 
     Args:
@@ -107,28 +124,36 @@ def create_holding(txn_key,
         label (str): The label of the Holding.
         description (str): The description of the Holding.
         quantity (int): The amount of the Asset.
+        credit_shards (int): The number of shards that credits from offer
+            acceptances go to until they are swept, or 0 for none.
+        family_version (str): The payload encoding, 1.0 or 1.1.
 
     Returns:
         tuple: List of Batch, signature tuple
     """
 
+    account_holding = addresser.make_account_holding_address(
+        account_id=txn_key.get_public_key().as_hex(),
+        holding_id=identifier)
+
     inputs = [
         addresser.make_account_address(
             account_id=txn_key.get_public_key().as_hex()),
         addresser.make_asset_address(asset_id=asset),
-        addresser.make_holding_address(holding_id=identifier)
+        addresser.make_holding_address(holding_id=identifier),
+        account_holding
     ]
 
     outputs = [addresser.make_holding_address(holding_id=identifier),
-               addresser.make_account_address(
-                   account_id=txn_key.get_public_key().as_hex())]
+               account_holding]
 
     holding_txn = payload_pb2.CreateHolding(
         id=identifier,
         label=label,
         description=description,
         asset=asset,
-        quantity=quantity)
+        quantity=quantity,
+        credit_shards=credit_shards)
 
     payload = payload_pb2.TransactionPayload(
         payload_type=payload_pb2.TransactionPayload.CREATE_HOLDING,
@@ -139,7 +164,168 @@ def create_holding(txn_key,
         inputs=inputs,
         outputs=outputs,
         txn_key=txn_key,
-        batch_key=batch_key)
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def create_holdings(txn_key,
+                    batch_key,
+                    holdings,
+                    family_version=FAMILY_VERSION):
+    """Create a CreateHoldings txn, which creates each Holding and adds them
+    all to the signer's Account, and wrap it in a batch and list.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The batch signer key pair.
+        holdings (list): List of (identifier, label, description, asset,
+            quantity) tuples, as taken by create_holding, optionally with
+            credit_shards as a sixth element.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    public_key = txn_key.get_public_key().as_hex()
+    holding_addresses = addresser.make_addresses(
+        addresser.AddressSpace.HOLDING,
+        [holding[0] for holding in holdings])
+    asset_addresses = addresser.make_addresses(
+        addresser.AddressSpace.ASSET,
+        [holding[3] for holding in holdings])
+    account_holding_addresses = addresser.make_addresses(
+        addresser.AddressSpace.ACCOUNT_HOLDING,
+        [(public_key, holding[0]) for holding in holdings])
+
+    outputs = sorted(set(holding_addresses + account_holding_addresses))
+
+    inputs = [addresser.make_account_address(account_id=public_key)] + \
+        sorted(set(asset_addresses)) + outputs
+
+    holdings_txn = payload_pb2.CreateHoldings(entries=[
+        payload_pb2.CreateHolding(
+            id=identifier,
+            label=label,
+            description=description,
+            asset=asset,
+            quantity=quantity,
+            credit_shards=credit_shards[0] if credit_shards else 0)
+        for identifier, label, description, asset, quantity, *credit_shards
+        in holdings
+    ])
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.CREATE_HOLDINGS,
+        create_holdings=holdings_txn)
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=inputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def sweep_credits(txn_key,
+                  batch_key,
+                  identifier,
+                  credit_shards,
+                  family_version=FAMILY_VERSION):
+    """Create a SweepCredits txn and wrap it in a batch and list.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The batch signer key pair.
+        identifier (str): The identifier of the Holding.
+        credit_shards (int): The Holding's number of credit shards.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    outputs = [addresser.make_holding_address(holding_id=identifier)] + \
+        addresser.make_holding_credit_addresses(
+            holding_id=identifier,
+            credit_shards=credit_shards)
+
+    sweep_txn = payload_pb2.SweepCredits(holding=identifier)
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.SWEEP_CREDITS,
+        sweep_credits=sweep_txn)
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=outputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def transfer(txn_key,
+             batch_key,
+             source,
+             target,
+             asset,
+             quantity,
+             target_credit_shards=0,
+             family_version=FAMILY_VERSION):
+    """Create a Transfer txn and wrap it in a batch and list.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The batch signer key pair.
+        source (str): The id of the signer's Holding to debit.
+        target (str): The id of the Holding to credit.
+        asset (str): The Asset of both Holdings.
+        quantity (int): The quantity to move.
+        target_credit_shards (int): The target Holding's number of credit
+            shards, which are credited instead of the Holding if it has any.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    source_address = addresser.make_holding_address(holding_id=source)
+    target_address = addresser.make_holding_address(holding_id=target)
+
+    inputs = [source_address,
+              target_address,
+              addresser.make_asset_address(asset_id=asset)]
+    outputs = [source_address]
+
+    if target_credit_shards:
+        credit_address = addresser.make_holding_credit_address(
+            holding_id=target,
+            shard=addresser.credit_shard(
+                txn_key.get_public_key().as_hex(),
+                target_credit_shards))
+        inputs.append(credit_address)
+        outputs.append(credit_address)
+    else:
+        outputs.append(target_address)
+
+    transfer_txn = payload_pb2.Transfer(
+        source=source,
+        target=target,
+        quantity=quantity)
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.TRANSFER,
+        transfer=transfer_txn)
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=inputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
 
 
 def create_offer(txn_key,
@@ -149,7 +335,10 @@ def create_offer(txn_key,
                  description,
                  source,
                  target,
-                 rules):
+                 rules,
+                 escrow_count=0,
+                 expires_at_block=0,
+                 family_version=FAMILY_VERSION):
     """Create a CreateOffer txn and wrap it in a batch and list.
 
     Args:
@@ -163,7 +352,11 @@ def create_offer(txn_key,
         target (MarketplaceHolding): The holding id, quantity, asset to be
             paid into.
         rules (list): List of protobuf.rule_pb2.Rule
-
+        escrow_count (int): The number of acceptances whose source quantity
+            is moved from the source holding into the offer, or 0 for none.
+        expires_at_block (int): The last block the offer can be accepted in,
+            or 0 if it does not expire.
+        family_version (str): The payload encoding, 1.0 or 1.1.
 
     Returns:
         tuple: List of Batch, signature tuple
@@ -181,8 +374,13 @@ def create_offer(txn_key,
         inputs.append(addresser.make_holding_address(
             holding_id=target.holding_id))
         inputs.append(addresser.make_asset_address(target.asset))
+    if expires_at_block:
+        inputs.append(addresser.BLOCK_INFO_CONFIG_ADDRESS)
 
     outputs = [addresser.make_offer_address(offer_id=identifier)]
+    if escrow_count:
+        outputs.append(addresser.make_holding_address(
+            holding_id=source.holding_id))
 
     offer_txn = payload_pb2.CreateOffer(
         id=identifier,
@@ -192,7 +390,9 @@ def create_offer(txn_key,
         source_quantity=source.quantity,
         target=target.holding_id,
         target_quantity=target.quantity,
-        rules=rules)
+        rules=rules,
+        escrow_count=escrow_count,
+        expires_at_block=expires_at_block)
 
     payload = payload_pb2.TransactionPayload(
         payload_type=payload_pb2.TransactionPayload.CREATE_OFFER,
@@ -203,7 +403,8 @@ def create_offer(txn_key,
         inputs=inputs,
         outputs=outputs,
         txn_key=txn_key,
-        batch_key=batch_key)
+        batch_key=batch_key,
+        family_version=family_version)
 
 
 def accept_offer(txn_key,
@@ -211,7 +412,10 @@ def accept_offer(txn_key,
                  identifier,
                  offerer,
                  receiver,
-                 count):
+                 count,
+                 rules=None,
+                 expires_at_block=None,
+                 family_version=FAMILY_VERSION):
     """Create an AcceptOffer txn and wrap it in a Batch and list.
 
     Args:
@@ -222,37 +426,26 @@ def accept_offer(txn_key,
         receiver (OfferParticipant): The participant who is accepting
             the offer.
         count (int): The number of units of exchange.
+        rules (list): List of protobuf.rule_pb2.Rule of the Offer. If not
+            given, the addresses every rule may use are declared, which makes
+            the transaction conflict with every other acceptance of the
+            Offer.
+        expires_at_block (int): The last block the Offer can be accepted
+            in, 0 if it does not expire. If not given, the BlockInfo config
+            is declared as an input in case the Offer expires.
+        family_version (str): The payload encoding, 1.0 or 1.1.
 
     Returns:
         tuple: List of Batch, signature tuple
     """
 
-    inputs = [addresser.make_holding_address(receiver.target),
-              addresser.make_holding_address(offerer.source),
-              addresser.make_asset_address(receiver.target_asset),
-              addresser.make_asset_address(offerer.source_asset),
-              addresser.make_offer_history_address(offer_id=identifier),
-              addresser.make_offer_account_address(
-                  offer_id=identifier,
-                  account=txn_key.get_public_key().as_hex()),
-              addresser.make_offer_address(identifier)]
-
-    outputs = [addresser.make_holding_address(receiver.target),
-               addresser.make_holding_address(offerer.source),
-               addresser.make_offer_history_address(offer_id=identifier),
-               addresser.make_offer_account_address(
-                   offer_id=identifier,
-                   account=txn_key.get_public_key().as_hex())]
-
-    if receiver.source is not None:
-        inputs.append(addresser.make_holding_address(receiver.source))
-        inputs.append(addresser.make_asset_address(receiver.source_asset))
-        outputs.append(addresser.make_holding_address(receiver.source))
-
-    if offerer.target is not None:
-        inputs.append(addresser.make_holding_address(offerer.target))
-        inputs.append(addresser.make_asset_address(offerer.target_asset))
-        outputs.append(addresser.make_holding_address(offerer.target))
+    inputs, outputs = _accept_offer_addresses(
+        txn_key=txn_key,
+        identifier=identifier,
+        offerer=offerer,
+        receiver=receiver,
+        rules=rules,
+        expires_at_block=expires_at_block)
 
     accept_txn = payload_pb2.AcceptOffer(
         id=identifier,
@@ -269,16 +462,208 @@ def accept_offer(txn_key,
         inputs=inputs,
         outputs=outputs,
         txn_key=txn_key,
-        batch_key=batch_key)
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def accept_offers(txn_key,
+                  batch_key,
+                  acceptances,
+                  family_version=FAMILY_VERSION):
+    """Create an AcceptOffers txn, which accepts each Offer in order, all or
+    nothing, and wrap it in a Batch and list.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The Txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The Batch signer key pair.
+        acceptances (list): List of (identifier, offerer, receiver, count)
+            tuples, as taken by accept_offer, optionally with the Offer's
+            rules as a fifth element and its expires_at_block as a sixth.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    inputs = []
+    outputs = []
+    entries = []
+    for identifier, offerer, receiver, count, *known in acceptances:
+        known += [None] * (2 - len(known))
+        accept_inputs, accept_outputs = _accept_offer_addresses(
+            txn_key=txn_key,
+            identifier=identifier,
+            offerer=offerer,
+            receiver=receiver,
+            rules=known[0],
+            expires_at_block=known[1])
+        inputs.extend(a for a in accept_inputs if a not in inputs)
+        outputs.extend(a for a in accept_outputs if a not in outputs)
+
+        entries.append(payload_pb2.AcceptOffer(
+            id=identifier,
+            source=receiver.source,
+            target=receiver.target,
+            count=count))
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.ACCEPT_OFFERS,
+        accept_offers=payload_pb2.AcceptOffers(entries=entries))
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=inputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def _accept_offer_addresses(txn_key,
+                            identifier,
+                            offerer,
+                            receiver,
+                            rules,
+                            expires_at_block):
+    """Returns the inputs and outputs of accepting an Offer, which are
+    exactly the addresses the transaction processor reads and writes. An
+    escrowed Offer is paid out of the Offer itself, which is given by an
+    offerer with no source holding.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The Txn signer key pair.
+        identifier (str): The identifier of the Offer.
+        offerer (OfferParticipant): The participant who made the offer.
+        receiver (OfferParticipant): The participant who is accepting
+            the offer.
+        rules (list): List of protobuf.rule_pb2.Rule of the Offer, or None
+            if they are not known.
+        expires_at_block (int): The last block the Offer can be accepted
+            in, 0 if it does not expire, or None if it is not known.
+
+    Returns:
+        tuple: List of input addresses, list of output addresses
+    """
 
+    public_key = txn_key.get_public_key().as_hex()
+    offer = addresser.make_offer_address(identifier)
+    receiver_target = addresser.make_holding_address(receiver.target)
+
+    # The offerer's Assets are the receiver's, so they are listed once. The
+    # BlockInfo config gives the current block, and is only read for Offers
+    # that expire.
+    inputs = [offer, receiver_target]
+    if expires_at_block is None or expires_at_block:
+        inputs.append(addresser.BLOCK_INFO_CONFIG_ADDRESS)
+    outputs = [receiver_target]
+    assets = [receiver.target_asset]
+
+    if offerer.source is not None:
+        source = addresser.make_holding_address(offerer.source)
+        inputs.append(source)
+        outputs.append(source)
+    else:
+        outputs.append(offer)
 
-def close_offer(txn_key, batch_key, identifier):
+    if receiver.source is not None:
+        source = addresser.make_holding_address(receiver.source)
+        inputs.append(source)
+        outputs.append(source)
+        assets.append(receiver.source_asset)
+
+    if offerer.target is not None:
+        more_inputs, more_outputs = _offerer_target_addresses(
+            public_key, offerer)
+        inputs.extend(more_inputs)
+        outputs.extend(more_outputs)
+        assets.append(offerer.target_asset)
+
+    inputs.extend(addresser.make_asset_address(a) for a in sorted(set(assets)))
+
+    more_inputs, more_outputs = _rule_addresses(public_key, identifier, rules)
+    inputs.extend(more_inputs)
+    outputs.extend(more_outputs)
+
+    return inputs, outputs
+
+
+def _offerer_target_addresses(public_key, offerer):
+    """Returns the inputs and outputs for paying the offerer's target
+    Holding when an Offer is accepted.
+
+    Args:
+        public_key (str): The public key of the txn signer.
+        offerer (OfferParticipant): The participant who made the offer.
+
+    Returns:
+        tuple: List of input addresses, list of output addresses
+    """
+
+    if offerer.target_credit_shards:
+        # The credit goes to one of the target's shards, so the target
+        # itself is only read.
+        offerer_credit = addresser.make_holding_credit_address(
+            holding_id=offerer.target,
+            shard=addresser.credit_shard(
+                public_key,
+                offerer.target_credit_shards))
+        return ([addresser.make_holding_address(offerer.target),
+                 offerer_credit],
+                [offerer_credit])
+
+    offerer_target = addresser.make_holding_address(offerer.target)
+    return [offerer_target], [offerer_target]
+
+
+def _rule_addresses(public_key, identifier, rules):
+    """Returns the inputs and outputs of the receipts and allowlist entry
+    that the rules of an Offer check when it is accepted.
+
+    Args:
+        public_key (str): The public key of the txn signer.
+        identifier (str): The identifier of the Offer.
+        rules (list): List of protobuf.rule_pb2.Rule of the Offer, or None
+            if they are not known.
+
+    Returns:
+        tuple: List of input addresses, list of output addresses
+    """
+
+    # The receipts are only read and written for the rules that need them.
+    rule_types = None if rules is None else set(r.type for r in rules)
+    receipts = []
+    if rule_types is None or rule_pb2.Rule.EXCHANGE_ONCE in rule_types:
+        receipts.append(addresser.make_offer_history_address(identifier))
+    if rule_types is None or \
+            rule_pb2.Rule.EXCHANGE_ONCE_PER_ACCOUNT in rule_types:
+        receipts.append(addresser.make_offer_account_address(
+            offer_id=identifier,
+            account=public_key))
+
+    inputs = list(receipts)
+    if rule_types is None or \
+            rule_pb2.Rule.EXCHANGE_LIMITED_TO_ALLOWLIST in rule_types:
+        inputs.append(addresser.make_offer_allowlist_address(
+            offer_id=identifier,
+            account=public_key))
+
+    return inputs, receipts
+
+
+def close_offer(txn_key,
+                batch_key,
+                identifier,
+                source=None,
+                family_version=FAMILY_VERSION):
     """Create a CloseOffer txn and wrap it in a Batch and list.
 
     Args:
         txn_key (sawtooth_signing.Signer): The Txn signer key pair.
         batch_key (sawtooth_signing.Signer): The Batch signer key pair.
         identifier (str): The Offer identifier.
+        source (MarketplaceHolding): The source holding id and asset of an
+            escrowed Offer, which the escrow is returned to.
+        family_version (str): The payload encoding, 1.0 or 1.1.
 
     Returns:
         tuple: List of Batch, signature tuple
@@ -288,6 +673,12 @@ def close_offer(txn_key, batch_key, identifier):
 
     outputs = [addresser.make_offer_address(identifier)]
 
+    if source is not None:
+        source_address = addresser.make_holding_address(source.holding_id)
+        inputs.append(source_address)
+        inputs.append(addresser.make_asset_address(source.asset))
+        outputs.append(source_address)
+
     close_txn = payload_pb2.CloseOffer(id=identifier)
 
     payload = payload_pb2.TransactionPayload(
@@ -299,12 +690,170 @@ def close_offer(txn_key, batch_key, identifier):
         inputs=inputs,
         outputs=outputs,
         txn_key=txn_key,
-        batch_key=batch_key)
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def prune_offer(txn_key,
+                batch_key,
+                identifier,
+                allowlist_accounts=(),
+                family_version=FAMILY_VERSION):
+    """Create a PruneOffer txn and wrap it in a Batch and list.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The Txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The Batch signer key pair.
+        identifier (str): The identifier of the closed Offer.
+        allowlist_accounts (list of str): The accounts on the Offer's
+            allowlist, whose entries are deleted too.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    # The receipts are declared by their prefix rather than as the 256
+    # addresses they may be at.
+    outputs = [addresser.make_offer_address(identifier),
+               addresser.make_offer_receipts_prefix(identifier)] + \
+        addresser.make_addresses(
+            addresser.AddressSpace.OFFER_ALLOWLIST,
+            [(identifier, account) for account in allowlist_accounts])
+
+    # The BlockInfo config tells whether an open Offer has expired.
+    inputs = outputs + [addresser.BLOCK_INFO_CONFIG_ADDRESS]
+
+    prune_txn = payload_pb2.PruneOffer(
+        id=identifier,
+        allowlist_accounts=allowlist_accounts)
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.PRUNE_OFFER,
+        prune_offer=prune_txn)
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=inputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def update_offer(txn_key,
+                 batch_key,
+                 identifier,
+                 label='',
+                 description='',
+                 source_quantity=0,
+                 target_quantity=0,
+                 expires_at_block=0,
+                 reopen=False,
+                 clear_expiry=False,
+                 family_version=FAMILY_VERSION):
+    """Create an UpdateOffer txn and wrap it in a Batch and list. The fields
+    left at their defaults are not changed.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The Txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The Batch signer key pair.
+        identifier (str): The Offer identifier.
+        label (str): The Offer's new label.
+        description (str): The Offer's new description.
+        source_quantity (int): The Offer's new source quantity.
+        target_quantity (int): The Offer's new target quantity.
+        expires_at_block (int): The last block the Offer can be accepted in.
+        reopen (bool): Whether to reopen the Offer if it is closed.
+        clear_expiry (bool): Whether to remove the Offer's
+            expires_at_block, so it no longer expires.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    # The current block is read to check a new expiry, and whether the
+    # stored Offer has expired, which is not known until it is read.
+    inputs = [addresser.make_offer_address(identifier),
+              addresser.BLOCK_INFO_CONFIG_ADDRESS]
+
+    outputs = [addresser.make_offer_address(identifier)]
+
+    update_txn = payload_pb2.UpdateOffer(
+        id=identifier,
+        label=label,
+        description=description,
+        source_quantity=source_quantity,
+        target_quantity=target_quantity,
+        expires_at_block=expires_at_block,
+        reopen=reopen,
+        clear_expiry=clear_expiry)
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.UPDATE_OFFER,
+        update_offer=update_txn)
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=inputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
+
+
+def allow_accounts(txn_key,
+                   batch_key,
+                   offer_id,
+                   accounts,
+                   family_version=FAMILY_VERSION):
+    """Create an AllowAccounts txn and wrap it in a Batch and list.
+
+    Args:
+        txn_key (sawtooth_signing.Signer): The Txn signer key pair.
+        batch_key (sawtooth_signing.Signer): The Batch signer key pair.
+        offer_id (str): The Offer identifier.
+        accounts (list of str): The public keys of the accounts to allow.
+        family_version (str): The payload encoding, 1.0 or 1.1.
+
+    Returns:
+        tuple: List of Batch, signature tuple
+    """
+
+    entries = addresser.make_addresses(
+        addresser.AddressSpace.OFFER_ALLOWLIST,
+        [(offer_id, account) for account in accounts])
+
+    inputs = [addresser.make_offer_address(offer_id)] + entries
+
+    outputs = entries
+
+    allow_txn = payload_pb2.AllowAccounts(
+        offer_id=offer_id,
+        accounts=accounts)
+
+    payload = payload_pb2.TransactionPayload(
+        payload_type=payload_pb2.TransactionPayload.ALLOW_ACCOUNTS,
+        allow_accounts=allow_txn)
+
+    return make_header_and_batch(
+        payload=payload,
+        inputs=inputs,
+        outputs=outputs,
+        txn_key=txn_key,
+        batch_key=batch_key,
+        family_version=family_version)
 
 
 class OfferParticipant(object):
 
-    def __init__(self, source, target, source_asset, target_asset):
+    def __init__(self,
+                 source,
+                 target,
+                 source_asset,
+                 target_asset,
+                 target_credit_shards=0):
         """Constructor
 
         Args:
@@ -312,6 +861,8 @@ class OfferParticipant(object):
             target (str): The id of the target Holding.
             source_asset (str): The id of the source Asset.
             target_asset (str): The id of the target Asset.
+            target_credit_shards (int): The number of credit shards of the
+                target Holding.
         """
 
         self._source = source
@@ -319,6 +870,7 @@ class OfferParticipant(object):
 
         self._target = target
         self._target_asset = target_asset
+        self._target_credit_shards = target_credit_shards
 
     @property
     def source(self):
@@ -336,6 +888,10 @@ class OfferParticipant(object):
     def target_asset(self):
         return self._target_asset
 
+    @property
+    def target_credit_shards(self):
+        return self._target_credit_shards
+
 
 class MarketplaceHolding(object):
 